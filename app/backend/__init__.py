@@ -2,6 +2,7 @@ from app.backend.models.products import Product
 from app.backend.models.productsProtSep import ProductProtSep
 from app.backend.models.recipes import Recipe
 from app.backend.models.userConsumedProducts import UserConsumedProduct
+from app.backend.models.userDailyNutrition import UserDailyNutrition
 from app.backend.models.userMenuRecipes import UserMenuRecipes
 from app.backend.models.userMenus import UserMenu
 from app.backend.models.userProducts import UserProduct
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -8,11 +10,33 @@ from dotenv import load_dotenv
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# SQLAlchemy engine
+# Sync driver -> asyncio driver of the same database
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def _async_url(url: str) -> str:
+    """
+        The asyncio counterpart of a sync database URL, e.g.
+        postgresql+psycopg2://... -> postgresql+asyncpg://... (libpq's sslmode becomes asyncpg's ssl).
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver known for '{parsed.drivername}'; set ASYNC_DATABASE_URL.")
+    parsed = parsed.set(drivername=_ASYNC_DRIVERS[backend])
+    if "sslmode" in parsed.query:
+        parsed = parsed.update_query_dict({"ssl": parsed.query["sslmode"]}).difference_update_query(["sslmode"])
+    return parsed.render_as_string(hide_password=False)
+
+# Same database for the async endpoints (asyncpg); override if the derived URL does not fit
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+# SQLAlchemy engines: sync for the optimizer and the remaining routers, async for the I/O-bound ones
 engine = create_engine(DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
 
 # SessionLocal for dependency injection
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -28,3 +52,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+        Dependency function to provide an AsyncSession to `async def` endpoints, so waiting
+        on the database does not hold a threadpool thread. Closed after the request.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
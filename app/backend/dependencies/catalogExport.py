@@ -0,0 +1,263 @@
+from sqlalchemy import BigInteger, Boolean, Float, Integer, String, select
+from sqlalchemy.orm import Session
+from pathlib import Path
+import numpy as np
+import zipfile
+import io
+import os
+
+from app.backend.models.products import Product
+from app.backend.models.productsProtSep import ProductProtSep
+from app.backend.dependencies.productCatalog import ProductCatalog, CatalogProduct, install_product_catalog
+
+# pyarrow is optional: without it only the NumPy .npz format is available
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
+# Tables that can be exported
+EXPORT_TABLES = {"productsProtSep": ProductProtSep, "products": Product}
+# productsProtSep export (.npz recommended) loaded as the product catalog at startup (empty: off)
+CATALOG_CACHE_PATH = os.getenv("PRODUCT_CATALOG_CACHE", "")
+# Rows fetched per server-side cursor round trip (one Arrow record batch / Parquet row group each)
+EXPORT_BATCH_SIZE = int(os.getenv("PRODUCT_EXPORT_BATCH_SIZE", "10000"))
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "npz": "application/octet-stream",
+}
+
+# NumPy dtypes of the column types used by the product tables (strings are stored separately)
+_DTYPES = {BigInteger: np.int64, Integer: np.int64, Float: np.float64, Boolean: np.bool_}
+
+
+def export_formats() -> tuple:
+    """Formats available in this installation."""
+    return ("arrow", "parquet", "npz") if pa is not None else ("npz",)
+
+
+def _column_types(model) -> dict:
+    """Column name -> NumPy dtype (str for strings), in table order."""
+    types = {}
+    for column in model.__table__.columns:
+        types[column.name] = str if isinstance(column.type, String) else _DTYPES[type(column.type)]
+    return types
+
+
+def iter_column_batches(db: Session, model, batch_size: int = None):
+    """
+    Read a table column-wise in id order through a server-side cursor (stream_results),
+    yielding one dict of column name -> list of values (None for NULL) per batch.
+    No ORM objects are built.
+    """
+    columns = [model.__table__.c[name] for name in _column_types(model)]
+    query = select(*columns).order_by(model.__table__.c.id)
+    result = db.execute(query.execution_options(stream_results=True, yield_per=batch_size or EXPORT_BATCH_SIZE))
+    for rows in result.partitions():
+        yield {column.name: list(values) for column, values in zip(columns, zip(*rows))}
+
+
+def _filled(values: list, dtype):
+    """A batch column as stored in .npz files: NULLs become "" (strings) or 0 / False."""
+    if dtype is str:
+        return ["" if v is None else v for v in values]
+    return np.asarray([0 if v is None else v for v in values], dtype=dtype)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file collecting what a writer wrote since the last drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _arrow_schema(model):
+    types = {str: pa.string(), np.int64: pa.int64(), np.float64: pa.float64(), np.bool_: pa.bool_()}
+    return pa.schema([(name, types[dtype]) for name, dtype in _column_types(model).items()])
+
+
+def iter_export(db: Session, table: str, fmt: str, batch_size: int = None):
+    """
+    Export a product table, yielding the file in chunks as it is read from the database.
+
+    - arrow: Arrow IPC stream, one record batch per cursor batch; NULLs stay null
+    - parquet: one row group per cursor batch; NULLs stay null
+    - npz: uncompressed NumPy archive with one .npy per column; strings are stored as
+      UTF-8 bytes (`<name>.data`) plus int64 offsets (`<name>.offsets`), so every member
+      can be memory-mapped (see load_catalog_cache()). NumPy arrays have no nulls, so
+      NULLs are written as 0 / False ("" for strings), as the product catalog reads them.
+      Columns are only complete at the end, so this format is assembled in memory before
+      it is written out.
+
+    Args:
+        db: Database session
+        table: EXPORT_TABLES name
+        fmt: One of export_formats()
+        batch_size: Rows per batch (default EXPORT_BATCH_SIZE)
+
+    Raises:
+        ValueError: Unknown table or format not available
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table '{table}'; choose from {list(EXPORT_TABLES)}")
+    if fmt not in export_formats():
+        raise ValueError(f"Format '{fmt}' is not available; choose from {list(export_formats())}")
+    model = EXPORT_TABLES[table]
+    batches = iter_column_batches(db, model, batch_size)
+    sink = _ChunkSink()
+
+    if fmt == "npz":
+        types = _column_types(model)
+        parts = {}
+        for batch in batches:
+            for name, values in batch.items():
+                parts.setdefault(name, []).append(_filled(values, types[name]))
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, dtype in types.items():
+                chunks = parts.get(name, [])
+                if dtype is str:
+                    encoded = [s.encode() for chunk in chunks for s in chunk]
+                    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+                    arrays = {f"{name}.data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                              f"{name}.offsets": offsets}
+                else:
+                    arrays = {name: np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)}
+                for member, array in arrays.items():
+                    with archive.open(member + ".npy", "w", force_zip64=True) as f:
+                        np.lib.format.write_array(f, array, allow_pickle=False)
+                yield sink.drain()
+        yield sink.drain()
+        return
+
+    schema = _arrow_schema(model)
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    else:
+        writer = pa.parquet.ParquetWriter(sink, schema)
+    with writer:
+        for batch in batches:
+            arrays = [pa.array(batch[field.name], type=field.type) for field in schema]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def write_export(db: Session, table: str, fmt: str, path, batch_size: int = None) -> int:
+    """Write iter_export() to a file; returns the number of bytes written."""
+    size = 0
+    with open(path, "wb") as f:
+        for chunk in iter_export(db, table, fmt, batch_size):
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def _mmap_npz(path: Path) -> dict:
+    """Memory-map every (stored, uncompressed) .npy member of an .npz archive."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: member {info.filename} is compressed and cannot be memory-mapped")
+            # The local file header has its own (variable) name and extra field lengths
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2").tolist()
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            if np.lib.format.read_magic(f) == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename.removesuffix(".npy")
+            if not np.prod(shape):
+                arrays[name] = np.zeros(shape, dtype=dtype)  # empty files cannot be mapped
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", shape=shape, offset=f.tell(),
+                                         order="F" if fortran_order else "C")
+    return arrays
+
+
+def read_export_columns(path) -> dict:
+    """
+    Columns of an exported table, memory-mapped where the format allows it: numeric columns
+    of .npz files are views of the file (no copies), as are those of .arrow files holding a
+    single record batch (several batches are concatenated); Parquet is always decoded.
+
+    Returns:
+        Column name -> NumPy array (strings, and Arrow / Parquet columns holding nulls,
+        as a list with None for null)
+    """
+    path = Path(path)
+    if path.suffix == ".npz":
+        arrays = _mmap_npz(path)
+        columns = {}
+        for name in [n for n in arrays if not n.endswith(".offsets")]:
+            if name.endswith(".data"):
+                name = name.removesuffix(".data")
+                data, offsets = arrays[f"{name}.data"], arrays[f"{name}.offsets"].tolist()
+                blob = data.tobytes()
+                columns[name] = [blob[a:b].decode() for a, b in zip(offsets[:-1], offsets[1:])]
+            else:
+                columns[name] = arrays[name]
+        return columns
+    if pa is None:
+        raise ValueError(f"{path}: reading Arrow / Parquet files needs pyarrow")
+    if path.suffix == ".parquet":
+        table = pa.parquet.read_table(path)
+    else:
+        table = pa.ipc.open_stream(pa.memory_map(str(path))).read_all()
+    return {
+        name: column.to_pylist() if column.null_count or pa.types.is_string(column.type) else column.to_numpy()
+        for name, column in zip(table.column_names, table.columns)
+    }
+
+
+def load_catalog_cache(path, version: int = 1) -> ProductCatalog:
+    """
+    ProductCatalog from a productsProtSep export (.npz, .arrow or .parquet), used at startup
+    instead of reading the products table when CATALOG_CACHE_PATH is set. The first TTL
+    reload keeps it (and its memory maps) if the database content is the same.
+
+    Raises:
+        ValueError: The file is not a productsProtSep export
+    """
+    columns = read_export_columns(path)
+    missing = [f for f in CatalogProduct._fields if f not in columns]
+    if missing:
+        raise ValueError(f"{path} is not a productsProtSep export (missing {missing})")
+    return ProductCatalog.from_columns(columns, version=version)
+
+
+def preload_product_catalog():
+    """Install the catalog from CATALOG_CACHE_PATH at startup, if set (falls back to the database on errors)."""
+    if not CATALOG_CACHE_PATH:
+        return
+    try:
+        catalog = load_catalog_cache(CATALOG_CACHE_PATH)
+    except (OSError, ValueError) as e:
+        print(f"Could not load the product catalog cache {CATALOG_CACHE_PATH}: {e}")
+        return
+    install_product_catalog(catalog)
+    print(f"Loaded {len(catalog)} products from {CATALOG_CACHE_PATH}")
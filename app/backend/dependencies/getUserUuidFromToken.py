@@ -8,9 +8,10 @@ _JWT_ALG = "HS256"
 def decode_access_token(token: str) -> dict:
     return jwt.decode(token, _JWT_SECRET, algorithms=[_JWT_ALG])
 
-def get_uuid_from_token(request: Request) -> int:
+async def get_uuid_from_token(request: Request) -> int:
     """
     Extract and decode the user ID (UUID) from the access token stored in cookies.
+    (async so that resolving it does not take a threadpool thread; it never awaits.)
 
     Args:
         request (Request): The incoming FastAPI request object, used to access cookies.
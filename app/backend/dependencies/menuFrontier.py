@@ -0,0 +1,177 @@
+import numpy as np
+
+from app.backend.dependencies.menuModel import MenuModel, MenuProblem, solve_menu_problem
+from app.backend.dependencies.menuSolver import SolveResult
+
+# Second objectives a frontier can trade cost against.
+# "sugars" / "salt": grams per day (lower is better), "deviation": mean relative distance of
+# the nutrient rows from their targets (lower is better), "products": number of different
+# products per day (higher is better)
+FRONTIER_OBJECTIVES = ("sugars", "salt", "deviation", "products")
+
+
+class FrontierPoint:
+    """
+    One anchor solve of a frontier, sent to a worker process.
+
+    By default the plain menu model is solved (the cheapest menu); with minimize_metric
+    the second objective alone is optimized.
+    """
+
+    def __init__(self, problem: MenuProblem, objective: str, minimize_metric: bool = False):
+        self.problem = problem
+        self.objective = objective
+        self.minimize_metric = minimize_metric
+
+
+class FrontierSweep:
+    """
+    Several epsilon limits of a frontier, solved one after another on the same model by one
+    worker process: cost is minimized with the second objective limited to each epsilon (in
+    its "lower is better" orientation, see metric_sense()).
+
+    problem.hint_grams must satisfy every limit (the best anchor of the frontier does).
+    """
+
+    def __init__(self, problem: MenuProblem, objective: str, epsilons: list[float]):
+        self.problem = problem
+        self.objective = objective
+        self.epsilons = epsilons
+
+
+def metric_sense(objective: str) -> int:
+    """+1 if lower values of the objective are better, -1 if higher values are."""
+    return -1 if objective == "products" else 1
+
+
+def _metric_terms(model: MenuModel, objective: str, row_target) -> tuple[list, list]:
+    """
+    Variables and coefficients of the second objective (one day of the model), adding the
+    auxiliary deviation variables and rows to the model when needed.
+    """
+    n, k = model.n, len(model.row_names)
+    if objective in ("sugars", "salt"):
+        row = model.row_names.index("sugars" if objective == "sugars" else "salt")
+        return list(range(n)), (model.nutrients[row] / 100.0).tolist()
+    if objective == "products":
+        return list(range(n, 2 * n)), [1.0] * n
+
+    # deviation: d_r >= |(A_r x / 100) / target_r - 1|, averaged over rows with a target
+    helper = model.helper
+    rows = [i for i in range(k) if row_target is not None and row_target[i] > 0]
+    indices = []
+    for i in rows:
+        dev = helper.add_var()
+        helper.set_var_lower_bound(dev, 0.0)
+        helper.set_var_upper_bound(dev, np.inf)
+        coefficients = (model.nutrients[i] / 100.0 / row_target[i]).tolist()
+        for sign, lower, upper in ((-1.0, -np.inf, 1.0), (1.0, 1.0, np.inf)):
+            ct = helper.add_linear_constraint()
+            helper.set_constraint_lower_bound(ct, lower)
+            helper.set_constraint_upper_bound(ct, upper)
+            for j, c in enumerate(coefficients):
+                helper.add_term_to_constraint(ct, j, c)
+            helper.add_term_to_constraint(ct, dev, sign)
+        indices.append(dev)
+    return indices, [1.0 / max(len(rows), 1)] * len(rows)
+
+
+def metric_value(problem: MenuProblem, objective: str, grams: np.ndarray) -> float:
+    """Value of the second objective for one day's grams (per product column)."""
+    if objective in ("sugars", "salt"):
+        row = problem.row_names.index("sugars" if objective == "sugars" else "salt")
+        return float(problem.nutrients[row] @ grams / 100.0)
+    if objective == "products":
+        return float(np.count_nonzero(grams > 1e-6))
+    target = np.asarray(problem.row_target, dtype=np.float64)
+    rows = target > 0
+    return float(np.mean(np.abs(problem.nutrients[rows] @ grams / 100.0 / target[rows] - 1)))
+
+
+def _hint(model: MenuModel, problem: MenuProblem, objective: str, indices: list, grams) -> np.ndarray:
+    """Warm start for every variable of a frontier model, deviation variables included."""
+    hint = np.zeros(model.helper.num_variables())
+    start = model.hint_from_grams(grams)
+    hint[:start.size] = start
+    if objective == "deviation":
+        target = np.asarray(problem.row_target, dtype=np.float64)
+        rows = target > 0
+        hint[indices] = np.abs(problem.nutrients[rows] @ start[:model.n] / 100.0 / target[rows] - 1)
+    return hint
+
+
+def solve_frontier_point(point: FrontierPoint) -> SolveResult:
+    """
+    Solve one anchor of a frontier. Module-level so it can run in a ProcessPoolExecutor worker.
+
+    Only single-model-day problems are supported (no maxRepeats coupling); the result covers
+    every day of the plan as usual.
+    """
+    problem = point.problem
+    if not point.minimize_metric:
+        return solve_menu_problem(problem)  # the cheapest menu (diagnosed if infeasible)
+
+    model = problem.build()
+    indices, coefficients = _metric_terms(model, point.objective, problem.row_target)
+    sense = metric_sense(point.objective)
+    model.helper.clear_objective()
+    for j, c in zip(indices, coefficients):
+        model.helper.set_var_objective_coefficient(j, sense * c)
+    hint = _hint(model, problem, point.objective, indices, problem.hint_grams) if problem.hint_grams is not None else None
+    return model.solve(problem.settings, hint=hint)
+
+
+def solve_frontier_sweep(sweep: FrontierSweep) -> list[SolveResult]:
+    """
+    Solve every limit of a sweep on one model. Module-level so it can run in a
+    ProcessPoolExecutor worker.
+
+    The model and its epsilon row are built once; between limits only the row's upper bound
+    moves. Limits are solved loosest first: a menu that already meets the next limit is
+    optimal for it too, so that limit needs no solve. Every solve is warm-started from
+    problem.hint_grams, which meets every limit (used by backends that take hints, see
+    SolverSettings.takes_hint).
+
+    Returns:
+        One SolveResult per limit, in the order of sweep.epsilons
+    """
+    problem = sweep.problem
+    model = problem.build()
+    indices, coefficients = _metric_terms(model, sweep.objective, problem.row_target)
+    sense = metric_sense(sweep.objective)
+    helper = model.helper
+
+    limit = helper.add_linear_constraint()
+    helper.set_constraint_lower_bound(limit, -np.inf)
+    for j, c in zip(indices, coefficients):
+        helper.add_term_to_constraint(limit, j, sense * c)
+    hint = _hint(model, problem, sweep.objective, indices, problem.hint_grams) if problem.hint_grams is not None else None
+
+    results = [None] * len(sweep.epsilons)
+    previous = None
+    for i in np.argsort(sweep.epsilons, kind="stable")[::-1]:
+        # sense * metric <= epsilon, with a little room so the anchor point itself stays feasible
+        epsilon = sweep.epsilons[i] + 1e-6 * max(1.0, abs(sweep.epsilons[i]))
+        if previous is not None and previous.has_solution and \
+                sense * metric_value(problem, sweep.objective, problem.day_grams(previous)[0]) <= epsilon:
+            results[i] = previous
+            continue
+        helper.set_constraint_upper_bound(limit, epsilon)
+        results[i] = previous = model.solve(problem.settings, hint=hint)
+    return results
+
+
+def pareto_filter(points: list[tuple[float, float]]) -> list[int]:
+    """
+    Indices of the non-dominated (cost, metric) pairs, both "lower is better", sorted by cost.
+    Points equal in both values (up to solver tolerance) are kept once.
+    """
+    order = sorted(range(len(points)), key=lambda i: (points[i][0], points[i][1]))
+    kept = []
+    best_metric = np.inf
+    for i in order:
+        cost, metric = points[i]
+        if not kept or metric < best_metric - 1e-6 * max(1.0, abs(best_metric)):
+            kept.append(i)
+            best_metric = metric
+    return kept
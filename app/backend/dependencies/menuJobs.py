@@ -0,0 +1,206 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
+import multiprocessing
+import threading
+import uuid
+import time
+import os
+
+# Worker processes solving menus (outside the web process, so solves never hold its GIL or threadpool)
+JOB_WORKERS = int(os.getenv("MENU_JOB_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+# Admission control: unfinished jobs allowed in total and per user
+MAX_QUEUED_JOBS = int(os.getenv("MENU_JOB_MAX_QUEUED", "32"))
+MAX_JOBS_PER_USER = int(os.getenv("MENU_JOB_MAX_PER_USER", "2"))
+# Seconds a finished job (and its result) stays available for polling
+JOB_RESULT_TTL = float(os.getenv("MENU_JOB_RESULT_TTL", "600"))
+
+
+class MenuJob:
+    """
+    A single menu generation submitted to the job queue.
+
+    Status goes "queued" -> "running" -> "done" | "failed".
+    """
+
+    def __init__(self, userUuid: int):
+        self.id = uuid.uuid4().hex
+        self.userUuid = userUuid
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None      # JSON-serializable response once done
+        self.error = None       # Error message if failed
+        self.future = None
+        self.done = threading.Event()
+
+    @property
+    def status(self) -> str:
+        if self.done.is_set():
+            return "failed" if self.error is not None else "done"
+        if self.future is not None and self.future.running():
+            return "running"
+        return "queued"
+
+    def finish(self, result=None, error: str = None):
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.done.set()
+
+
+class MenuJobQueue:
+    """
+    Bounded ProcessPoolExecutor for menu solves with per-user and global admission control.
+    Jobs are kept in memory, so they are only visible within the process that accepted them.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_queued: int = MAX_QUEUED_JOBS,
+                 max_per_user: int = MAX_JOBS_PER_USER):
+        """
+        Args:
+            workers (int): Number of worker processes.
+            max_queued (int): Maximum number of unfinished jobs across all users.
+            max_per_user (int): Maximum number of unfinished jobs per user.
+        """
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_per_user = max_per_user
+        self.jobs = {}                  # job id -> MenuJob
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # "spawn" avoids forking the multi-threaded web server process
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return self.executor
+
+    def _expire(self):
+        """Drop finished jobs older than JOB_RESULT_TTL (caller holds the lock)."""
+        cutoff = time.time() - JOB_RESULT_TTL
+        for job_id in [j.id for j in self.jobs.values() if j.finished_at is not None and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def _admit(self, userUuid: int, count: int = 1) -> list[MenuJob]:
+        """
+        Register `count` new jobs (one submission) or reject them when the queue or the
+        user's quota is full. A batch counts once towards the user's quota.
+        """
+        with self.lock:
+            self._expire()
+            pending = [j for j in self.jobs.values() if not j.done.is_set()]
+            if len(pending) + count > self.max_queued:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Menu generation is busy - please try again shortly.",
+                    headers={"Retry-After": "5"},
+                )
+            if sum(1 for j in pending if j.userUuid == userUuid) >= self.max_per_user:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"You already have {self.max_per_user} menus being generated - wait for them to finish.",
+                    headers={"Retry-After": "5"},
+                )
+            jobs = [MenuJob(userUuid) for _ in range(count)]
+            for job in jobs:
+                self.jobs[job.id] = job
+            return jobs
+
+    def _start(self, job: MenuJob, fn, arg, on_result):
+        def _done(future):
+            try:
+                job.finish(result=on_result(future.result()))
+            except Exception as e:
+                print(f"Menu job {job.id} failed: {e!r}")
+                job.finish(error="Menu generation failed.")
+
+        try:
+            job.future = self._get_executor().submit(fn, arg)
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed inside a solver); start a fresh pool
+            self.executor = None
+            job.future = self._get_executor().submit(fn, arg)
+        job.future.add_done_callback(_done)
+
+    def submit(self, userUuid: int, fn, arg, on_result) -> MenuJob:
+        """
+        Run fn(arg) in a worker process.
+
+        Args:
+            userUuid (int): Owner of the job.
+            fn: Picklable module-level function executed in the worker.
+            arg: Picklable argument for fn.
+            on_result: Called in the web process with fn's return value; its return value
+                becomes the job result.
+
+        Raises:
+            HTTPException: 429/503 if the user's or the global job limit is reached.
+        """
+        job = self._admit(userUuid)[0]
+        self._start(job, fn, arg, on_result)
+        return job
+
+    def submit_many(self, userUuid: int, fn, args: list, on_results: list) -> list[MenuJob]:
+        """
+        Run fn(arg) for every arg in parallel, admitted all-or-nothing as one submission.
+
+        Raises:
+            HTTPException: 429/503 if the user's or the global job limit is reached.
+        """
+        jobs = self._admit(userUuid, len(args))
+        for job, arg, on_result in zip(jobs, args, on_results):
+            self._start(job, fn, arg, on_result)
+        return jobs
+
+    def add_finished(self, userUuid: int, result) -> MenuJob:
+        """Register a job that was answered without solving (e.g. a validation error)."""
+        job = MenuJob(userUuid)
+        job.finish(result=result)
+        with self.lock:
+            self._expire()
+            self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str, userUuid: int):
+        """Return the user's job with this id, or None (other users' jobs are not visible)."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None or job.userUuid != userUuid:
+            return None
+        return job
+
+    def shutdown(self):
+        """Stop the worker processes (pending jobs are cancelled)."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+# --- Global Queue Instance and Helper Functions ---
+
+job_queue = None  # Singleton-like global reference to the queue
+
+
+def init_menu_job_queue(workers: int = JOB_WORKERS):
+    """
+    Initialize the global menu job queue.
+
+    Args:
+        workers (int): Number of solver worker processes.
+    """
+    global job_queue
+    job_queue = MenuJobQueue(workers=workers)
+
+
+def get_menu_job_queue() -> MenuJobQueue:
+    """
+    Retrieve the global menu job queue (created with default settings on first use).
+
+    Returns:
+        MenuJobQueue: The global job queue.
+    """
+    global job_queue
+    if job_queue is None:
+        init_menu_job_queue()
+    return job_queue
@@ -0,0 +1,137 @@
+from prometheus_client import Histogram
+import time
+
+# Seconds (phases of a menu request and solver wall time)
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+# Variables / constraints / binaries of a solver model
+SIZE_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+
+MENU_PHASE_SECONDS = Histogram(
+    "menu_phase_seconds", "Time spent in each phase of a menu request", ["phase"], buckets=TIME_BUCKETS,
+)
+MENU_SOLVE_SECONDS = Histogram(
+    "menu_solve_seconds", "Solver wall time of menu models", ["backend", "status", "shape"], buckets=TIME_BUCKETS,
+)
+MENU_MODEL_VARIABLES = Histogram(
+    "menu_model_variables", "Variables of solved menu models", ["shape"], buckets=SIZE_BUCKETS,
+)
+MENU_MODEL_CONSTRAINTS = Histogram(
+    "menu_model_constraints", "Constraints of solved menu models", ["shape"], buckets=SIZE_BUCKETS,
+)
+MENU_MODEL_BINARIES = Histogram(
+    "menu_model_binaries", "Binary variables of solved menu models", ["shape"], buckets=SIZE_BUCKETS,
+)
+MENU_SOLVE_NODES = Histogram(
+    "menu_solve_nodes", "Branch-and-bound nodes of menu solves (backends that report them)", ["backend"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000, 1000000),
+)
+MENU_SOLVE_GAP = Histogram(
+    "menu_solve_gap", "Relative MIP gap of returned menus", ["backend"],
+    buckets=(0, 0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+
+class MenuTimer:
+    """
+    Wall-clock seconds per phase of one menu request.
+
+    Phases are laps: lap(name) books the time since the previous lap (or since the timer
+    was created) under `name`, so consecutive steps are timed without nesting any code.
+    """
+
+    def __init__(self):
+        self._last = time.perf_counter()
+        self.phases = {}
+
+    def lap(self, phase: str) -> float:
+        """Book the seconds since the previous lap under `phase` (added up if repeated)."""
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        return seconds
+
+
+def request_shape(problem) -> str:
+    """
+    Coarse request shape used as a metric label (few distinct values): how the days are
+    planned ("single", "multi-day" or "coupled" by maxRepeats), plus "+budget" and "+warm"
+    (solver started from a previous plan).
+    """
+    if problem.max_repeats is not None and problem.max_repeats < problem.days:
+        shape = "coupled"
+    else:
+        shape = "multi-day" if problem.days > 1 else "single"
+    if problem.budget is not None:
+        shape += "+budget"
+    if problem.hint_grams is not None:
+        shape += "+warm"
+    return shape
+
+
+def record_menu_solve(problem, solution, phases: dict) -> dict:
+    """
+    Export the statistics of one menu solve as Prometheus histograms.
+
+    Args:
+        problem: The solved MenuProblem
+        solution: Its SolveResult (with timings and model_stats from solve_menu_problem())
+        phases: Seconds per phase of the whole request (web process and solve job)
+
+    Returns:
+        The recorded statistics as a dict (for the response's debug field)
+    """
+    shape = request_shape(problem)
+    for phase, seconds in phases.items():
+        MENU_PHASE_SECONDS.labels(phase).observe(seconds)
+
+    backend = solution.backend or "unknown"
+    MENU_SOLVE_SECONDS.labels(backend, solution.status, shape).observe(solution.wall_time)
+    stats = solution.model_stats or {}
+    if stats:
+        MENU_MODEL_VARIABLES.labels(shape).observe(stats["variables"])
+        MENU_MODEL_CONSTRAINTS.labels(shape).observe(stats["constraints"])
+        MENU_MODEL_BINARIES.labels(shape).observe(stats["binaries"])
+    if solution.nodes is not None:
+        MENU_SOLVE_NODES.labels(backend).observe(solution.nodes)
+    gap = solution.gap
+    if gap is not None:
+        MENU_SOLVE_GAP.labels(backend).observe(gap)
+
+    return {
+        "shape": shape,
+        "backend": backend,
+        "status": solution.status,
+        "phases": {phase: round(seconds * 1000, 2) for phase, seconds in phases.items()},
+        "variables": stats.get("variables"),
+        "constraints": stats.get("constraints"),
+        "binaries": stats.get("binaries"),
+        "nodes": solution.nodes,
+        "gap": gap,
+    }
+
+
+def record_menu_cache_hit(backend: str, phases: dict) -> dict:
+    """
+    Export the phases of a menu request answered from the result cache (no solve).
+
+    Args:
+        backend: Backend the cached menu was solved with
+        phases: Seconds per phase of the request (ending with "cache")
+
+    Returns:
+        The statistics as a dict (for the response's debug field), with status "Cached"
+    """
+    for phase, seconds in phases.items():
+        MENU_PHASE_SECONDS.labels(phase).observe(seconds)
+    return {
+        "shape": "cached",
+        "backend": backend,
+        "status": "Cached",
+        "phases": {phase: round(seconds * 1000, 2) for phase, seconds in phases.items()},
+    }
+
+
+def server_timing(phases_ms: dict) -> str:
+    """Server-Timing header value (milliseconds per phase) for browser dev tools / curl."""
+    return ", ".join(f"{phase};dur={ms}" for phase, ms in phases_ms.items())
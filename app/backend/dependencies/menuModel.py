@@ -0,0 +1,459 @@
+import numpy as np
+import scipy.sparse as sp
+import os
+from ortools.linear_solver.python import model_builder_helper as mbh
+
+from app.backend.dependencies import menuSolver
+from app.backend.dependencies.menuSolver import SolverSettings, SolveResult
+from app.backend.dependencies.menuMetrics import MenuTimer
+
+# Per-100g product attributes used as nutrient rows, in matrix row order
+NUTRIENT_FIELDS = (
+    "kcal",
+    "protein",
+    "animalProt",
+    "dairyProt",
+    "plantProt",
+    "fat",
+    "carbs",
+    "sugars",
+    "satFat",
+    "salt",
+)
+
+MAX_GRAMS = 400     # Maximum grams per product (Big-M upper bound)
+MIN_GRAMS = 50      # Minimum grams if product is used (ensures meaningful portions)
+MIN_PRODUCTS = 10   # Minimum number of different products in a menu
+
+# Time limit of the elastic solve that explains an infeasible menu (seconds)
+DIAGNOSIS_TIME_LIMIT = float(os.getenv("MENU_DIAGNOSIS_TIME_LIMIT", "10"))
+
+
+class MenuModel:
+    """
+    Mixed-integer menu model assembled directly from matrices, for one or more days.
+
+    Variables are laid out day by day as [x_(1,0)..x_(D,n-1), y_(1,0)..y_(D,n-1)] where x is
+    grams of each product on each day and y is a binary "product used" indicator.
+    Constraint rows are (per-day blocks are Kronecker products of the one-day matrices,
+    so the size of D never shows up in Python loops):
+        - per day, one ranged row per nutrient: lower <= (A / 100) x_d <= upper
+        - D*n MaxLink rows: x_(d,i) - MAX_GRAMS * y_(d,i) <= 0
+        - D*n MinLink rows: x_(d,i) - MIN_GRAMS * y_(d,i) >= 0
+        - per day, one row requiring at least MIN_PRODUCTS products: sum(y_d) >= MIN_PRODUCTS
+        - optional variety rows: sum_d y_(d,i) <= max_repeats for every product
+        - optional budget row: total cost over all days <= budget
+        - with variety rows, D-1 symmetry-breaking rows: cost of day d <= cost of day d+1
+          (days are interchangeable, so this removes equivalent permutations of a plan)
+
+    Days are only coupled by the variety rows. Without them all days have the same optimal
+    menu, so a single day is solved (with budget / D) and repeated for every day.
+
+    With relax=True, y is continuous in [0, used_upper]: the model becomes its LP relaxation,
+    whose optimum is a lower bound on the menu cost (and proves infeasibility) in milliseconds.
+    The MaxLink rows are left out of it (x is bounded by MAX_GRAMS * used_upper instead): with
+    continuous y, y = min(x / MIN_GRAMS, used_upper) always satisfies them.
+    """
+
+    def __init__(self, nutrients: np.ndarray, price100g: np.ndarray, row_names, row_lower, row_upper,
+                 grams_lower=None, grams_upper=None, used_upper=None, days: int = 1, max_repeats: int = None,
+                 budget: float = None, relax: bool = False):
+        """
+        Args:
+            nutrients: (len(row_names) x n) per-100g nutrient matrix
+            price100g: Length-n vector of prices per 100g
+            row_names: Name of every nutrient row (e.g. "calories", "fat")
+            row_lower: Lower bound of every nutrient row per day (-inf for none)
+            row_upper: Upper bound of every nutrient row per day (+inf for none)
+            grams_lower: Optional per-product lower bound on grams per day (default 0)
+            grams_upper: Optional per-product upper bound on grams per day (default MAX_GRAMS)
+            used_upper: Optional per-product upper bound on y (0 excludes the product)
+            days: Number of days planned together
+            max_repeats: Optional maximum number of days a product may be used on
+            budget: Optional upper bound on the total cost of all days
+            relax: Build the LP relaxation (continuous y) instead of the mixed-integer model
+        """
+        self.n = int(nutrients.shape[1])
+        self.days = int(days)
+        self.max_repeats = max_repeats
+        self.budget = budget
+        self.relax = relax
+        # Days planned in the solver model: all of them only when variety rows couple the days
+        self.coupled = max_repeats is not None and max_repeats < self.days
+        self.model_days = self.days if self.coupled else 1
+        self.row_names = list(row_names)
+        self.nutrients = nutrients
+        self.price100g = np.asarray(price100g, dtype=np.float64)
+        self.row_lower = np.asarray(row_lower, dtype=np.float64)
+        self.row_upper = np.asarray(row_upper, dtype=np.float64)
+        self.grams_lower = np.zeros(self.n) if grams_lower is None else np.asarray(grams_lower, dtype=np.float64)
+        self.grams_upper = np.full(self.n, float(MAX_GRAMS)) if grams_upper is None else np.asarray(grams_upper, dtype=np.float64)
+        self.used_upper = np.ones(self.n) if used_upper is None else np.asarray(used_upper, dtype=np.float64)
+        self.helper = self._build()
+
+    @property
+    def num_rows(self) -> int:
+        coupling = self.n + self.days - 1 if self.coupled else 0
+        budget = 1 if self.budget is not None else 0
+        links = self.n if self.relax else 2 * self.n
+        return self.model_days * (len(self.row_names) + links + 1) + coupling + budget
+
+    def stats(self) -> dict:
+        """Size of the solver model: variables, constraints and binary variables."""
+        return {
+            "variables": self.helper.num_variables(),
+            "constraints": self.helper.num_constraints(),
+            "binaries": 0 if self.relax else self.model_days * self.n,
+        }
+
+    def _build(self) -> mbh.ModelBuilderHelper:
+        """Assemble the sparse constraint matrix and load it into an OR-Tools model in one call."""
+        n = self.n
+        k = len(self.row_names)
+        days = self.model_days
+        dn = days * n
+        eye = sp.identity(dn, format="csr")
+        eye_days = sp.identity(days, format="csr")
+        cost = self.price100g / 100.0
+
+        blocks = [
+            sp.hstack([sp.kron(eye_days, sp.csr_matrix(self.nutrients / 100.0)), sp.csr_matrix((days * k, dn))]),
+            sp.hstack([eye, -MIN_GRAMS * eye]),
+            sp.hstack([sp.csr_matrix((days, dn)), sp.kron(eye_days, sp.csr_matrix(np.ones((1, n))))]),
+        ]
+        constraint_lower = [np.tile(self.row_lower, days), np.zeros(dn), np.full(days, MIN_PRODUCTS)]
+        constraint_upper = [np.tile(self.row_upper, days), np.full(dn, np.inf), np.full(days, np.inf)]
+        grams_upper = self.grams_upper
+        if self.relax:
+            grams_upper = np.minimum(grams_upper, MAX_GRAMS * self.used_upper)
+        else:
+            blocks.insert(1, sp.hstack([eye, -MAX_GRAMS * eye]))
+            constraint_lower.insert(1, np.full(dn, -np.inf))
+            constraint_upper.insert(1, np.zeros(dn))
+
+        if self.coupled:
+            # sum over days of y_(d,i) for every product i
+            blocks.append(sp.hstack([sp.csr_matrix((n, dn)), sp.kron(np.ones((1, days)), sp.identity(n))]))
+            constraint_lower.append(np.zeros(n))
+            constraint_upper.append(np.full(n, float(self.max_repeats)))
+            # cost_d - cost_(d+1) <= 0 for consecutive days
+            step = sp.diags([np.ones(days - 1), -np.ones(days - 1)], [0, 1], shape=(days - 1, days))
+            blocks.append(sp.hstack([sp.kron(step, sp.csr_matrix(cost)), sp.csr_matrix((days - 1, dn))]))
+            constraint_lower.append(np.full(days - 1, -np.inf))
+            constraint_upper.append(np.zeros(days - 1))
+
+        if self.budget is not None:
+            # Uncoupled days all cost the same, so each day gets an equal share of the budget
+            blocks.append(sp.hstack([sp.csr_matrix(np.tile(cost, days)), sp.csr_matrix((1, dn))]))
+            constraint_lower.append([-np.inf])
+            constraint_upper.append([float(self.budget) * days / self.days])
+
+        matrix = sp.vstack(blocks, format="csr")
+        var_lower = np.concatenate([np.tile(self.grams_lower, days), np.zeros(dn)])
+        var_upper = np.concatenate([np.tile(grams_upper, days), np.tile(self.used_upper, days)])
+        objective = np.concatenate([np.tile(cost, days), np.zeros(dn)])
+
+        helper = mbh.ModelBuilderHelper()
+        helper.set_name("Balanced_Diet")
+        helper.fill_model_from_sparse_data(var_lower, var_upper, objective,
+                                           np.concatenate(constraint_lower), np.concatenate(constraint_upper), matrix)
+        if not self.relax:
+            for j in range(dn, 2 * dn):
+                helper.set_var_integrality(j, True)
+        for d in range(days):
+            for i, name in enumerate(self.row_names):
+                helper.set_constraint_name(d * k + i, name if days == 1 else f"{name}_day{d + 1}")
+        return helper
+
+    def hint_from_grams(self, grams) -> np.ndarray:
+        """
+        Turn per-product grams (e.g. a previous plan) into a starting value for every variable.
+
+        `grams` holds either one day (repeated for every day) or all days, day by day.
+        Amounts are clipped to the current bounds and raised to MIN_GRAMS where a product is
+        used, so a plan made under slightly different targets or restrictions still gives
+        a consistent x/y assignment.
+        """
+        days = self.model_days
+        grams = np.asarray(grams, dtype=np.float64)
+        grams = np.tile(grams, days) if grams.size == self.n else grams[:days * self.n]
+        upper = np.tile(self.grams_upper, days)
+        x = np.clip(grams, np.tile(self.grams_lower, days), upper)
+        x[np.tile(self.used_upper, days) == 0] = 0.0
+        used = x > 0
+        x[used] = np.minimum(np.maximum(x[used], MIN_GRAMS), upper[used])
+        return np.concatenate([x, used.astype(np.float64)])
+
+    def solve(self, settings: SolverSettings = None, hint=None) -> SolveResult:
+        """
+        Solve the model with the backend and limits in `settings` (server defaults if omitted).
+
+        Args:
+            settings: Solver backend and limits
+            hint: Optional warm start for every variable (see hint_from_grams())
+
+        Returns:
+            SolveResult; use grams() to get the per-product amounts
+        """
+        if self.relax:
+            result = menuSolver.solve_lp(self.helper, (settings or SolverSettings()).time_limit)
+        elif self.coupled:
+            return self._solve_coupled(settings or SolverSettings(), hint)
+        else:
+            result = menuSolver.solve(self.helper, settings, hint)
+        if self.model_days < self.days and result.has_solution:
+            # Repeat the single solved day for every day of the plan
+            x, y = result.values[:self.n], result.values[self.n:2 * self.n]
+            result.values = np.concatenate([np.tile(x, self.days), np.tile(y, self.days)])
+            result.objective *= self.days
+            if result.best_bound is not None:
+                result.best_bound *= self.days
+        return result
+
+    def _solve_day_by_day(self, settings: SolverSettings) -> SolveResult:
+        """
+        Rolling-horizon heuristic for coupled days: solve one day at a time, excluding products
+        that already reached max_repeats. Gives a feasible plan quickly (if every day is feasible).
+
+        settings.time_limit is shared by all days; each day may use whatever is left of it.
+        """
+        n = self.n
+        uses = np.zeros(n)
+        x = np.zeros((self.days, n))
+        wall_time = 0.0
+        for d in range(self.days):
+            available = uses < self.max_repeats
+            day = MenuModel(self.nutrients, self.price100g, self.row_names, self.row_lower, self.row_upper,
+                            grams_lower=np.where(available, self.grams_lower, 0.0),
+                            grams_upper=np.where(available, self.grams_upper, 0.0),
+                            used_upper=np.where(available, self.used_upper, 0.0))
+            result = day.solve(SolverSettings(settings.backend, time_limit=max(settings.time_limit - wall_time, 1.0),
+                                              mip_gap=settings.mip_gap, threads=settings.threads))
+            wall_time += result.wall_time
+            if not result.has_solution:
+                return SolveResult(result.status, wall_time=wall_time, backend=settings.backend)
+            x[d] = day.grams(result)
+            uses += x[d] > 1e-6
+
+        x = x.ravel()
+        objective = float(np.tile(self.price100g / 100.0, self.days) @ x)
+        if self.budget is not None and objective > self.budget + 1e-6:
+            return SolveResult("Infeasible", wall_time=wall_time, backend=settings.backend)
+        values = np.concatenate([x, (x > 1e-6).astype(np.float64)])
+        return SolveResult("Feasible", values=values, objective=objective, wall_time=wall_time,
+                           backend=settings.backend)
+
+    def _solve_coupled(self, settings: SolverSettings, hint=None) -> SolveResult:
+        """
+        Solve a model whose days are coupled by variety rows within settings.time_limit.
+
+        Half of the time goes to the day-by-day heuristic, which becomes the warm start of the
+        joint model; whichever plan is cheaper is returned.
+        """
+        heuristic = SolverSettings(settings.backend, time_limit=settings.time_limit / 2,
+                                   mip_gap=settings.mip_gap, threads=settings.threads)
+        start = self._solve_day_by_day(heuristic)
+
+        remaining = SolverSettings(settings.backend, time_limit=max(settings.time_limit - start.wall_time, 1.0),
+                                   mip_gap=settings.mip_gap, threads=settings.threads)
+        if hint is None and start.has_solution:
+            hint = start.values
+        result = menuSolver.solve(self.helper, remaining, hint)
+        result.wall_time += start.wall_time
+
+        if start.has_solution and (not result.has_solution or result.objective > start.objective + 1e-9):
+            start.wall_time = result.wall_time
+            return start
+        return result
+
+    def diagnose(self, settings: SolverSettings = None) -> list:
+        """
+        Explain an infeasible model: find the smallest relaxation of its bounds that makes it feasible.
+
+        Builds the elastic version of the model: every named bound gets a penalized slack
+        variable, shared by all days, and the total slack (relative to each bound's size) is
+        minimized. Relaxable bounds are the nutrient rows ("<row>Min" / "<row>Max"),
+        min/max weight restrictions ("minWeight" / "maxWeight"), the budget, maxRepeats and,
+        as a last resort (10x penalty), the minimum product count ("minProducts").
+
+        Args:
+            settings: Solver backend and limits for the elastic solve
+
+        Returns:
+            List of dicts {"constraint", "index" (product column or None), "bound", "relaxBy",
+            "suggested"}, largest relative relaxation first; empty if no relaxation was found
+        """
+        settings = settings or SolverSettings()
+        helper = self._build()
+        helper.clear_objective()
+        n, k, days = self.n, len(self.row_names), self.model_days
+        dn = days * n
+        count_start = days * k + (dn if self.relax else 2 * dn)
+        elastic = []  # (constraint, product index, bound, slack variable, direction, bound scale)
+
+        def add_slack(constraint, index, bound, rows, coefficient, weight=1.0, scale=1.0):
+            slack = helper.add_var()
+            helper.set_var_lower_bound(slack, 0.0)
+            helper.set_var_upper_bound(slack, np.inf)
+            helper.set_var_objective_coefficient(slack, weight / max(abs(bound), 1.0))
+            for row in rows:
+                helper.add_term_to_constraint(row, slack, coefficient)
+            elastic.append((constraint, index, bound, slack, coefficient, scale))
+
+        # Nutrient rows: +slack helps the lower bound, -slack the upper bound (on every day)
+        for i, name in enumerate(self.row_names):
+            rows = [d * k + i for d in range(days)]
+            if np.isfinite(self.row_lower[i]):
+                add_slack(f"{name}Min", None, float(self.row_lower[i]), rows, 1.0)
+            if np.isfinite(self.row_upper[i]):
+                add_slack(f"{name}Max", None, float(self.row_upper[i]), rows, -1.0)
+        add_slack("minProducts", None, float(MIN_PRODUCTS), range(count_start, count_start + days), 1.0, weight=10.0)
+        if self.coupled:
+            variety_start = count_start + days
+            add_slack("maxRepeats", None, float(self.max_repeats), range(variety_start, variety_start + n), -1.0)
+        if self.budget is not None:
+            # Uncoupled days share the budget, so the model row holds model_days / days of it
+            add_slack("budget", None, float(self.budget), [helper.num_constraints() - 1], -1.0,
+                      scale=self.days / days)
+
+        # Restricted grams become rows of their own so they can be relaxed too
+        for j in np.flatnonzero(self.grams_lower > 0):
+            rows = []
+            for d in range(days):
+                helper.set_var_lower_bound(d * n + j, 0.0)
+                rows.append(helper.add_linear_constraint())
+                helper.set_constraint_lower_bound(rows[-1], float(self.grams_lower[j]))
+                helper.set_constraint_upper_bound(rows[-1], np.inf)
+                helper.add_term_to_constraint(rows[-1], d * n + j, 1.0)
+            add_slack("minWeight", int(j), float(self.grams_lower[j]), rows, 1.0)
+        for j in np.flatnonzero((self.grams_upper < MAX_GRAMS) & (self.used_upper > 0)):
+            rows = []
+            for d in range(days):
+                helper.set_var_upper_bound(d * n + j, float(MAX_GRAMS))
+                rows.append(helper.add_linear_constraint())
+                helper.set_constraint_lower_bound(rows[-1], -np.inf)
+                helper.set_constraint_upper_bound(rows[-1], float(self.grams_upper[j]))
+                helper.add_term_to_constraint(rows[-1], d * n + j, 1.0)
+            add_slack("maxWeight", int(j), float(self.grams_upper[j]), rows, -1.0)
+
+        if self.relax:
+            result = menuSolver.solve_lp(helper, settings.time_limit)
+        else:
+            result = menuSolver.solve(helper, settings)
+        if not result.has_solution:
+            return []
+
+        conflicts = []
+        for constraint, index, bound, slack, direction, scale in elastic:
+            relax_by = float(result.values[slack]) * scale
+            if relax_by > 1e-6:
+                conflicts.append({
+                    "constraint": constraint,
+                    "index": index,
+                    "bound": bound,
+                    "relaxBy": relax_by,
+                    "suggested": bound - relax_by if direction > 0 else bound + relax_by,
+                })
+        conflicts.sort(key=lambda c: c["relaxBy"] / max(abs(c["bound"]), 1.0), reverse=True)
+        return conflicts
+
+    def grams(self, result: SolveResult):
+        """Grams per product of the first day from a solve result (None if no solution was found)."""
+        if not result.has_solution:
+            return None
+        return result.values[:self.n]
+
+    def day_grams(self, result: SolveResult):
+        """(days x n) grams per day and product from a solve result (None if no solution was found)."""
+        if not result.has_solution:
+            return None
+        return result.values[:self.days * self.n].reshape(self.days, self.n)
+
+
+class MenuProblem:
+    """
+    Everything needed to build and solve one MenuModel, in a form that can be pickled and
+    sent to a worker process (the OR-Tools model itself cannot be pickled).
+
+    The service may attach the product catalog as `catalog` (plus `indices`, the result
+    `cache_key` and the `presolve` stats) to build the response once the solve is done; the
+    catalog stays in the web process and is not pickled. `row_target` holds the target of
+    every nutrient row (used by objectives measuring the distance from the targets).
+    `timer` (a MenuTimer) times the request's phases in the web process, `debug` asks for
+    the solve statistics in the response, and `request` keeps the DietRequest for snapshots.
+    """
+
+    def __init__(self, nutrients: np.ndarray, price100g: np.ndarray, row_names, row_lower, row_upper,
+                 grams_lower=None, grams_upper=None, used_upper=None, days: int = 1, max_repeats: int = None,
+                 budget: float = None, settings: SolverSettings = None, hint_grams=None):
+        """
+        Args:
+            nutrients ... budget: Same as MenuModel
+            settings: Solver backend and limits
+            hint_grams: Optional per-product grams to warm-start from
+        """
+        self.nutrients = nutrients
+        self.price100g = price100g
+        self.row_names = list(row_names)
+        self.row_lower = row_lower
+        self.row_upper = row_upper
+        self.grams_lower = grams_lower
+        self.grams_upper = grams_upper
+        self.used_upper = used_upper
+        self.days = days
+        self.max_repeats = max_repeats
+        self.budget = budget
+        self.settings = settings
+        self.hint_grams = hint_grams
+        self.catalog = None
+        self.indices = None
+        self.cache_key = None
+        self.presolve = None
+        self.row_target = None
+        self.timer = None
+        self.debug = False
+        self.request = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["catalog"] = None
+        return state
+
+    @property
+    def n(self) -> int:
+        return int(self.nutrients.shape[1])
+
+    def build(self, relax: bool = False) -> MenuModel:
+        return MenuModel(self.nutrients, self.price100g, self.row_names, self.row_lower, self.row_upper,
+                         grams_lower=self.grams_lower, grams_upper=self.grams_upper, used_upper=self.used_upper,
+                         days=self.days, max_repeats=self.max_repeats, budget=self.budget, relax=relax)
+
+    def day_grams(self, result: SolveResult):
+        """(days x n) grams per day and product from a solve result (None if no solution was found)."""
+        if not result.has_solution:
+            return None
+        return result.values[:self.days * self.n].reshape(self.days, self.n)
+
+
+def solve_menu_problem(problem: MenuProblem) -> SolveResult:
+    """
+    Build and solve a MenuProblem. Module-level so it can run in a ProcessPoolExecutor worker.
+
+    An infeasible model is diagnosed right away (see MenuModel.diagnose()), so the
+    explanation is computed in the worker as well. The result carries the time spent
+    building, solving and diagnosing (timings) and the size of the model (model_stats).
+    """
+    timer = MenuTimer()
+    model = problem.build()
+    hint = model.hint_from_grams(problem.hint_grams) if problem.hint_grams is not None else None
+    timer.lap("build")
+    result = model.solve(problem.settings, hint=hint)
+    timer.lap("solve")
+    if result.status == "Infeasible":
+        settings = problem.settings or SolverSettings()
+        result.diagnosis = model.diagnose(SolverSettings(settings.backend, time_limit=DIAGNOSIS_TIME_LIMIT,
+                                                         mip_gap=settings.mip_gap, threads=settings.threads))
+        timer.lap("diagnose")
+    result.timings = timer.phases
+    result.model_stats = model.stats()
+    return result
@@ -0,0 +1,112 @@
+from collections import namedtuple
+import numpy as np
+import os
+
+from app.backend.dependencies.menuModel import MIN_GRAMS, MIN_PRODUCTS
+
+# Set MENU_PRESOLVE=0 to hand every candidate product to the solver
+PRESOLVE_ENABLED = os.getenv("MENU_PRESOLVE", "1") != "0"
+
+
+class PresolveStats(namedtuple("PresolveStats", ("products", "kept", "fixed", "unusable", "dominated"))):
+    """
+    How much the presolve shrank a menu model.
+
+    products: candidate products before presolve
+    kept: products handed to the solver
+    fixed: products whose bounds already fix them to 0 grams (e.g. "exclude" restrictions)
+    unusable: products of which even MIN_GRAMS would exceed a nutrient's upper bound
+    dominated: products replaced by cheaper products with identical nutrients and bounds
+    """
+
+    @property
+    def removed(self) -> int:
+        return self.products - self.kept
+
+
+def _group_ids(columns: np.ndarray) -> np.ndarray:
+    """Group id of every column of a matrix; equal columns share an id."""
+    keys = np.ascontiguousarray(columns.T + 0.0)  # + 0.0 makes -0.0 compare equal to 0.0
+    rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+    return np.unique(rows, return_inverse=True)[1].ravel()
+
+
+def presolve_menu_products(nutrients: np.ndarray, price100g: np.ndarray, row_upper, grams_lower: np.ndarray,
+                           grams_upper: np.ndarray, used_upper: np.ndarray, protected: np.ndarray = None,
+                           days: int = 1, max_repeats: int = None):
+    """
+    Select the products a MenuModel actually needs, without changing its optimal cost.
+
+    Every product removed here saves one continuous and one binary variable plus two
+    Big-M rows per planned day. Only removals that are exact for MenuModel are made:
+
+    - Products fixed to 0 grams by their bounds are dropped.
+    - With non-negative data, a used product contributes at least MIN_GRAMS of itself to
+      every nutrient row. This caps how many products with a given nutrient column fit into
+      one day; a cap of 0 means the product can never be used.
+    - Products with identical nutrient columns and bounds are interchangeable except for
+      price. Grams can always be moved to the cheaper copies, so an optimal day uses more
+      copies than its grams need only to reach MIN_PRODUCTS. The cheapest `cap` copies of
+      each group are kept, where cap is the smaller of the two limits (MIN_PRODUCTS for
+      groups without any nutrients, which only ever count towards the product minimum).
+      With days coupled by max_repeats, `cap` per day is kept for every planned day.
+
+    Cheaper-per-nutrient arguments are not used: every nutrient row has an upper bound,
+    so a product with more of everything per euro is not necessarily better.
+
+    Args:
+        nutrients: (rows x n) per-100g nutrient matrix of the candidate products
+        price100g: Length-n vector of prices per 100g
+        row_upper: Upper bound of every nutrient row per day
+        grams_lower, grams_upper, used_upper: Per-product variable bounds (as for MenuModel)
+        protected: Optional mask of products that must be kept (e.g. named in restrictions)
+        days: Number of days planned
+        max_repeats: Optional maximum number of days a product may be used on
+
+    Returns:
+        Tuple of (sorted indices of the products to keep, PresolveStats)
+    """
+    n = int(nutrients.shape[1])
+    protected = np.zeros(n, dtype=bool) if protected is None else np.asarray(protected, dtype=bool)
+    row_upper = np.asarray(row_upper, dtype=np.float64)
+
+    # Fixed to zero: excluded, or capped below the minimum portion (unless a minimum forces it in)
+    fixed = ((used_upper <= 0) | (grams_upper < MIN_GRAMS)) & (grams_lower <= 0)
+
+    # Number of products with this nutrient column an optimal day needs at most
+    positive = nutrients > 0
+    capacity = np.full(n, np.inf)
+    if n and nutrients.min() >= 0 and price100g.min() >= 0:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Most grams of this column the day's upper bounds allow
+            most_grams = np.where(positive, row_upper[:, None] * 100 / nutrients, np.inf).min(axis=0)
+            # Used products have at least MIN_GRAMS each ...
+            fits = np.floor(most_grams / MIN_GRAMS + 1e-9)
+            # ... and grams can move to cheaper copies until only the product count needs more copies
+            needed = np.maximum(MIN_PRODUCTS, np.ceil(most_grams / grams_upper - 1e-9))
+        capacity = np.minimum(fits, needed)
+        capacity[~positive.any(axis=0)] = MIN_PRODUCTS
+    unusable = (capacity == 0) & ~fixed & ~protected
+
+    # Keep the cheapest `limit` products of every group of identical columns
+    coupled = max_repeats is not None and max_repeats < days
+    limit = capacity * (days if coupled else 1)
+    candidates = np.flatnonzero(~fixed & ~unusable & ~protected)
+    dominated = np.zeros(n, dtype=bool)
+    if len(candidates):
+        groups = _group_ids(np.vstack([nutrients, grams_lower, grams_upper, used_upper])[:, candidates])
+        order = np.lexsort((price100g[candidates], groups))
+        sorted_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        dominated[candidates[order[rank >= limit[candidates[order]]]]] = True
+
+    keep = np.flatnonzero(~fixed & ~unusable & ~dominated)
+    stats = PresolveStats(
+        products=n,
+        kept=len(keep),
+        fixed=int(fixed.sum()),
+        unusable=int(unusable.sum()),
+        dominated=int(dominated.sum()),
+    )
+    return keep, stats
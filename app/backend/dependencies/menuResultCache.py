@@ -0,0 +1,145 @@
+from collections import OrderedDict
+import threading
+import sqlite3
+import hashlib
+import json
+import time
+import os
+
+# In-memory entries kept per process and how long a cached menu stays valid (seconds)
+RESULT_CACHE_SIZE = int(os.getenv("MENU_RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL = float(os.getenv("MENU_RESULT_CACHE_TTL", "900"))
+# Optional SQLite file shared by all workers / processes (unset = memory only)
+RESULT_CACHE_SQLITE = os.getenv("MENU_RESULT_CACHE_SQLITE")
+
+
+def menu_request_key(request, settings, products_digest: str) -> str:
+    """
+    Canonical hash of everything that determines the optimizer's output.
+
+    Targets are rounded to 0.1, restrictions are normalized and sorted, and only solver
+    options that change the optimum (backend, MIP gap) are included, so equivalent
+    requests share one entry.
+
+    Args:
+        request: DietRequest
+        settings: Resolved SolverSettings for the request
+        products_digest: Content digest of the candidate products (global catalog + user products)
+    """
+    restrictions = sorted(
+        (
+            str(r.get("type") or ""),
+            str(r.get("product") or "").strip().lower(),
+            None if r.get("value") is None else round(float(r["value"]), 1),
+        )
+        for r in request.restrictions
+    )
+    canonical = {
+        "targets": [round(float(getattr(request, f)), 1)
+                    for f in ("kcal", "protein", "fat", "satFat", "carbs", "sugars", "salt")],
+        "diet": [bool(request.vegan), bool(request.vegetarian), bool(request.dairyFree)],
+        "restrictions": restrictions,
+        "plan": [request.days, request.maxRepeats, None if request.budget is None else round(float(request.budget), 2)],
+        "solver": [settings.backend, settings.mip_gap],
+        "products": products_digest,
+    }
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+class MenuResultCache:
+    """
+    LRU + TTL cache of generated menus (JSON-serializable dicts), optionally backed by a
+    SQLite file so entries are shared between processes and survive restarts.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL,
+                 sqlite_path: str = RESULT_CACHE_SQLITE):
+        """
+        Args:
+            max_entries (int): Maximum number of in-memory entries (least recently used are evicted).
+            ttl (float): Seconds an entry stays valid.
+            sqlite_path (str): Optional SQLite database file for the shared cache.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sqlite_path = sqlite_path
+        self.entries = OrderedDict()    # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        if sqlite_path:
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS menuResultCache "
+                             "(key TEXT PRIMARY KEY, expiresAt REAL NOT NULL, value TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this safe across threads and processes
+        return sqlite3.connect(self.sqlite_path, timeout=5)
+
+    def _remember(self, key: str, expires_at: float, value: dict):
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get(self, key: str):
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.entries.move_to_end(key)
+                    return entry[1]
+                del self.entries[key]
+
+        if self.sqlite_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT expiresAt, value FROM menuResultCache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"Menu result cache read failed: {e}")
+                return None
+            if row is not None and row[0] > now:
+                value = json.loads(row[1])
+                self._remember(key, row[0], value)
+                return value
+        return None
+
+    def put(self, key: str, value: dict):
+        """Store a JSON-serializable value under key for `ttl` seconds."""
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, value)
+
+        if self.sqlite_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute("INSERT OR REPLACE INTO menuResultCache (key, expiresAt, value) VALUES (?, ?, ?)",
+                                 (key, expires_at, json.dumps(value)))
+                    conn.execute("DELETE FROM menuResultCache WHERE expiresAt <= ?", (time.time(),))
+            except sqlite3.Error as e:
+                print(f"Menu result cache write failed: {e}")
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+        if self.sqlite_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM menuResultCache")
+
+
+# --- Global Cache Instance and Helper Functions ---
+
+result_cache = None  # Singleton-like global reference to the cache
+_result_cache_lock = threading.Lock()
+
+
+def get_menu_result_cache() -> MenuResultCache:
+    """
+    Retrieve the global menu result cache (created from the MENU_RESULT_CACHE_* settings on first use).
+    """
+    global result_cache
+    if result_cache is None:
+        with _result_cache_lock:
+            if result_cache is None:
+                result_cache = MenuResultCache()
+    return result_cache
@@ -0,0 +1,145 @@
+from ortools.linear_solver.python import model_builder_helper as mbh
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import shutil
+import json
+import uuid
+import os
+
+from app.backend.dependencies import menuSolver
+from app.backend.dependencies.menuSolver import SolverSettings, SolveResult, _column_index
+
+# Directory for snapshots of slow menu solves (empty disables snapshots)
+SNAPSHOT_DIR = os.getenv("MENU_SNAPSHOT_DIR", "")
+# Solves taking at least this many seconds are snapshotted
+SNAPSHOT_THRESHOLD = float(os.getenv("MENU_SNAPSHOT_THRESHOLD", "5"))
+# Number of snapshots kept (the oldest are deleted first)
+SNAPSHOT_KEEP = int(os.getenv("MENU_SNAPSHOT_KEEP", "100"))
+
+
+def snapshot_wanted(solution: SolveResult) -> bool:
+    """Whether a solve was slow enough to be snapshotted (and snapshots are enabled)."""
+    return bool(SNAPSHOT_DIR) and solution.wall_time >= SNAPSHOT_THRESHOLD
+
+
+def save_menu_snapshot(problem, solution: SolveResult, userUuid: int, directory: str = None) -> Path:
+    """
+    Write everything needed to reproduce a menu solve offline into a new snapshot directory:
+
+    - model.mps: the solver model exactly as solved (rebuilt from the MenuProblem, which is
+      deterministic), readable by every backend and by CBC / HiGHS on the command line
+    - hint.npy: the warm start of every model variable, if the solve had one
+    - solution.npy: the returned solution of every model variable, if one was found (coupled
+      days start from an internal heuristic, so this is the closest start to the original)
+    - snapshot.json: the request, the catalog version and digest, the product of every model
+      column, the solver settings and the original outcome
+
+    Args:
+        problem: The solved MenuProblem (with `request` and `catalog` attached)
+        solution: Its SolveResult
+        userUuid: User the menu was generated for
+        directory: Snapshot root (default SNAPSHOT_DIR)
+
+    Returns:
+        Path of the new snapshot directory
+    """
+    root = Path(directory or SNAPSHOT_DIR)
+    path = root / f"{datetime.now():%Y%m%d-%H%M%S}-{userUuid}-{uuid.uuid4().hex[:8]}"
+    path.mkdir(parents=True)
+
+    model = problem.build()
+    (path / "model.mps").write_text(model.helper.export_to_mps_string())
+    if problem.hint_grams is not None:
+        np.save(path / "hint.npy", model.hint_from_grams(problem.hint_grams))
+    if solution.values is not None:
+        # Results hold every planned day ([x days..., y days...]); the model only its model_days
+        columns = model.model_days * model.n
+        x, y = np.split(np.asarray(solution.values), 2)
+        np.save(path / "solution.npy", np.concatenate([x[:columns], y[:columns]]))
+
+    settings = problem.settings or SolverSettings()
+    # Uncoupled multi-day plans solve one day and repeat it, so the model objective is one day's
+    scale = model.model_days / model.days
+    catalog = problem.catalog
+    meta = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "userUuid": userUuid,
+        "request": problem.request.model_dump() if problem.request is not None else None,
+        "catalogVersion": catalog.version if catalog is not None else None,
+        "catalogDigest": catalog.digest if catalog is not None else None,
+        "products": [catalog.names[i] for i in problem.indices.tolist()] if catalog is not None else None,
+        "days": model.days,
+        "modelDays": model.model_days,
+        "settings": {"backend": settings.backend, "timeLimit": settings.time_limit,
+                     "mipGap": settings.mip_gap, "threads": settings.threads},
+        "result": {
+            "status": solution.status,
+            "wallTime": solution.wall_time,
+            "objective": solution.objective * scale if solution.objective is not None else None,
+            "bestBound": solution.best_bound * scale if solution.best_bound is not None else None,
+            "nodes": solution.nodes,
+        },
+        "model": model.stats(),
+    }
+    with open(path / "snapshot.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1, ensure_ascii=False)
+
+    _prune_snapshots(root)
+    return path
+
+
+def _prune_snapshots(root: Path, keep: int = None):
+    """Delete the oldest snapshot directories beyond `keep` (names start with their timestamp)."""
+    keep = SNAPSHOT_KEEP if keep is None else keep
+    snapshots = sorted(p for p in root.iterdir() if (p / "snapshot.json").exists())
+    for old in snapshots[:max(len(snapshots) - keep, 0)]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def load_menu_snapshot(path) -> dict:
+    """The snapshot.json contents of a snapshot directory."""
+    with open(Path(path) / "snapshot.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def replay_menu_snapshot(path, settings: SolverSettings = None, start: str = "hint") -> SolveResult:
+    """
+    Solve a snapshotted model again, e.g. with another backend or other limits.
+
+    The MPS import lists integer columns first, so the hint is reordered (and the solution
+    values are ordered back) by the exported column names (see menuSolver._column_index()).
+
+    Args:
+        path: Snapshot directory
+        settings: Solver backend and limits (default: the settings of the original solve)
+        start: "hint" (the original warm start), "solution" (the original solution) or "none";
+            ignored when the snapshot has no such file (and by HiGHS, which always starts cold)
+
+    Returns:
+        SolveResult with values in the original model's variable order
+    """
+    path = Path(path)
+    if settings is None:
+        original = load_menu_snapshot(path)["settings"]
+        settings = SolverSettings(original["backend"], time_limit=original["timeLimit"],
+                                  mip_gap=original["mipGap"], threads=original["threads"])
+
+    helper = mbh.ModelBuilderHelper()
+    if not helper.import_from_mps_string((path / "model.mps").read_text()):
+        raise ValueError(f"Could not read the model of snapshot {path}")
+    order = np.asarray([_column_index(helper.var_name(j)) for j in range(helper.num_variables())])
+    # Name the columns after their new positions, as the CBC backend matches columns by name
+    for j in range(helper.num_variables()):
+        helper.set_var_name(j, f"V{j}")
+
+    hint = None
+    if start in ("hint", "solution") and (path / f"{start}.npy").exists():
+        hint = np.load(path / f"{start}.npy")[order]
+
+    result = menuSolver.solve(helper, settings, hint)
+    if result.values is not None:
+        values = np.zeros(len(order))
+        values[order] = result.values
+        result.values = values
+    return result
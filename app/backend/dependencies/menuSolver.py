@@ -0,0 +1,328 @@
+from ortools.linear_solver.python import model_builder_helper as mbh
+import numpy as np
+import subprocess
+import re
+import tempfile
+import time
+import os
+
+# Supported backends: OR-Tools engines plus PuLP's bundled CBC binary
+SOLVER_BACKENDS = ("highs", "scip", "sat", "cbc")
+
+# Server-side defaults and caps (requests may lower, but never exceed, the caps)
+DEFAULT_BACKEND = os.getenv("MENU_SOLVER", "highs")
+DEFAULT_TIME_LIMIT = float(os.getenv("MENU_SOLVER_TIME_LIMIT", "20"))
+MAX_TIME_LIMIT = float(os.getenv("MENU_SOLVER_MAX_TIME_LIMIT", "60"))
+DEFAULT_MIP_GAP = float(os.getenv("MENU_SOLVER_MIP_GAP", "0.0001"))
+MAX_MIP_GAP = 0.99
+DEFAULT_THREADS = int(os.getenv("MENU_SOLVER_THREADS", "1"))
+MAX_THREADS = int(os.getenv("MENU_SOLVER_MAX_THREADS", "4"))
+# LP-only engine for models without integer variables (relaxations)
+LP_BACKEND = os.getenv("MENU_LP_SOLVER", "glop")
+# Backends that start from a hint (HiGHS cannot take one through OR-Tools, see _solve_ortools),
+# and the one used for warm-started requests that do not name a solver
+HINT_BACKENDS = ("scip", "sat", "cbc")
+WARM_START_BACKEND = os.getenv("MENU_WARM_START_SOLVER", "scip")
+
+# OR-Tools solve status -> status strings returned to the frontend (PuLP naming)
+_STATUS_NAMES = {
+    mbh.SolveStatus.OPTIMAL: "Optimal",
+    mbh.SolveStatus.FEASIBLE: "Feasible",
+    mbh.SolveStatus.INFEASIBLE: "Infeasible",
+    mbh.SolveStatus.UNBOUNDED: "Unbounded",
+    mbh.SolveStatus.NOT_SOLVED: "Not Solved",
+}
+
+
+class SolverSettings:
+    """
+    Solver backend and limits for a single solve.
+
+    Attributes:
+        backend: One of SOLVER_BACKENDS
+        time_limit: Wall-clock limit in seconds; the best feasible solution found so far is
+            returned when it is reached (status "Feasible"). Capped at MAX_TIME_LIMIT;
+            values <= 0 fall back to DEFAULT_TIME_LIMIT
+        mip_gap: Relative MIP gap at which the search stops, clamped to [0, MAX_MIP_GAP]
+        threads: Number of solver threads (ignored by backends without parallel search),
+            clamped to [1, MAX_THREADS]
+    """
+
+    def __init__(self, backend: str = None, time_limit: float = None, mip_gap: float = None, threads: int = None):
+        self.backend = (backend or DEFAULT_BACKEND).lower()
+        if self.backend not in SOLVER_BACKENDS:
+            raise ValueError(f"Unknown solver '{backend}'. Choose one of: {', '.join(SOLVER_BACKENDS)}.")
+        if time_limit is None or time_limit <= 0:
+            time_limit = DEFAULT_TIME_LIMIT
+        self.time_limit = min(time_limit, MAX_TIME_LIMIT)
+        self.mip_gap = min(max(mip_gap if mip_gap is not None else DEFAULT_MIP_GAP, 0.0), MAX_MIP_GAP)
+        self.threads = max(1, min(threads if threads is not None else DEFAULT_THREADS, MAX_THREADS))
+
+    @property
+    def takes_hint(self) -> bool:
+        """True if the backend starts from a warm-start hint instead of ignoring it."""
+        return self.backend in HINT_BACKENDS
+
+    @classmethod
+    def from_request(cls, request) -> "SolverSettings":
+        """
+        Build settings from the optional solver fields of a DietRequest.
+
+        A warm-started request without a solver runs on WARM_START_BACKEND when the default
+        backend ignores hints; naming such a backend together with warmStart is an error.
+
+        Raises:
+            ValueError: If the solver is unknown or cannot warm-start
+        """
+        backend = getattr(request, "solver", None)
+        if getattr(request, "warmStart", False):
+            if backend is None and DEFAULT_BACKEND.lower() not in HINT_BACKENDS:
+                backend = WARM_START_BACKEND
+            elif backend is not None and backend.lower() == "highs":
+                raise ValueError(f"Solver 'highs' cannot warm-start. Choose one of: {', '.join(HINT_BACKENDS)}, "
+                                 f"or omit solver.")
+        return cls(
+            backend=backend,
+            time_limit=getattr(request, "timeLimit", None),
+            mip_gap=getattr(request, "mipGap", None),
+            threads=getattr(request, "threads", None),
+        )
+
+    def __repr__(self):
+        return (f"SolverSettings(backend={self.backend!r}, time_limit={self.time_limit}, "
+                f"mip_gap={self.mip_gap}, threads={self.threads})")
+
+
+class SolveResult:
+    """
+    Outcome of a solve.
+
+    Attributes:
+        status: "Optimal", "Feasible" (limit reached with a solution), "Infeasible",
+            "Unbounded", "Not Solved" or "Undefined"
+        values: Value of every model variable, or None if no solution was found
+        objective: Objective value of the returned solution (None without solution)
+        best_bound: Best proven bound on the objective (None if unknown)
+        wall_time: Seconds spent in the solver
+        backend: Backend that produced the result
+        nodes: Branch-and-bound nodes explored (None if the backend does not report it)
+        diagnosis: Optional explanation attached by the caller when no solution exists
+        timings: Seconds per phase of the solve job (attached by the caller, see menuMetrics)
+        model_stats: Size of the solved model (attached by the caller, see MenuModel.stats())
+    """
+
+    def __init__(self, status: str, values=None, objective=None, best_bound=None, wall_time: float = 0.0,
+                 backend: str = None, nodes: int = None):
+        self.status = status
+        self.values = values
+        self.objective = objective
+        self.best_bound = best_bound
+        self.wall_time = wall_time
+        self.backend = backend
+        self.nodes = nodes
+        self.diagnosis = None
+        self.timings = {}
+        self.model_stats = None
+
+    @property
+    def has_solution(self) -> bool:
+        return self.values is not None
+
+    @property
+    def gap(self):
+        """Relative gap between the solution and the best bound (None if unknown)."""
+        if self.objective is None or self.best_bound is None:
+            return None
+        return abs(self.objective - self.best_bound) / max(abs(self.objective), 1e-9)
+
+
+def _ortools_parameters(settings: SolverSettings) -> str:
+    """Solver-specific parameter string for the OR-Tools backends."""
+    if settings.backend == "highs":
+        # HiGHS prints its banner unless output is disabled through its own options
+        return f"output_flag=false\nmip_rel_gap={settings.mip_gap}\nthreads={settings.threads}"
+    if settings.backend == "scip":
+        return f"limits/gap = {settings.mip_gap}"
+    if settings.backend == "sat":
+        return f"relative_gap_limit:{settings.mip_gap} num_workers:{settings.threads}"
+    return ""
+
+
+def _solve_ortools(model: mbh.ModelBuilderHelper, settings: SolverSettings, hint=None) -> SolveResult:
+    solver = mbh.ModelSolverHelper(settings.backend)
+    if not solver.solver_is_supported():
+        raise RuntimeError(f"Solver '{settings.backend}' is not available in this OR-Tools build")
+
+    # The HiGHS bridge in OR-Tools crashes (segfault) on models carrying hints,
+    # so HiGHS always starts cold; SCIP and CP-SAT use the hint as their first incumbent
+    model.clear_hints()
+    if hint is not None and settings.backend != "highs":
+        for j, value in enumerate(hint.tolist()):
+            model.add_hint(j, value)
+
+    solver.enable_output(False)
+    solver.set_time_limit_in_seconds(settings.time_limit)
+    solver.set_solver_specific_parameters(_ortools_parameters(settings))
+
+    start = time.perf_counter()
+    solver.solve(model)
+    wall_time = time.perf_counter() - start
+
+    status = _STATUS_NAMES.get(solver.status(), "Undefined")
+    if not solver.has_solution():
+        return SolveResult(status, wall_time=wall_time, backend=settings.backend)
+    return SolveResult(
+        status,
+        values=np.asarray(solver.variable_values()),
+        objective=solver.objective_value(),
+        best_bound=solver.best_objective_bound(),
+        wall_time=wall_time,
+        backend=settings.backend,
+    )
+
+
+def _cbc_path() -> str:
+    """Path to the CBC binary bundled with PuLP."""
+    from pulp import PULP_CBC_CMD
+    return PULP_CBC_CMD().path
+
+
+def _mps_column_names(mps: str) -> list[str]:
+    """Variable names in the order of the COLUMNS section of an MPS export."""
+    names = []
+    in_columns = False
+    for line in mps.splitlines():
+        if not line.startswith(" "):
+            in_columns = line.startswith("COLUMNS")
+            continue
+        if in_columns:
+            name = line.split(None, 1)[0]
+            if name != "INTSTART" and name != "INTEND" and (not names or names[-1] != name):
+                names.append(name)
+    return names
+
+
+def _column_index(name: str) -> int:
+    """
+    Model variable index of an exported column. Unnamed variables are written as
+    "V<index>" (zero-padded); the exporter lists integer columns first, so CBC's own
+    column numbering does not match the model's.
+    """
+    return int(name[1:])
+
+
+def _solve_cbc(model: mbh.ModelBuilderHelper, settings: SolverSettings, hint=None) -> SolveResult:
+    """
+    Solve with CBC by handing it the model as an MPS file, which avoids rebuilding the model
+    as PuLP expressions. A hint is passed as a CBC MIP start file (matched by column name).
+    """
+    with tempfile.TemporaryDirectory(prefix="menu_cbc_") as tmp:
+        mps_path = os.path.join(tmp, "model.mps")
+        solution_path = os.path.join(tmp, "model.sol")
+        mps = model.export_to_mps_string()
+        with open(mps_path, "w") as f:
+            f.write(mps)
+
+        mip_start = []
+        if hint is not None:
+            start_path = os.path.join(tmp, "start.sol")
+            with open(start_path, "w") as f:
+                # Same layout as CBC's own solution files (header line, then "index name value")
+                f.write("Stopped on time - objective value 0\n")
+                for j, name in enumerate(_mps_column_names(mps)):
+                    f.write(f"{j} {name} {hint[_column_index(name)]} 0\n")
+            mip_start = ["-mips", start_path]
+
+        start = time.perf_counter()
+        output = subprocess.run(
+            [_cbc_path(), mps_path, *mip_start,
+             "-sec", str(settings.time_limit),
+             "-ratioGap", str(settings.mip_gap),
+             "-threads", str(settings.threads),
+             "-solve", "-solu", solution_path],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=False,
+        ).stdout
+        wall_time = time.perf_counter() - start
+
+        # Search statistics from CBC's summary ("Enumerated nodes:  12", "Lower bound:  1.23")
+        nodes = re.search(r"^Enumerated nodes:\s+(\d+)", output, re.MULTILINE)
+        nodes = int(nodes.group(1)) if nodes else None
+        lower_bound = re.search(r"^Lower bound:\s+(\S+)", output, re.MULTILINE)
+        incumbent = re.search(r"^Objective value:\s+(\S+)", output, re.MULTILINE)
+
+        if not os.path.exists(solution_path):
+            return SolveResult("Not Solved", wall_time=wall_time, backend="cbc", nodes=nodes)
+        with open(solution_path) as f:
+            header = f.readline()
+            lines = f.readlines()
+
+    # Header examples: "Optimal - objective value 1.23", "Stopped on time - objective value 1.5",
+    # "Infeasible - objective value 0", "Stopped on time (no integer solution - continuous used) ..."
+    if header.startswith("Optimal"):
+        status = "Optimal"
+    elif header.startswith("Infeasible") or header.startswith("Integer infeasible"):
+        status = "Infeasible"
+    elif header.startswith("Unbounded"):
+        status = "Unbounded"
+    elif "no integer solution" in header:
+        status = "Not Solved"
+    elif header.startswith("Stopped"):
+        status = "Feasible"
+    else:
+        status = "Undefined"
+
+    if status not in ("Optimal", "Feasible"):
+        return SolveResult(status, wall_time=wall_time, backend="cbc", nodes=nodes)
+
+    # Solution lines: "<index> <name> <value> <reduced cost>", optionally prefixed with "**"
+    values = np.zeros(model.num_variables())
+    for line in lines:
+        parts = line.split()
+        if parts and parts[0] == "**":
+            parts = parts[1:]
+        if len(parts) >= 3:
+            values[_column_index(parts[1])] = float(parts[2])
+
+    objective = float(header.rsplit(" ", 1)[-1])
+    # After a time limit with a MIP start, CBC may write a point other than its incumbent
+    # (infeasible, cheaper than the log's objective); such a file is not a solution
+    if status == "Feasible" and incumbent and abs(float(incumbent.group(1)) - objective) > 1e-6 * max(1.0, abs(objective)):
+        return SolveResult("Not Solved", wall_time=wall_time, backend="cbc", nodes=nodes)
+    best_bound = objective
+    if status == "Feasible":
+        best_bound = float(lower_bound.group(1)) if lower_bound else None
+    return SolveResult(status, values=values, objective=objective, best_bound=best_bound,
+                       wall_time=wall_time, backend="cbc", nodes=nodes)
+
+
+def solve_lp(model: mbh.ModelBuilderHelper, time_limit: float = None) -> SolveResult:
+    """
+    Solve a model without integer variables with LP_BACKEND (GLOP by default), which is
+    several times faster than the MIP engines on the menu relaxations.
+
+    Integrality is ignored by the LP engine, so only use this for models meant to be continuous.
+    """
+    settings = SolverSettings(time_limit=time_limit)
+    settings.backend = LP_BACKEND
+    return _solve_ortools(model, settings)
+
+
+def solve(model: mbh.ModelBuilderHelper, settings: SolverSettings = None, hint=None) -> SolveResult:
+    """
+    Solve an OR-Tools model with the configured backend and limits.
+
+    The same model object can be solved repeatedly with different settings, which is how
+    backends are benchmarked against each other.
+
+    Args:
+        model: Model to solve
+        settings: Backend and limits (server defaults if omitted)
+        hint: Optional starting value for every variable (warm start); ignored by HiGHS
+            (see SolverSettings.takes_hint)
+    """
+    settings = settings or SolverSettings()
+    if hint is not None:
+        hint = np.asarray(hint, dtype=np.float64)
+    if settings.backend == "cbc":
+        return _solve_cbc(model, settings, hint)
+    return _solve_ortools(model, settings, hint)
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from sqlalchemy.orm import Session
+import threading
+import os
+
+from app.backend.models.userMenus import UserMenu
+
+# Number of users whose last generated plan is kept in memory
+WARM_START_CACHE_SIZE = int(os.getenv("MENU_WARM_START_CACHE_SIZE", "1024"))
+
+# userUuid -> {normalized product name: grams} of the last menu generated in this process
+_last_plans = OrderedDict()
+_last_plans_lock = threading.Lock()
+
+
+def _plan_grams(plan) -> dict:
+    """Map normalized product names to grams for a list of plan items (dicts or ProductItems)."""
+    grams = {}
+    for item in plan or []:
+        if not isinstance(item, dict):
+            item = item.model_dump()
+        name = str(item.get("productName") or "").strip().lower()
+        if name:
+            grams[name] = grams.get(name, 0.0) + float(item.get("grams") or 0)
+    return grams
+
+
+def remember_plan(userUuid: int, plan):
+    """
+    Store the menu just generated for a user so the next request can warm-start from it.
+    """
+    grams = _plan_grams(plan)
+    if not grams:
+        return
+    with _last_plans_lock:
+        _last_plans[userUuid] = grams
+        _last_plans.move_to_end(userUuid)
+        while len(_last_plans) > WARM_START_CACHE_SIZE:
+            _last_plans.popitem(last=False)
+
+
+def get_warm_start_plan(db: Session, userUuid: int) -> dict:
+    """
+    Return the plan to warm-start from: the last menu generated for the user in this
+    process or, if there is none, the user's most recently saved menu.
+
+    Returns:
+        Dict of normalized product name -> grams (empty if the user has no plan yet)
+    """
+    with _last_plans_lock:
+        grams = _last_plans.get(userUuid)
+    if grams is not None:
+        return grams
+
+    saved = (
+        db.query(UserMenu.plan)
+        .filter(UserMenu.userUuid == userUuid)
+        .order_by(UserMenu.date.desc(), UserMenu.id.desc())
+        .first()
+    )
+    return _plan_grams(saved.plan) if saved else {}
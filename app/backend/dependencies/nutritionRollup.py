@@ -0,0 +1,129 @@
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import date
+
+from app.backend.database import Base
+from app.backend.models.userConsumedProducts import UserConsumedProduct
+from app.backend.models.userDailyNutrition import UserDailyNutrition
+
+# Summed columns (same names in userConsumedProducts and userDailyNutrition)
+ROLLUP_FIELDS = (
+    "kcal",
+    "fat",
+    "satFat",
+    "carbs",
+    "sugar",
+    "protein",
+    "dairyProtein",
+    "animalProtein",
+    "plantProtein",
+    "salt",
+    "cost",
+)
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _rollup_statements(dialect: str, entry: UserConsumedProduct, sign: int) -> list:
+    """Statements adding (sign=1) or subtracting (sign=-1) one consumed product to/from its day row."""
+    day = entry.date.date() if hasattr(entry.date, "date") else entry.date
+    values = {field: sign * (getattr(entry, field) or 0.0) for field in ROLLUP_FIELDS}
+    values["products"] = sign
+
+    table = UserDailyNutrition.__table__
+    statement = _UPSERT_INSERTS[dialect](table).values(userUuid=entry.userUuid, day=day, **values)
+    statements = [statement.on_conflict_do_update(
+        index_elements=[table.c.userUuid, table.c.day],
+        set_={name: table.c[name] + statement.excluded[name] for name in values},
+    )]
+    if sign < 0:
+        statements.append(delete(table).where(table.c.userUuid == entry.userUuid, table.c.day == day,
+                                              table.c.products <= 0))
+    return statements
+
+
+async def apply_to_rollup_async(db: AsyncSession, entry: UserConsumedProduct, sign: int = 1):
+    """
+    Add (sign=1) or subtract (sign=-1) one consumed product to/from its user's day in
+    userDailyNutrition, in the caller's transaction (commit together with the entry).
+
+    The row is upserted atomically (ON CONFLICT DO UPDATE col = col + value), so concurrent
+    entries for the same day do not lose updates; days without entries left are deleted.
+    """
+    for statement in _rollup_statements(db.get_bind().dialect.name, entry, sign):
+        await db.execute(statement)
+
+
+def rebuild_rollup(db: Session, userUuid: int = None) -> int:
+    """
+    Recompute userDailyNutrition from userConsumedProducts (all users, or one) with a single
+    INSERT ... SELECT ... GROUP BY, creating the table first if needed. Also removes the
+    floating-point residue that many incremental updates can leave. Commits.
+
+    Returns:
+        Number of day rows written
+    """
+    table = UserDailyNutrition.__table__
+    Base.metadata.create_all(db.get_bind(), tables=[table])
+
+    consumed = UserConsumedProduct.__table__
+    day = func.date(consumed.c.date)
+    query = select(
+        consumed.c.userUuid,
+        day,
+        *[func.coalesce(func.sum(consumed.c[field]), 0.0) for field in ROLLUP_FIELDS],
+        func.count(consumed.c.id),
+    ).group_by(consumed.c.userUuid, day)
+
+    clear = delete(table)
+    if userUuid is not None:
+        query = query.where(consumed.c.userUuid == userUuid)
+        clear = clear.where(table.c.userUuid == userUuid)
+
+    db.execute(clear)
+    result = db.execute(insert(table).from_select(["userUuid", "day", *ROLLUP_FIELDS, "products"], query))
+    db.commit()
+    return result.rowcount
+
+
+def _sum_rollup_query(userUuid: int, first_day: date, last_day: date):
+    table = UserDailyNutrition.__table__
+    return (
+        select(*[func.coalesce(func.sum(table.c[name]), 0) for name in ROLLUP_FIELDS + ("products",)])
+        .where(table.c.userUuid == userUuid, table.c.day >= first_day, table.c.day <= last_day)
+    )
+
+
+async def sum_rollup_async(db: AsyncSession, userUuid: int, first_day: date, last_day: date) -> dict:
+    """
+    Totals over the days [first_day, last_day] of a user, read from at most one rollup row
+    per day (so a year costs about the same as a week).
+
+    Returns:
+        ROLLUP_FIELDS name -> sum, plus "products" (number of consumed entries)
+    """
+    row = (await db.execute(_sum_rollup_query(userUuid, first_day, last_day))).one()
+    return dict(zip(ROLLUP_FIELDS + ("products",), row))
+
+
+def _daily_rollup_query(userUuid: int, first_day: date, last_day: date):
+    table = UserDailyNutrition.__table__
+    return (
+        select(table.c.day, *[table.c[name] for name in ROLLUP_FIELDS + ("products",)])
+        .where(table.c.userUuid == userUuid, table.c.day >= first_day, table.c.day <= last_day)
+        .order_by(table.c.day)
+    )
+
+
+async def daily_rollup_rows_async(db: AsyncSession, userUuid: int, first_day: date, last_day: date) -> list:
+    """
+    The user's rollup rows on the days [first_day, last_day] in day order (days without
+    consumed products have no row).
+
+    Returns:
+        List of (day, *ROLLUP_FIELDS, products) tuples
+    """
+    return (await db.execute(_daily_rollup_query(userUuid, first_day, last_day))).all()
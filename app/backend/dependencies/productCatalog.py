@@ -0,0 +1,398 @@
+from collections import namedtuple
+from functools import cached_property
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import numpy as np
+import threading
+import difflib
+import hashlib
+import time
+import os
+
+from app.backend.database import SessionLocal
+from app.backend.models.productsProtSep import ProductProtSep
+from app.backend.models.userProducts import UserProduct
+from app.backend.dependencies.menuModel import NUTRIENT_FIELDS
+
+# Numeric per-100g columns kept as NumPy arrays
+CATALOG_COLUMNS = (
+    "kcal",
+    "fat",
+    "satFat",
+    "carbs",
+    "sugars",
+    "protein",
+    "dairyProt",
+    "animalProt",
+    "plantProt",
+    "salt",
+    "price1kg",
+    "price100g",
+)
+
+# Boolean dietary masks
+DIET_FLAGS = ("vegan", "vegetarian", "dairyFree")
+
+# Immutable row view of a catalog product (same attribute names as ProductProtSep)
+CatalogProduct = namedtuple("CatalogProduct", ("id", "productName") + CATALOG_COLUMNS + DIET_FLAGS)
+
+# Minimum similarity (0..1, difflib ratio) of a name suggested for an unknown product name
+NAME_SUGGESTION_CUTOFF = float(os.getenv("PRODUCT_NAME_SUGGESTION_CUTOFF", "0.6"))
+
+_NO_PRODUCTS = np.zeros(0, dtype=np.intp)
+_NO_PRODUCTS.flags.writeable = False
+
+
+def normalize_name(name: str) -> str:
+    """Product names are compared stripped and lower-cased."""
+    return name.strip().lower()
+
+
+# Seconds after which the catalog is reloaded even without an explicit invalidation,
+# so changes written directly to the database (e.g. by the scrapers) are picked up
+CATALOG_TTL_SECONDS = float(os.getenv("PRODUCT_CATALOG_TTL", "600"))
+
+
+class ProductCatalog:
+    """
+    Read-only, structure-of-arrays snapshot of product rows (`productsProtSep`, optionally
+    followed by a user's own products).
+
+    Every numeric column is a float64 NumPy array and every dietary flag a boolean mask,
+    all aligned by position (index i is the same product everywhere).
+    """
+
+    def __init__(self, products: tuple, ids: np.ndarray, names: tuple, normalized_names: np.ndarray,
+                 columns: dict, flags: dict, version: int = 1):
+        """
+        Args:
+            products: CatalogProduct row views, in column order
+            ids: Product ids (ids of global and user products may overlap)
+            names: Product names
+            normalized_names: Names stripped and lower-cased (NumPy string array)
+            columns: CATALOG_COLUMNS name -> float64 array
+            flags: DIET_FLAGS name -> bool array
+            version: Catalog version (increases whenever the content changes)
+        """
+        self.version = version
+        self.products = products
+        self.ids = self._frozen(ids)
+        self.names = names
+        self.normalized_names = self._frozen(normalized_names)
+        self.columns = {name: self._frozen(columns[name]) for name in CATALOG_COLUMNS}
+        self.flags = {name: self._frozen(flags[name]) for name in DIET_FLAGS}
+
+    @staticmethod
+    def _frozen(array: np.ndarray) -> np.ndarray:
+        array.flags.writeable = False
+        return array
+
+    @classmethod
+    def from_rows(cls, rows: list, version: int = 1) -> "ProductCatalog":
+        """
+        Build a catalog from tuples in CatalogProduct field order.
+        """
+        products = tuple(CatalogProduct(*r) for r in rows)
+        values = list(zip(*products)) or [()] * len(CatalogProduct._fields)
+        offset = 2 + len(CATALOG_COLUMNS)
+        names = tuple(str(n) for n in values[1])
+        return cls(
+            products,
+            ids=np.asarray(values[0], dtype=np.int64),
+            names=names,
+            normalized_names=np.asarray([normalize_name(n) for n in names], dtype=np.str_),
+            columns={
+                name: np.asarray([v or 0 for v in values[2 + i]], dtype=np.float64)
+                for i, name in enumerate(CATALOG_COLUMNS)
+            },
+            flags={
+                name: np.asarray([bool(v) for v in values[offset + i]], dtype=bool)
+                for i, name in enumerate(DIET_FLAGS)
+            },
+            version=version,
+        )
+
+    @classmethod
+    def from_columns(cls, columns: dict, version: int = 1) -> "ProductCatalog":
+        """
+        Build a catalog from whole columns (e.g. a memory-mapped export, see catalogExport.py).
+        float64 columns are used as they are (no copy); names are a list of str. Columns given
+        as lists may hold None (NULL), which is read as 0 / False like from_rows() does.
+        """
+        values = [columns[f] for f in CatalogProduct._fields]
+        products = tuple(CatalogProduct(*r) for r in zip(*(v.tolist() if isinstance(v, np.ndarray) else v for v in values)))
+        names = tuple(str(n) for n in columns["productName"])
+        return cls(
+            products,
+            ids=np.asarray(columns["id"], dtype=np.int64),
+            names=names,
+            normalized_names=np.asarray([normalize_name(n) for n in names], dtype=np.str_),
+            columns={
+                name: np.asarray(columns[name] if isinstance(columns[name], np.ndarray)
+                                 else [v or 0 for v in columns[name]], dtype=np.float64)
+                for name in CATALOG_COLUMNS
+            },
+            flags={
+                name: np.asarray(columns[name] if isinstance(columns[name], np.ndarray)
+                                 else [bool(v) for v in columns[name]], dtype=bool)
+                for name in DIET_FLAGS
+            },
+            version=version,
+        )
+
+    @classmethod
+    def load(cls, db: Session, version: int = 1) -> "ProductCatalog":
+        """Read the products table column-wise (no ORM object hydration)."""
+        query_columns = [getattr(ProductProtSep, f) for f in CatalogProduct._fields]
+        rows = db.query(*query_columns).order_by(ProductProtSep.id).all()
+        return cls.from_rows([tuple(r) for r in rows], version=version)
+
+    @classmethod
+    def load_user_products(cls, db: Session, userUuid: int) -> "ProductCatalog":
+        """Read a single user's products column-wise, ordered by ID."""
+        query_columns = [getattr(UserProduct, f) for f in CatalogProduct._fields]
+        rows = db.query(*query_columns).filter(UserProduct.userUuid == userUuid).order_by(UserProduct.id).all()
+        return cls.from_rows([tuple(r) for r in rows])
+
+    def concat(self, other: "ProductCatalog") -> "ProductCatalog":
+        """
+        Return a new catalog with `other` appended after this one (this catalog's version is kept).
+
+        The combined digest and name index are derived from the two parts, so they cost
+        (almost) nothing when this catalog's are already cached. The name index of this
+        catalog is built here if needed, so it is built once per version of the shared catalog.
+        """
+        combined = ProductCatalog(
+            self.products + other.products,
+            ids=np.concatenate([self.ids, other.ids]),
+            names=self.names + other.names,
+            normalized_names=np.concatenate([self.normalized_names, other.normalized_names]),
+            columns={name: np.concatenate([self.columns[name], other.columns[name]]) for name in CATALOG_COLUMNS},
+            flags={name: np.concatenate([self.flags[name], other.flags[name]]) for name in DIET_FLAGS},
+            version=self.version,
+        )
+        combined.__dict__["digest"] = hashlib.sha1(f"{self.digest}+{other.digest}".encode()).hexdigest()
+
+        name_index = dict(self.name_index)
+        for name, found in other.name_index.items():
+            found = found + len(self)
+            if name in name_index:
+                found = np.concatenate([name_index[name], found])
+            found.flags.writeable = False
+            name_index[name] = found
+        combined.__dict__["name_index"] = name_index
+        return combined
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    @cached_property
+    def digest(self) -> str:
+        """Content hash used to detect whether a reload actually changed anything."""
+        h = hashlib.sha1()
+        h.update(self.ids.tobytes())
+        h.update("\x00".join(self.names).encode())
+        for name in CATALOG_COLUMNS:
+            h.update(self.columns[name].tobytes())
+        for name in DIET_FLAGS:
+            h.update(self.flags[name].tobytes())
+        return h.hexdigest()
+
+    @cached_property
+    def nutrients(self) -> np.ndarray:
+        """(len(NUTRIENT_FIELDS) x n) nutrient matrix in the optimizer's row order."""
+        return self._frozen(np.vstack([self.columns[f] for f in NUTRIENT_FIELDS]))
+
+    @cached_property
+    def product_dicts(self) -> list[dict]:
+        """Products serialized as plain dicts (JSON responses / templates)."""
+        return [p._asdict() for p in self.products]
+
+    @cached_property
+    def sorted_names(self) -> list[str]:
+        """Sorted list of distinct, non-empty product names."""
+        return sorted({n for n in self.names if n})
+
+    @cached_property
+    def name_index(self) -> dict[str, np.ndarray]:
+        """Normalized name -> sorted indices of all products with that name."""
+        names, inverse = np.unique(self.normalized_names, return_inverse=True)
+        inverse = inverse.ravel()
+        # Indices grouped by name (read-only slices of one array)
+        order = self._frozen(np.argsort(inverse, kind="stable"))
+        ends = np.cumsum(np.bincount(inverse, minlength=len(names))).tolist()
+        starts = [0] + ends[:-1]
+        return {name: order[start:end] for name, start, end in zip(names.tolist(), starts, ends)}
+
+    def sort_order(self, field: str) -> np.ndarray:
+        """
+        Indices of all products ordered by `field` ("id", "productName" (normalized) or a
+        CATALOG_COLUMNS name), ties broken by id. Cached per field, like the other derived arrays.
+        """
+        orders = self.__dict__.setdefault("_sort_orders", {})
+        if field not in orders:
+            orders[field] = self._frozen(np.lexsort((self.ids, self.sort_keys(field))))
+        return orders[field]
+
+    def sort_keys(self, field: str) -> np.ndarray:
+        """Values sort_order() sorts by."""
+        if field == "id":
+            return self.ids
+        if field == "productName":
+            return self.normalized_names
+        return self.columns[field]
+
+    def lookup(self, name: str, within: np.ndarray = None) -> np.ndarray:
+        """
+        Products named `name` (compared normalized), found through name_index.
+
+        Args:
+            name: Product name as entered by the user
+            within: Optional sorted index array (e.g. the products left after filtering)
+
+        Returns:
+            Catalog indices of the matching products or, with `within`, their positions in it
+        """
+        found = self.name_index.get(normalize_name(name), _NO_PRODUCTS)
+        if within is None or not len(found) or not len(within):
+            return found if within is None else _NO_PRODUCTS
+        positions = np.minimum(np.searchsorted(within, found), len(within) - 1)
+        return positions[within[positions] == found]
+
+    def suggest_names(self, name: str, within: np.ndarray = None, limit: int = 3) -> list[str]:
+        """
+        Names of products that look like `name` (e.g. typos in a restriction), best match first.
+
+        Args:
+            name: Unknown product name
+            within: Optional index array limiting the products suggested
+            limit: Maximum number of suggestions
+
+        Returns:
+            Product names as stored in the catalog
+        """
+        names = self.name_index.keys() if within is None else set(self.normalized_names[within].tolist())
+        matches = difflib.get_close_matches(normalize_name(name), names, n=limit, cutoff=NAME_SUGGESTION_CUTOFF)
+        suggestions = []
+        for match in matches:
+            found = self.name_index[match] if within is None else within[self.lookup(match, within)]
+            suggestions.append(self.names[found[0]])
+        return suggestions
+
+    def diet_mask(self, vegan: bool = False, vegetarian: bool = False, dairyFree: bool = False) -> np.ndarray:
+        """
+        Boolean mask of products allowed by the given dietary preferences.
+
+        Vegans only get vegan products, vegetarians get vegetarian or vegan products,
+        and dairyFree additionally removes products containing dairy.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if vegan:
+            mask &= self.flags["vegan"]
+        elif vegetarian:
+            mask &= self.flags["vegetarian"] | self.flags["vegan"]
+        if dairyFree:
+            mask &= self.flags["dairyFree"]
+        return mask
+
+    def unique_indices(self) -> np.ndarray:
+        """
+        Indices of the first occurrence of every distinct product, in catalog order.
+
+        Two products are duplicates when their normalized names, all numeric columns
+        (rounded to 2 decimals) and dietary flags are equal. Rows are compared as raw
+        bytes through a void view, so no per-product Python keys are built.
+        """
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        name_codes = np.unique(self.normalized_names, return_inverse=True)[1]
+        keys = np.column_stack(
+            [name_codes.astype(np.float64)]
+            + [np.round(self.columns[name], 2) for name in CATALOG_COLUMNS]
+            + [self.flags[name].astype(np.float64) for name in DIET_FLAGS]
+        ) + 0.0  # turns -0.0 into 0.0 so both compare equal byte-wise
+        keys = np.ascontiguousarray(keys)
+        rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+        _, first = np.unique(rows, return_index=True)
+        return np.sort(first)
+
+
+# --- Global Catalog Instance and Helper Functions ---
+
+_catalog = None             # Current ProductCatalog snapshot
+_catalog_loaded_at = 0.0    # time.monotonic() of the last (re)load
+_catalog_stale = False      # Set by invalidate_product_catalog()
+_catalog_lock = threading.Lock()
+
+
+def _fresh_catalog():
+    """The loaded catalog if it is neither invalidated nor older than CATALOG_TTL_SECONDS, else None."""
+    catalog = _catalog
+    if catalog is not None and not _catalog_stale and time.monotonic() - _catalog_loaded_at < CATALOG_TTL_SECONDS:
+        return catalog
+    return None
+
+
+def get_product_catalog(db: Session) -> ProductCatalog:
+    """
+    Return the process-wide product catalog, (re)loading it from the database when it
+    has not been loaded yet, was invalidated, or is older than CATALOG_TTL_SECONDS.
+
+    The version only increases when the reloaded content differs from the previous snapshot.
+    """
+    global _catalog, _catalog_loaded_at, _catalog_stale
+
+    catalog = _fresh_catalog()
+    if catalog is not None:
+        return catalog
+
+    with _catalog_lock:
+        # Another thread may have reloaded while we waited for the lock
+        if _fresh_catalog() is not None:
+            return _catalog
+
+        previous = _catalog
+        fresh = ProductCatalog.load(db, version=previous.version + 1 if previous else 1)
+        if previous is not None and fresh.digest == previous.digest:
+            fresh = previous  # unchanged content keeps its version (and derived caches)
+
+        _catalog = fresh
+        _catalog_loaded_at = time.monotonic()
+        _catalog_stale = False
+        return _catalog
+
+
+async def get_product_catalog_async() -> ProductCatalog:
+    """
+    get_product_catalog() for `async def` endpoints: returns the cached catalog directly, and
+    (re)loads it in the threadpool with a sync session of its own, so neither the load nor
+    the lock blocks the event loop.
+    """
+    catalog = _fresh_catalog()
+    if catalog is not None:
+        return catalog
+
+    def load():
+        db = SessionLocal()
+        try:
+            return get_product_catalog(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(load)
+
+
+def install_product_catalog(catalog: ProductCatalog):
+    """Use `catalog` (e.g. loaded from an export at startup) until the next invalidation or TTL reload."""
+    global _catalog, _catalog_loaded_at, _catalog_stale
+    with _catalog_lock:
+        _catalog = catalog
+        _catalog_loaded_at = time.monotonic()
+        _catalog_stale = False
+
+
+def invalidate_product_catalog():
+    """Mark the catalog as stale; the next get_product_catalog() call reloads it."""
+    global _catalog_stale
+    _catalog_stale = True
@@ -0,0 +1,265 @@
+from collections import Counter, OrderedDict
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+import numpy as np
+import unicodedata
+import threading
+import bisect
+import time
+import os
+
+from app.backend.models.userProducts import UserProduct
+from app.backend.dependencies.productCatalog import get_product_catalog, normalize_name
+
+# Minimum share of the query's trigrams a name needs for a fuzzy (typo-tolerant) match
+SEARCH_MIN_SIMILARITY = float(os.getenv("PRODUCT_SEARCH_MIN_SIMILARITY", "0.5"))
+# Per-user name indices kept in memory (least recently used are dropped)
+USER_SEARCH_CACHE_SIZE = int(os.getenv("PRODUCT_SEARCH_USER_CACHE_SIZE", "256"))
+# Seconds a per-user index is trusted before it is reloaded (renames made by other processes)
+USER_SEARCH_TTL_SECONDS = float(os.getenv("PRODUCT_SEARCH_USER_TTL", "60"))
+
+# Match tiers, best first
+NAME_PREFIX, WORD_PREFIX, FUZZY = 0, 1, 2
+
+# Latvian letters with diacritics (after lower-casing); other marks are stripped through NFKD
+_FOLD = str.maketrans("āčēģīķļņōŗšūž", "acegiklnorsuz")
+
+
+def fold_name(name: str) -> str:
+    """
+    Search key of a name: normalized (see normalize_name()), Latvian diacritics folded
+    ("Piens ķefīrs" -> "piens kefirs"), other combining marks dropped, whitespace collapsed.
+    """
+    folded = normalize_name(name).translate(_FOLD)
+    if not folded.isascii():
+        folded = "".join(c for c in unicodedata.normalize("NFKD", folded) if not unicodedata.combining(c))
+    return " ".join(folded.split())
+
+
+def _trigrams(folded: str, complete: bool = True) -> set[str]:
+    # Names are padded on both sides; a typed query may still be incomplete, so only at the start
+    padded = f" {folded} " if complete else f" {folded}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameSearchIndex:
+    """
+    In-memory typeahead index over product names: sorted name and word prefixes (bisect)
+    plus trigram postings for typo-tolerant matches, all on folded names.
+
+    Names are reference counted and can be added and removed one at a time, so the index
+    follows catalog reloads and user product changes without being rebuilt. Removed names
+    keep their (dead) entries and get them back when they are added again.
+    """
+
+    def __init__(self, names=(), version=None):
+        """
+        Args:
+            names: Initial product names (duplicates are counted)
+            version: Catalog version (or user products version) the index reflects, see
+                get_product_search_index() and get_user_search_index()
+        """
+        self.version = version
+        self.names = []         # display name by id
+        self.folded = []        # fold_name() by id
+        self.counts = []        # products per id (0 = removed)
+        self.ids = {}           # display name -> id
+        self._starts = []       # sorted (folded name, id)
+        self._words = []        # sorted (folded name from its 2nd, 3rd, ... word on, id)
+        self._trigrams = {}     # trigram -> ids
+        self._postings = {}     # trigram -> ids as a NumPy array (built on first use)
+        self._lengths = None    # folded name lengths by id as a NumPy array (built on first use)
+        self._lock = threading.Lock()
+
+        starts, words = [], []
+        for name in names:
+            self._add(name, starts, words)
+        self._starts = sorted(starts)
+        self._words = sorted(words)
+
+    def __len__(self) -> int:
+        return sum(1 for c in self.counts if c)
+
+    def _add(self, name: str, starts: list = None, words: list = None):
+        """Count one product named `name`; new names get entries (appended, or inserted in order)."""
+        i = self.ids.get(name)
+        if i is not None:
+            self.counts[i] += 1
+            return
+        i = len(self.names)
+        folded = fold_name(name)
+        self.ids[name] = i
+        self.names.append(name)
+        self.folded.append(folded)
+        self.counts.append(1)
+
+        entries = [(folded, i)]
+        inner = [(folded[p + 1:], i) for p, c in enumerate(folded) if c == " "]
+        if starts is None:
+            for entry in entries:
+                bisect.insort(self._starts, entry)
+            for entry in inner:
+                bisect.insort(self._words, entry)
+        else:
+            starts.extend(entries)
+            words.extend(inner)
+        for gram in _trigrams(folded):
+            self._trigrams.setdefault(gram, []).append(i)
+            self._postings.pop(gram, None)
+        self._lengths = None
+
+    def add(self, names):
+        """Add products by name."""
+        with self._lock:
+            for name in names:
+                if name:
+                    self._add(name)
+
+    def remove(self, names):
+        """Remove products by name (unknown names are ignored)."""
+        with self._lock:
+            for name in names:
+                i = self.ids.get(name)
+                if i is not None and self.counts[i]:
+                    self.counts[i] -= 1
+
+    def sync(self, names, version: int = None):
+        """Apply the difference to a new list of product names (e.g. a reloaded catalog)."""
+        new = Counter(n for n in names if n)
+        old = Counter({name: self.counts[i] for name, i in self.ids.items() if self.counts[i]})
+        self.add((new - old).elements())
+        self.remove((old - new).elements())
+        self.version = version
+
+    def _prefix(self, entries: list, query: str, tier: int, limit: int, found: dict):
+        start = bisect.bisect_left(entries, (query,))
+        for j in range(start, len(entries)):
+            key, i = entries[j]
+            if len(found) >= limit or not key.startswith(query):
+                break
+            if self.counts[i] and i not in found:
+                found[i] = (tier, self.folded[i])
+
+    def _posting(self, gram: str) -> np.ndarray:
+        posting = self._postings.get(gram)
+        if posting is None:
+            posting = self._postings[gram] = np.asarray(self._trigrams[gram], dtype=np.intp)
+        return posting
+
+    def search(self, query: str, limit: int = 10) -> list[tuple]:
+        """
+        Best matches of a (partially typed) query.
+
+        Names starting with the query come first, then names with a word starting with it
+        (both alphabetically), then, if there are fewer than `limit`, names sharing at least
+        SEARCH_MIN_SIMILARITY of the query's trigrams (most shared first, shorter first).
+
+        Returns:
+            Up to `limit` (tier, rank, display name) tuples, best first
+        """
+        query = fold_name(query)
+        if not query:
+            return []
+        found = {}
+        self._prefix(self._starts, query, NAME_PREFIX, limit, found)
+        self._prefix(self._words, query, WORD_PREFIX, limit, found)
+
+        grams = [g for g in _trigrams(query, complete=False) if g in self._trigrams]
+        if len(found) < limit and grams:
+            # Shared trigrams of every name, counted over the query's postings at once
+            postings = [self._posting(g) for g in grams]
+            shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+            needed = max(SEARCH_MIN_SIMILARITY * len(_trigrams(query, complete=False)), 1)
+            candidates = np.flatnonzero(shared >= needed)
+            if self._lengths is None:
+                self._lengths = np.asarray([len(f) for f in self.folded])
+            # Most shared trigrams first, then shorter names
+            candidates = candidates[np.lexsort((self._lengths[candidates], -shared[candidates]))]
+            wanted = limit - len(found)
+            for i in candidates.tolist():
+                if self.counts[i] and i not in found:
+                    found[i] = (FUZZY, (-int(shared[i]), len(self.folded[i]), self.folded[i]))
+                    wanted -= 1
+                    if not wanted:
+                        break
+        return sorted((tier, rank, self.names[i]) for i, (tier, rank) in found.items())
+
+
+def merge_search_results(results, limit: int = 10) -> list[str]:
+    """Names of the best `limit` matches over several indices (first index wins ties), folded duplicates dropped."""
+    ranked = sorted((tier, rank, source, name) for source, matches in enumerate(results) for tier, rank, name in matches)
+    names, seen = [], set()
+    for _, _, _, name in ranked:
+        key = fold_name(name)
+        if key not in seen:
+            seen.add(key)
+            names.append(name)
+            if len(names) == limit:
+                break
+    return names
+
+
+# --- Global and Per-User Index Instances ---
+
+_global_index = None
+_global_lock = threading.Lock()
+_user_indices = OrderedDict()   # userUuid -> (NameSearchIndex, monotonic load time) (LRU)
+_user_lock = threading.Lock()
+
+
+def get_product_search_index(db: Session) -> NameSearchIndex:
+    """
+    Search index over the global product names, synced with the product catalog: when the
+    catalog version changes only the added and removed names are applied.
+    """
+    global _global_index
+    catalog = get_product_catalog(db)
+    index = _global_index
+    if index is not None and index.version == catalog.version:
+        return index
+    with _global_lock:
+        if _global_index is None:
+            _global_index = NameSearchIndex(catalog.names, version=catalog.version)
+        elif _global_index.version != catalog.version:
+            _global_index.sync(catalog.names, version=catalog.version)
+        return _global_index
+
+
+def _user_products_version(db: Session, userUuid: int) -> tuple:
+    """(count, max id) of a user's products: changes whenever a product is added or deleted, by any process."""
+    count, last_id = db.query(func.count(UserProduct.id), func.max(UserProduct.id)).filter(
+        UserProduct.userUuid == userUuid).one()
+    return count, last_id
+
+
+def get_user_search_index(db: Session, userUuid: int) -> NameSearchIndex:
+    """
+    Search index over one user's product names. A cached index is reused while the user's
+    products version (see _user_products_version()) is unchanged and it is younger than
+    USER_SEARCH_TTL_SECONDS; changes made by this process are applied by
+    update_user_search_index(), those of other processes are picked up by the reload.
+    """
+    version = _user_products_version(db, userUuid)
+    with _user_lock:
+        index, loaded_at = _user_indices.get(userUuid, (None, 0.0))
+        if index is not None and index.version == version and \
+                time.monotonic() - loaded_at < USER_SEARCH_TTL_SECONDS:
+            _user_indices.move_to_end(userUuid)
+            return index
+    names = [n for (n,) in db.query(UserProduct.productName).filter(UserProduct.userUuid == userUuid)]
+    index = NameSearchIndex(names, version=version)
+    with _user_lock:
+        _user_indices[userUuid] = (index, time.monotonic())
+        _user_indices.move_to_end(userUuid)
+        while len(_user_indices) > USER_SEARCH_CACHE_SIZE:
+            _user_indices.popitem(last=False)
+    return index
+
+
+def update_user_search_index(userUuid: int, added=(), removed=()):
+    """Apply a user's product changes to their cached index (no-op when it is not cached)."""
+    with _user_lock:
+        index, _ = _user_indices.get(userUuid, (None, 0.0))
+    if index is not None:
+        index.remove(removed)
+        index.add(added)
@@ -1,15 +1,19 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import os
 from pathlib import Path
 
+from app.backend.database import async_engine
 from app.backend.dependencies.getUserUuidFromToken import decode_access_token
 from app.backend.routers import consumedProductRouter, userRouter, mainPageRouter, statisticsRouter, productRouter, \
     userProductRouter, menuRouter, recipeRouter, profileRouter
 from app.backend.dependencies.firefoxDriver import init_firefox_pool, get_firefox_pool
+from app.backend.dependencies.menuJobs import init_menu_job_queue, get_menu_job_queue
+from app.backend.dependencies.catalogExport import preload_product_catalog
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 
 # Lifespn
@@ -18,10 +22,14 @@ async def lifespan(app: FastAPI):
     """
         Startup and shutdown logic for FastAPI application.
         - Initializes a pool of Firefox drivers for scraping tasks.
-        - Ensures proper shutdown of the pool on application exit.
+        - Initializes the menu job queue (solver worker processes).
+        - Memory-maps the product catalog cache, if one is configured.
+        - Ensures proper shutdown of the pools (and the async engine's connections) on application exit.
     """
     print("Starting application...")
     init_firefox_pool(pool_size=1, geckodriver_path=None, headless=True)
+    init_menu_job_queue()
+    preload_product_catalog()
     print("Application startup complete")
     yield # application runs here
     print("Shutting down application...")
@@ -30,6 +38,8 @@ async def lifespan(app: FastAPI):
         pool.shutdown()
     except RuntimeError:
         pass # ignore if pool was already shutdown
+    get_menu_job_queue().shutdown()
+    await async_engine.dispose()
     print("Application shutdown complete")
 
 # Initialize FastAPI
@@ -69,7 +79,7 @@ PUBLIC_PREFIXES = (
     "/auth/login", "/auth/register", "/auth/verify",
     "/auth/verification/start", "/auth/verification/confirm",
     "/auth/forgot-password", "/auth/reset-password",
-    "/static", "/uploads", "/docs", "/openapi.json",
+    "/static", "/uploads", "/docs", "/openapi.json", "/metrics",
 )
 COOKIE = "access_token"
 
@@ -129,6 +139,11 @@ app.include_router(userRouter.user, prefix="/auth", tags=["auth"])
 app.include_router(recipeRouter.recipes, prefix="/recipes", tags=["recipes"])
 app.include_router(profileRouter.profile, prefix="/profile", tags=["profile"])
 
+# Prometheus metrics (menu solve timings and model statistics, see dependencies/menuMetrics.py)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # Catch-all routes
 @app.get("/{full_path:path}")
 async def catch_all(full_path: str, request: Request):
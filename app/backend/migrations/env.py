@@ -0,0 +1,52 @@
+"""
+Alembic environment of the backend database. Connects with DATABASE_URL (via
+app.backend.database) and compares against the models' metadata, so
+`alembic revision --autogenerate` picks up new columns and indexes.
+
+The tables that predate the migrations (users, products, userProducts, ...) are
+expected to exist already; the first revision only adds what came after them.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+import app.backend  # registers every model on Base.metadata
+from app.backend.database import Base, DATABASE_URL, engine
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout (alembic upgrade head --sql) instead of running it."""
+    context.configure(url=DATABASE_URL, target_metadata=target_metadata, literal_binds=True,
+                      dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run_migrations(connection) -> None:
+    # One transaction per revision, so a revision can leave it for an autocommit_block()
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=True,
+                      render_as_batch=connection.dialect.name == "sqlite")
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations on the API's engine, or on config.attributes["connection"] if given."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_migrations(connection)
+        return
+    with engine.connect() as connection:
+        _run_migrations(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,51 @@
+"""daily nutrition rollup
+
+Creates userDailyNutrition (see app/backend/dependencies/nutritionRollup.py) unless
+rebuildNutritionRollup already did, and fills it from userConsumedProducts.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_FIELDS = ("kcal", "fat", "satFat", "carbs", "sugar", "protein", "dairyProtein", "animalProtein",
+                 "plantProtein", "salt", "cost")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Skipped if rebuildNutritionRollup created the table already (not checkable with --sql)
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table("userDailyNutrition"):
+        return
+    op.create_table(
+        "userDailyNutrition",
+        sa.Column("userUuid", sa.BigInteger, sa.ForeignKey("users.uuid"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        *[sa.Column(field, sa.Float, nullable=False) for field in ROLLUP_FIELDS],
+        sa.Column("products", sa.BigInteger, nullable=False),
+    )
+
+    columns = ", ".join(f'"{field}"' for field in ROLLUP_FIELDS)
+    sums = ", ".join(f'coalesce(sum("{field}"), 0)' for field in ROLLUP_FIELDS)
+    op.execute(
+        f'INSERT INTO "userDailyNutrition" ("userUuid", "day", {columns}, "products") '
+        f'SELECT "userUuid", date("date"), {sums}, count(*) FROM "userConsumedProducts" '
+        f'GROUP BY "userUuid", date("date")'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("userDailyNutrition")
@@ -0,0 +1,47 @@
+"""lookup indexes
+
+Composite (userUuid, date) index for the consumed-product and statistics range queries,
+and (userUuid, lower(name)) expression indexes for the case-insensitive name lookups of
+userProducts and userMenu (the services compare lower(name) = lower(:name)).
+
+On PostgreSQL the indexes are built CONCURRENTLY, so the tables stay writable.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (table, columns); must match the Index declarations of the models
+INDEXES = {
+    "ix_userConsumedProducts_userUuid_date": ("userConsumedProducts", ["userUuid", "date"]),
+    "ix_userProducts_userUuid_lower_productName": ("userProducts", ["userUuid", sa.text('lower("productName")')]),
+    "ix_userMenu_userUuid_lower_name": ("userMenu", ["userUuid", sa.text('lower("name")')]),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in INDEXES.items():
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, (table, _) in INDEXES.items():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
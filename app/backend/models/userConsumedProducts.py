@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, BigInteger, String, Float, DateTime, ForeignKey, Index
 from app.backend.database import Base
 
 class UserConsumedProduct(Base):
@@ -21,4 +21,9 @@ class UserConsumedProduct(Base):
     salt = Column(Float, nullable=False)
     cost = Column(Float, nullable=False)
 
-    date = Column(DateTime(timezone=False), nullable=False)
\ No newline at end of file
+    date = Column(DateTime(timezone=False), nullable=False)
+
+    __table_args__ = (
+        # Every consumed-product query filters one user's entries by a date range
+        Index("ix_userConsumedProducts_userUuid_date", "userUuid", "date"),
+    )
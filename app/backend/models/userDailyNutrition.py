@@ -0,0 +1,22 @@
+from sqlalchemy import Column, BigInteger, Float, Date, ForeignKey
+from app.backend.database import Base
+
+class UserDailyNutrition(Base):
+    """Per-user, per-day totals of userConsumedProducts (see dependencies/nutritionRollup.py)."""
+    __tablename__ = "userDailyNutrition"
+
+    userUuid = Column(BigInteger, ForeignKey("users.uuid"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    kcal = Column(Float, nullable=False, default=0.0)
+    fat = Column(Float, nullable=False, default=0.0)
+    satFat = Column(Float, nullable=False, default=0.0)
+    carbs = Column(Float, nullable=False, default=0.0)
+    sugar = Column(Float, nullable=False, default=0.0)
+    protein = Column(Float, nullable=False, default=0.0)
+    dairyProtein = Column(Float, nullable=False, default=0.0)
+    animalProtein = Column(Float, nullable=False, default=0.0)
+    plantProtein = Column(Float, nullable=False, default=0.0)
+    salt = Column(Float, nullable=False, default=0.0)
+    cost = Column(Float, nullable=False, default=0.0)
+    products = Column(BigInteger, nullable=False, default=0)  # consumed entries that day
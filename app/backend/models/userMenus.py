@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Float, JSON, ForeignKey, String, DateTime, Boolean
+from sqlalchemy import Column, BigInteger, Float, JSON, ForeignKey, String, DateTime, Boolean, Index, func
 from sqlalchemy.orm import relationship
 from app.backend.database import Base
 
@@ -25,4 +25,9 @@ class UserMenu(Base):
     dairyFree = Column(Boolean, default=False, nullable=False)
     restrictions = Column(JSON, nullable=True)
 
+    __table_args__ = (
+        # Case-insensitive name lookups: lower(name) = lower(:name)
+        Index("ix_userMenu_userUuid_lower_name", userUuid, func.lower(name)),
+    )
+
 recipes = relationship("Recipe", secondary="userMenuRecipes")
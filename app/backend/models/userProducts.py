@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Float, String, Boolean, ForeignKey
+from sqlalchemy import Column, BigInteger, Float, String, Boolean, ForeignKey, Index, func
 from app.backend.database import Base
 
 class UserProduct(Base):
@@ -22,4 +22,9 @@ class UserProduct(Base):
     vegan = Column(Boolean, nullable=False, default=False)
     vegetarian = Column(Boolean, nullable=False, default=False)
     dairyFree = Column(Boolean, nullable=False, default=False)
-    URL = Column(String, nullable=True, default="")
\ No newline at end of file
+    URL = Column(String, nullable=True, default="")
+
+    __table_args__ = (
+        # Case-insensitive name lookups: lower(productName) = lower(:name)
+        Index("ix_userProducts_userUuid_lower_productName", userUuid, func.lower(productName)),
+    )
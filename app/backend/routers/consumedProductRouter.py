@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from app.backend.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.backend.database import get_async_db
 from app.backend.schemas.requests.deleteConsumedProductRequest import DeleteConsumedProductRequest
 from app.backend.schemas.requests.postUserConsumedProductRequest import PostUserConsumedProductRequest
 from app.backend.schemas.requests.getConsumedProductByDateRequest import GetConsumedProductByDateRequest
 from app.backend.schemas.responses.userConsumedProductResponse import UserConsumedProductListResponse
-from app.backend.services.consumedProductService import add_consumed_product, get_all_consumed_products, get_consumed_today, get_consumed_last_7_days, get_consumed_last_30_days, delete_consumed_product, get_consumed_by_date
+from app.backend.services.consumedProductService import add_consumed_product_async, get_all_consumed_products_async, get_consumed_today_async, \
+    get_consumed_last_7_days_async, get_consumed_last_30_days_async, delete_consumed_product_async, get_consumed_by_date_async
 from app.backend.dependencies.getUserUuidFromToken import get_uuid_from_token
 from fastapi.templating import Jinja2Templates
 
@@ -19,34 +20,34 @@ def showConsumedProductPage(request: Request):
 
 # Returns product data as JSON for the React frontend
 @consumedProduct.get("/list")
-def showConsumedProductPageJson(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    products = get_all_consumed_products(db, userUuid)
+async def showConsumedProductPageJson(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    products = await get_all_consumed_products_async(db, userUuid)
     return {"products": products}
 
 @consumedProduct.post("/saveConsumedProduct")
-def addConsumedProduct(request: PostUserConsumedProductRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return add_consumed_product(db, request, userUuid)
+async def addConsumedProduct(request: PostUserConsumedProductRequest, userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await add_consumed_product_async(db, request, userUuid)
 
 @consumedProduct.get("/all", response_model=UserConsumedProductListResponse)
-def getAllConsumedProducts(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_all_consumed_products(db, userUuid)
+async def getAllConsumedProducts(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_all_consumed_products_async(db, userUuid)
 
 @consumedProduct.get("/today", response_model=UserConsumedProductListResponse)
-def getConsumedToday(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_consumed_today(db, userUuid)
+async def getConsumedToday(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_consumed_today_async(db, userUuid)
 
 @consumedProduct.get("/last7days", response_model=UserConsumedProductListResponse)
-def getConsumedLast7Days(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_consumed_last_7_days(db, userUuid)
+async def getConsumedLast7Days(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_consumed_last_7_days_async(db, userUuid)
 
 @consumedProduct.get("/last30days", response_model=UserConsumedProductListResponse)
-def getConsumedLast30Days(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_consumed_last_30_days(db, userUuid)
+async def getConsumedLast30Days(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_consumed_last_30_days_async(db, userUuid)
 
 @consumedProduct.delete("/deleteProduct")
-def deleteConsumedProduct(request: DeleteConsumedProductRequest, db: Session = Depends(get_db)):
-    return delete_consumed_product(db, request)
+async def deleteConsumedProduct(request: DeleteConsumedProductRequest, db: AsyncSession = Depends(get_async_db)):
+    return await delete_consumed_product_async(db, request)
 
 @consumedProduct.post("/byDate")
-def getConsumedByDate(request: GetConsumedProductByDateRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_consumed_by_date(db, request, userUuid)
\ No newline at end of file
+async def getConsumedByDate(request: GetConsumedProductByDateRequest, userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_consumed_by_date_async(db, request, userUuid)
\ No newline at end of file
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from app.backend.database import get_db
 from app.backend.dependencies.getUserUuidFromToken import get_uuid_from_token
+from app.backend.dependencies.menuMetrics import server_timing
 from app.backend.schemas.requests.postDietPlanRequest import PostDietPlanRequest
 from app.backend.schemas.requests.deleteUserMenuRequest import DeleteUserMenuRequest
 from app.backend.schemas.requests.getMenuRequest import GetMenuRequest
 from app.backend.schemas.requests.dietRequest import DietRequest
+from app.backend.schemas.requests.dietBatchRequest import DietBatchRequest
+from app.backend.schemas.requests.menuFrontierRequest import MenuFrontierRequest
 from app.backend.schemas.responses.generateMenuResponse import GenerateMenuResponse
 from app.backend.schemas.responses.dietPlanResponse import DietPlanListResponse, DietPlanResponse
 from app.backend.schemas.responses.userMenuNamesResponse import UserMenuNamesResponse
-from app.backend.services.menuService import generate_diet_menu, save_diet_menu, get_user_menus, get_single_menu, \
-    delete_user_menu, get_user_menus_names
+from app.backend.schemas.responses.menuJobResponse import MenuJobResponse
+from app.backend.schemas.responses.menuFrontierResponse import MenuFrontierResponse
+from app.backend.services.menuService import generate_diet_menu_in_worker, save_diet_menu, get_user_menus, \
+    get_single_menu, delete_user_menu, get_user_menus_names, submit_diet_menu_job, get_diet_menu_job, \
+    menu_job_response, menu_job_events, generate_diet_menu_batch, generate_menu_frontier
 
 templates = Jinja2Templates(directory="app/frontend/templates")
 
@@ -27,9 +33,38 @@ def showUserMenuPage(request: Request):
     return templates.TemplateResponse("userMenuForm.html", {"request": request})
 
 @menu.post("/generateMenu", response_model=GenerateMenuResponse, response_class=JSONResponse)
-def generateDietMenu(request: DietRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    # just pass the whole request to service
-    return generate_diet_menu(db, request, userUuid)
+async def generateDietMenu(request: DietRequest, response: Response, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
+    # the solve runs in a worker process; this request just waits for it
+    result = await generate_diet_menu_in_worker(db, request, userUuid)
+    # debug requests also get the phase timings as a Server-Timing header
+    debug = result.get("debug") if isinstance(result, dict) else None
+    if debug:
+        response.headers["Server-Timing"] = server_timing(debug["phases"])
+    return result
+
+@menu.post("/generateMenuBatch")
+async def generateDietMenuBatch(request: DietBatchRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
+    # one NDJSON line per request, in the order the solves finish
+    return StreamingResponse(await generate_diet_menu_batch(db, request, userUuid), media_type="application/x-ndjson")
+
+@menu.post("/frontier", response_model=MenuFrontierResponse)
+async def generateMenuFrontier(request: MenuFrontierRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
+    # cost vs. a second objective; the sweep points are solved in parallel worker processes
+    return await generate_menu_frontier(db, request, userUuid)
+
+@menu.post("/jobs", response_model=MenuJobResponse, status_code=202)
+def submitMenuJob(request: DietRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
+    return submit_diet_menu_job(db, request, userUuid)
+
+@menu.get("/jobs/{jobId}", response_model=MenuJobResponse)
+def getMenuJob(jobId: str, userUuid: int = Depends(get_uuid_from_token)):
+    return menu_job_response(get_diet_menu_job(jobId, userUuid))
+
+@menu.get("/jobs/{jobId}/events")
+def streamMenuJob(jobId: str, userUuid: int = Depends(get_uuid_from_token)):
+    job = get_diet_menu_job(jobId, userUuid)
+    return StreamingResponse(menu_job_events(job), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 @menu.post("/saveMenu")
 def saveDietMenu(request: PostDietPlanRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
@@ -1,27 +1,59 @@
+from typing import Annotated
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Query
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from app.backend.database import get_db
+from app.backend.dependencies.getUserUuidFromToken import get_uuid_from_token
+from app.backend.dependencies.httpCaching import CACHE_CONTROL, etag_matches, not_modified
+from app.backend.schemas.requests.productListRequest import ProductListRequest
 from app.backend.schemas.responses.productBaseResponse import ProductsListResponse
 from app.backend.schemas.responses.productsNamesResponse import ProductsNamesResponse
-from app.backend.services.productService import get_products_names, get_all_products
+from app.backend.services.productService import get_products_names_async, list_products, product_list_etag, search_products, \
+    export_products
 
 product = APIRouter()
 
 templates = Jinja2Templates(directory="app/frontend/templates")
 
+# Products per page of the HTML table when no limit is given
+SHOW_PRODUCTS_PAGE_SIZE = 200
+
 @product.get("/showProducts", response_model=ProductsListResponse, response_class=HTMLResponse)
-def getAllProducts(request: Request, db=Depends(get_db)):
-    products = get_all_products(db)
-    return templates.TemplateResponse("products.html", {"request": request, "products": products})
+def getAllProducts(request: Request, query: Annotated[ProductListRequest, Query()], db=Depends(get_db)):
+    if query.limit is None:
+        query = query.model_copy(update={"limit": SHOW_PRODUCTS_PAGE_SIZE})
+    etag = product_list_etag(db, query, "html")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    page = list_products(db, query)
+    next_url = str(request.url.include_query_params(cursor=page["nextCursor"])) if page["nextCursor"] else None
+    return templates.TemplateResponse("products.html", {"request": request, "products": page["products"],
+                                                        "total": page["total"], "nextUrl": next_url},
+                                      headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
 
-# Returns product data as JSON for the React frontend
+# Returns product data as JSON for the React frontend (all products unless a limit is given)
 @product.get("/getAllProducts")
-def getAllProductsJson(db: Session = Depends(get_db)):
-    products = get_all_products(db)
-    return {"products": products}
+def getAllProductsJson(request: Request, query: Annotated[ProductListRequest, Query()], db: Session = Depends(get_db)):
+    # the ETag only changes with the catalog content, so unchanged catalogs get an empty 304
+    etag = product_list_etag(db, query)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JSONResponse(list_products(db, query), headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
 
 @product.get("/productsNames", response_model=ProductsNamesResponse, response_class=JSONResponse)
-def getProductsNames(db: Session = Depends(get_db)):
-    return get_products_names(db)
\ No newline at end of file
+async def getProductsNames():
+    return await get_products_names_async()
+
+# Typeahead: best matching global and own product names for the text typed so far
+@product.get("/search", response_model=ProductsNamesResponse)
+def searchProducts(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=50),
+                   userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
+    return search_products(db, q, userUuid, limit)
+
+# Columnar binary export for offline analyses and benchmarks (read with a server-side cursor, streamed)
+@product.get("/export")
+def exportProducts(table: str = "productsProtSep", format: str = "arrow", db: Session = Depends(get_db)):
+    chunks, media_type, filename = export_products(db, table, format)
+    return StreamingResponse(chunks, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
@@ -1,27 +1,28 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.backend.database import get_db
+from app.backend.database import get_async_db, get_db
 from app.backend.dependencies.getUserUuidFromToken import get_uuid_from_token
 from app.backend.schemas.requests.postChangeDailyNutritionRequest import PostChangeDailyNutritionRequest
 from app.backend.schemas.requests.postChangeProfileInfoRequest import PostChangeProfileInfoRequest
 from app.backend.schemas.requests.postRegisterRequest import CompleteRegistrationRequest
-from app.backend.services.profileService import get_user_profile_data, complete_info_submit, change_profile_info, \
-    change_daily_nutrition, calculate_daily_nutrition, calculated_nutrition_info
+from app.backend.services.profileService import get_user_profile_data_async, complete_info_submit, change_profile_info, \
+    change_daily_nutrition, calculate_daily_nutrition, calculated_nutrition_info_async
 
 profile = APIRouter()
 templates = Jinja2Templates(directory="app/frontend/templates")
 
 @profile.get("/", response_class=HTMLResponse)
-def profilePage(request: Request, userUuid: int = Depends(get_uuid_from_token),  db: Session = Depends(get_db)):
-    accountInfo = get_user_profile_data(db, userUuid)
+async def profilePage(request: Request, userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    accountInfo = await get_user_profile_data_async(db, userUuid)
     return templates.TemplateResponse("profile.html", {"request": request, "accountInfo": accountInfo})
 
 # Returns user profile data as JSON for the React frontend
 @profile.get("/getProfileInfo")
-def getProfileInfo(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_user_profile_data(db, userUuid)
+async def getProfileInfo(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_user_profile_data_async(db, userUuid)
 
 @profile.get("/complete", response_class=HTMLResponse)
 def completeForm(request: Request):
@@ -44,5 +45,5 @@ def calculateDailyNutrition(userUuid: int = Depends(get_uuid_from_token), db: Se
     return calculate_daily_nutrition(db, userUuid)
 
 @profile.get("/getCalculatedNutritionInfo")
-def calculatedNutritionInfo(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return calculated_nutrition_info(db, userUuid)
\ No newline at end of file
+async def calculatedNutritionInfo(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await calculated_nutrition_info_async(db, userUuid)
\ No newline at end of file
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, Request
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.responses import HTMLResponse, JSONResponse
-from app.backend.database import get_db
+from app.backend.database import get_async_db, get_db
 from app.backend.dependencies.getUserUuidFromToken import get_uuid_from_token
 from app.backend.schemas.requests.postUserProductByNutritionValueRequest import PostUserProductByNutritionValueUrlRequest
 from app.backend.schemas.requests.postUserProductByRimiUrlRequest import PostUserProductByRimiUrlRequest
@@ -12,7 +13,7 @@ from app.backend.schemas.responses.userProductBaseResponse import UserProductsLi
 from app.backend.schemas.responses.productsNamesResponse import ProductsNamesResponse
 from app.backend.schemas.requests.deleteUserProductRequest import DeleteUserProductRequest
 from app.backend.services.userProductService import add_user_product_by_rimi_url, add_user_product_by_nutrition_value_url, update_user_product, \
-    get_user_products, get_user_products_names, add_user_product, delete_user_product
+    get_user_products, get_user_products_names_async, add_user_product, delete_user_product
 
 userProduct = APIRouter()
 
@@ -28,8 +29,8 @@ def getUserProducts(userUuid: int = Depends(get_uuid_from_token), db: Session =
     return get_user_products(db, userUuid)
 
 @userProduct.get("/userProductsNames", response_model=ProductsNamesResponse, response_class=JSONResponse)
-def getUserProductsNames(userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
-    return get_user_products_names(db, userUuid)
+async def getUserProductsNames(userUuid: int = Depends(get_uuid_from_token), db: AsyncSession = Depends(get_async_db)):
+    return await get_user_products_names_async(db, userUuid)
 
 @userProduct.post("/addUserProduct")
 def addUserProduct(request: PostUserProductRequest, userUuid: int = Depends(get_uuid_from_token), db: Session = Depends(get_db)):
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+from app.backend.schemas.requests.dietRequest import DietRequest
+
+class DietBatchRequest(BaseModel):
+    # One DietRequest per menu (e.g. per household member); results are streamed as they finish
+    requests: list[DietRequest] = Field(..., min_length=1, max_length=20)
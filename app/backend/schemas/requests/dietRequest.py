@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 
 class DietRequest(BaseModel):
     kcal: float
@@ -11,4 +12,21 @@ class DietRequest(BaseModel):
     vegan: bool = False
     vegetarian: bool = False
     dairyFree: bool = False
-    restrictions: list[dict] = []
\ No newline at end of file
+    restrictions: list[dict] = []
+    # Optional solver overrides; the server defaults (MENU_SOLVER* env vars) apply when omitted,
+    # time limit and thread count are capped server-side
+    solver: Optional[str] = None        # "highs", "scip", "sat" or "cbc"
+    timeLimit: Optional[float] = Field(None, gt=0)      # seconds
+    mipGap: Optional[float] = Field(None, ge=0, lt=1)   # relative gap, e.g. 0.01 = stop within 1% of optimal
+    threads: Optional[int] = Field(None, ge=1)
+    # Start the solver from the user's previous menu (last generated or last saved)
+    warmStart: bool = False
+    # Multi-day planning: targets are per day, all days are solved as one model
+    days: int = Field(1, ge=1, le=14)
+    maxRepeats: Optional[int] = Field(None, ge=1)   # max number of days a product may be used on
+    budget: Optional[float] = Field(None, gt=0)     # max total cost of all days
+    # "preview" answers from the LP relaxation in milliseconds (cost bound, feasibility and an
+    # estimate built from the previous menu's products); "full" solves the menu model
+    mode: Literal["full", "preview"] = "full"
+    # Return phase timings and solver statistics in the response (debug field, Server-Timing header)
+    debug: bool = False
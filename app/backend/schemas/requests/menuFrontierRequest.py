@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+from app.backend.schemas.requests.dietRequest import DietRequest
+
+
+class MenuFrontierRequest(BaseModel):
+    request: DietRequest
+    # Second objective traded against cost (see dependencies/menuFrontier.py)
+    objective: Literal["sugars", "salt", "deviation", "products"]
+    # Number of sweep points (the returned frontier only keeps the non-dominated ones)
+    points: int = Field(10, ge=2, le=20)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class ProductListRequest(BaseModel):
+    """Query parameters of the product listing endpoints (see services/productService.list_products)."""
+    # Comma-separated product fields to return (default: all), e.g. "productName,kcal,price100g"
+    fields: Optional[str] = None
+    # Field to sort by, prefixed with "-" for descending (ties are broken by id)
+    sort: str = "id"
+    # Page size (default: everything after the cursor)
+    limit: Optional[int] = Field(None, ge=1)
+    # Opaque cursor from the previous page's nextCursor
+    cursor: Optional[str] = None
+    # Nutrient ranges "column:min:max" (either bound may be empty), e.g. "kcal:100:300", "protein:20:"
+    range: List[str] = []
+    vegan: bool = False
+    vegetarian: bool = False
+    dairyFree: bool = False
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Literal
+
+
+class StatisticsSeriesRequest(BaseModel):
+    """Query parameters of /statistics/series (see services/statisticsService.get_statistics_series_async)."""
+    startDate: date
+    endDate: date
+    # Bucket width; weeks start on Monday, months on the 1st (the first/last bucket may be partial)
+    bucket: Literal["day", "week", "month"] = "day"
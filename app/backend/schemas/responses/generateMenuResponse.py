@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class ProductItem(BaseModel):
@@ -18,6 +18,58 @@ class ProductItem(BaseModel):
     salt: float
 
 
+class DayMenu(BaseModel):
+    day: int
+    plan: List[ProductItem]
+    totalKcal: float
+    totalCost: float
+    totalFat: float
+    totalCarbs: float
+    totalProtein: float
+    totalDairyProtein: float
+    totalAnimalProtein: float
+    totalPlantProtein: float
+    totalSugar: float
+    totalSatFat: float
+    totalSalt: float
+
+
+class MenuConflict(BaseModel):
+    # Bound to relax: "<row>Min" / "<row>Max" (e.g. "caloriesMin", "fatMax"), "minWeight" /
+    # "maxWeight" (product restriction), "budget", "maxRepeats" or "minProducts"
+    constraint: str
+    product: Optional[str] = None
+    bound: float
+    relaxBy: float
+    suggested: float
+
+
+class PresolveInfo(BaseModel):
+    # Candidate products before presolve and products handed to the solver
+    products: int
+    kept: int
+    # Why the others were removed (see dependencies/menuPresolve.py)
+    fixed: int
+    unusable: int
+    dominated: int
+
+
+class MenuDebugInfo(BaseModel):
+    # Request shape label used in the metrics, e.g. "single", "multi-day+budget", "coupled+warm"
+    shape: str
+    backend: str
+    status: str
+    # Milliseconds per phase: fetch, combine, prepare, presolve, queue, build, solve, diagnose, response
+    # (cached menus: fetch, combine, cache)
+    phases: Dict[str, float]
+    variables: Optional[int] = None
+    constraints: Optional[int] = None
+    binaries: Optional[int] = None
+    # Branch-and-bound nodes (only reported by CBC) and relative gap of the returned menu
+    nodes: Optional[int] = None
+    gap: Optional[float] = None
+
+
 class GenerateMenuResponse(BaseModel):
     status: str
     totalKcal: Optional[float] = None
@@ -34,3 +86,15 @@ class GenerateMenuResponse(BaseModel):
     plan: Optional[List[ProductItem]] = None
     message: Optional[str] = None
     invalidProducts: Optional[List[str]] = None
+    # Similar catalog product names for each invalid product (best match first)
+    suggestions: Optional[Dict[str, List[str]]] = None
+    # Multi-day requests: plan/totals cover the whole period, days holds each day's menu
+    days: Optional[List[DayMenu]] = None
+    # Infeasible requests: the smallest relaxation of the bounds that makes a menu possible
+    conflicts: Optional[List[MenuConflict]] = None
+    # Preview mode: lower bound on the cost of the full menu (from the LP relaxation)
+    costBound: Optional[float] = None
+    # Size reduction of the solver model (omitted when presolve is disabled)
+    presolve: Optional[PresolveInfo] = None
+    # Phase timings and solver statistics (requests with debug=true)
+    debug: Optional[MenuDebugInfo] = None
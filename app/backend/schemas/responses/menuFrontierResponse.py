@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.backend.schemas.responses.generateMenuResponse import GenerateMenuResponse
+
+
+class MenuFrontierPoint(BaseModel):
+    totalCost: float
+    value: float                    # Second objective of this menu (per day)
+    menu: GenerateMenuResponse
+
+
+class MenuFrontierResponse(BaseModel):
+    status: str
+    objective: str
+    # Non-dominated menus, cheapest first
+    points: List[MenuFrontierPoint] = []
+    message: Optional[str] = None
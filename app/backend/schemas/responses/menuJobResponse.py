@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class MenuJobResponse(BaseModel):
+    jobId: str
+    status: str                       # "queued", "running", "done" or "failed"
+    result: Optional[dict] = None     # GenerateMenuResponse (or error dict) once done
+    error: Optional[str] = None
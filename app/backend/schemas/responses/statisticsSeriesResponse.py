@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Dict, List
+
+
+class StatisticsSeriesResponse(BaseModel):
+    bucket: str
+    # Columnar series: the i-th value of every list belongs to the bucket starting on starts[i]
+    starts: List[date]
+    days: List[int]                     # Days of the requested range inside each bucket
+    totals: Dict[str, List[float]]      # Nutrient/cost/products name -> sum per bucket
+    averages: Dict[str, List[float]]    # Same, divided by the bucket's days
@@ -1,40 +1,41 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
 from datetime import datetime, timedelta
 from app.backend.models.userConsumedProducts import UserConsumedProduct
 from app.backend.models.userProducts import UserProduct
-from app.backend.models.productsProtSep import ProductProtSep
+from app.backend.dependencies.productCatalog import get_product_catalog_async
+from app.backend.dependencies.nutritionRollup import apply_to_rollup_async
 from app.backend.schemas.requests.postUserConsumedProductRequest import PostUserConsumedProductRequest
 from app.backend.schemas.requests.deleteConsumedProductRequest import DeleteConsumedProductRequest
 from app.backend.schemas.requests.getConsumedProductByDateRequest import GetConsumedProductByDateRequest
 from app.backend.schemas.responses.userConsumedProductResponse import UserConsumedProductResponse, UserConsumedProductListResponse
 
 
-def add_consumed_product(db: Session, request: PostUserConsumedProductRequest, userUuid: int):
-    """
-    Add a new consumed product entry for a user.
-
-    - Looks up the product by name (first in user’s products, then in global DB)
-    - Calculates nutritional values proportionally to the consumed amount
-    - Stores the record in `UserConsumedProduct`
-    """
-    # Try to find the product in user's custom list
-    product = (
-        db.query(UserProduct)
-        .filter(UserProduct.userUuid == userUuid)
-        .filter(UserProduct.productName.ilike(request.productName.strip()))
-        .first()
+def _user_product_query(userUuid: int, productName: str):
+    """The user's own product with this name (case-insensitive)."""
+    return (
+        select(UserProduct)
+        .where(UserProduct.userUuid == userUuid)
+        .where(func.lower(UserProduct.productName) == func.lower(productName.strip()))
+        .limit(1)
     )
 
-    # Fall back to global products if not found in user's list
-    if not product:
-        product = (
-            db.query(ProductProtSep)
-            .filter(ProductProtSep.productName.ilike(request.productName.strip()))
-            .first()
-        )
 
+def _catalog_product(catalog, productName: str):
+    """Global product with this name from the name index of the cached catalog, or None."""
+    found = catalog.lookup(productName)
+    return catalog.products[found[0]] if len(found) else None
+
+
+def _consumed_entry(request: PostUserConsumedProductRequest, userUuid: int, product) -> UserConsumedProduct:
+    """
+    New UserConsumedProduct of `product` (user or catalog product, per 100g) with the
+    nutritional values scaled to the consumed amount.
+
+    Raises:
+        HTTPException 404: product is None (found neither in the user's nor the global products)
+    """
     # Product not found at all
     if not product:
         raise HTTPException(
@@ -45,7 +46,7 @@ def add_consumed_product(db: Session, request: PostUserConsumedProductRequest, u
     # Scale nutrients according to user-entered amount (base = per 100g)
     factor = request.amount / 100.0
 
-    new_entry = UserConsumedProduct(
+    return UserConsumedProduct(
         userUuid=userUuid,
         productName=request.productName.strip().title(),
         amount=request.amount,
@@ -63,24 +64,12 @@ def add_consumed_product(db: Session, request: PostUserConsumedProductRequest, u
         date=request.date if request.date else datetime.now()
     )
 
-    db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
-
-    return f"Product '{request.productName}' entry added successfully."
-
 
-def delete_consumed_product(db: Session, request: DeleteConsumedProductRequest):
-    """Delete a consumed product entry by its ID."""
-    product = db.query(UserConsumedProduct).filter(UserConsumedProduct.id == request.productId).first()
+def _check_found(product, request: DeleteConsumedProductRequest):
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"No consumed product found with ID {request.productId} for user.")
 
-    db.delete(product)
-    db.commit()
-    return {"message": "Product deleted successfully."}
-
 
 def _map_to_response(products) -> UserConsumedProductListResponse:
     """Map DB model objects to response schema objects."""
@@ -106,69 +95,84 @@ def _map_to_response(products) -> UserConsumedProductListResponse:
     ]
 
 
-def get_all_consumed_products(db: Session, userUuid: int) -> UserConsumedProductListResponse:
-    """Return all consumed products for a given user."""
-    products = db.query(UserConsumedProduct).filter(UserConsumedProduct.userUuid == userUuid).all()
+def _consumed_query(userUuid: int, start: datetime = None, end: datetime = None):
+    """The user's consumed products, optionally only those in [start, end]."""
+    conditions = [UserConsumedProduct.userUuid == userUuid]
+    if start is not None:
+        conditions.append(UserConsumedProduct.date >= start)
+    if end is not None:
+        conditions.append(UserConsumedProduct.date <= end)
+    return select(UserConsumedProduct).where(and_(*conditions))
+
+
+def _day_bounds(day) -> tuple[datetime, datetime]:
+    return datetime.combine(day, datetime.min.time()), datetime.combine(day, datetime.max.time())
+
+
+def _found_or_404(products, detail: str) -> UserConsumedProductListResponse:
     if not products:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No consumed products found.")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
     return _map_to_response(products)
 
 
-def get_consumed_today(db: Session, userUuid: int) -> UserConsumedProductListResponse:
+async def add_consumed_product_async(db: AsyncSession, request: PostUserConsumedProductRequest, userUuid: int):
+    """
+    Add a new consumed product entry for a user.
+
+    - Looks up the product by name (first in user’s products, then in the cached global catalog)
+    - Calculates nutritional values proportionally to the consumed amount
+    - Stores the record in `UserConsumedProduct` and adds it to the user's daily rollup
+      (same transaction)
+    """
+    # Try to find the product in user's custom list, then in the global products
+    product = (await db.scalars(_user_product_query(userUuid, request.productName))).first()
+    if not product:
+        product = _catalog_product(await get_product_catalog_async(), request.productName)
+
+    new_entry = _consumed_entry(request, userUuid, product)
+    db.add(new_entry)
+    await apply_to_rollup_async(db, new_entry)
+    await db.commit()
+
+    return f"Product '{request.productName}' entry added successfully."
+
+
+async def delete_consumed_product_async(db: AsyncSession, request: DeleteConsumedProductRequest):
+    """Delete a consumed product entry by its ID (and subtract it from the daily rollup)."""
+    product = await db.get(UserConsumedProduct, request.productId)
+    _check_found(product, request)
+
+    await apply_to_rollup_async(db, product, sign=-1)
+    await db.delete(product)
+    await db.commit()
+    return {"message": "Product deleted successfully."}
+
+
+async def get_all_consumed_products_async(db: AsyncSession, userUuid: int) -> UserConsumedProductListResponse:
+    """Return all consumed products for a given user."""
+    products = (await db.scalars(_consumed_query(userUuid))).all()
+    return _found_or_404(products, "No consumed products found.")
+
+
+async def get_consumed_today_async(db: AsyncSession, userUuid: int) -> UserConsumedProductListResponse:
     """Return all products consumed today."""
-    today = datetime.now().date()
-    products = (
-        db.query(UserConsumedProduct)
-        .filter(
-            and_(
-                UserConsumedProduct.userUuid == userUuid,
-                UserConsumedProduct.date >= datetime.combine(today, datetime.min.time()),
-                UserConsumedProduct.date <= datetime.combine(today, datetime.max.time())
-            )
-        ).all()
-    )
-    if not products:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No products consumed today.")
-    return _map_to_response(products)
+    products = (await db.scalars(_consumed_query(userUuid, *_day_bounds(datetime.now().date())))).all()
+    return _found_or_404(products, "No products consumed today.")
 
 
-def get_consumed_last_7_days(db: Session, userUuid: int):
+async def get_consumed_last_7_days_async(db: AsyncSession, userUuid: int):
     """Return all consumed products within the past 7 days."""
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    products = db.query(UserConsumedProduct).filter(
-        and_(UserConsumedProduct.userUuid == userUuid, UserConsumedProduct.date >= seven_days_ago)
-    ).all()
-    if not products:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                            detail="No products consumed in the last 7 days.")
-    return _map_to_response(products)
+    products = (await db.scalars(_consumed_query(userUuid, datetime.now() - timedelta(days=7)))).all()
+    return _found_or_404(products, "No products consumed in the last 7 days.")
 
 
-def get_consumed_last_30_days(db: Session, userUuid: int):
+async def get_consumed_last_30_days_async(db: AsyncSession, userUuid: int):
     """Return all consumed products within the past 30 days."""
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    products = db.query(UserConsumedProduct).filter(
-        and_(UserConsumedProduct.userUuid == userUuid, UserConsumedProduct.date >= thirty_days_ago)
-    ).all()
-    if not products:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                            detail="No products consumed in the last 30 days.")
-    return _map_to_response(products)
+    products = (await db.scalars(_consumed_query(userUuid, datetime.now() - timedelta(days=30)))).all()
+    return _found_or_404(products, "No products consumed in the last 30 days.")
 
 
-def get_consumed_by_date(db: Session, request: GetConsumedProductByDateRequest, userUuid: int):
+async def get_consumed_by_date_async(db: AsyncSession, request: GetConsumedProductByDateRequest, userUuid: int):
     """Return all products consumed on a specific date."""
-    start_of_day = datetime.combine(request.date, datetime.min.time())
-    end_of_day = datetime.combine(request.date, datetime.max.time())
-    products = db.query(UserConsumedProduct).filter(
-        and_(
-            UserConsumedProduct.userUuid == userUuid,
-            UserConsumedProduct.date >= start_of_day,
-            UserConsumedProduct.date <= end_of_day
-        )
-    ).all()
-
-    if not products:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                            detail=f"No products consumed on {request.date}.")
-    return _map_to_response(products)
\ No newline at end of file
+    products = (await db.scalars(_consumed_query(userUuid, *_day_bounds(request.date)))).all()
+    return _found_or_404(products, f"No products consumed on {request.date}.")
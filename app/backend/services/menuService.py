@@ -1,20 +1,45 @@
-from pulp import LpProblem, LpVariable, LpMinimize, lpSum, LpStatus
+import numpy as np
+import asyncio
+import copy
+import json
+import os
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from datetime import datetime
-from app.backend.models.productsProtSep import ProductProtSep
 from app.backend.models.userMenus import UserMenu
 from app.backend.models.userMenuRecipes import UserMenuRecipes
 from app.backend.models.recipes import Recipe
 from app.backend.schemas.requests.postDietPlanRequest import PostDietPlanRequest
 from app.backend.schemas.requests.deleteUserMenuRequest import DeleteUserMenuRequest
 from app.backend.schemas.requests.dietRequest import DietRequest
+from app.backend.schemas.requests.dietBatchRequest import DietBatchRequest
 from app.backend.schemas.requests.getMenuRequest import GetMenuRequest
+from app.backend.schemas.requests.menuFrontierRequest import MenuFrontierRequest
 from app.backend.schemas.responses.dietPlanResponse import DietPlanListResponse, DietPlanResponse
-from app.backend.schemas.responses.generateMenuResponse import GenerateMenuResponse, ProductItem
+from app.backend.schemas.responses.generateMenuResponse import GenerateMenuResponse, ProductItem, DayMenu, PresolveInfo, \
+    MenuConflict, MenuDebugInfo
 from app.backend.schemas.responses.userMenuNamesResponse import UserMenuNamesResponse
-from app.backend.services.userProductService import get_user_products
+from app.backend.schemas.responses.menuJobResponse import MenuJobResponse
+from app.backend.schemas.responses.menuFrontierResponse import MenuFrontierResponse, MenuFrontierPoint
+from app.backend.dependencies.productCatalog import ProductCatalog, get_product_catalog, normalize_name, CATALOG_COLUMNS
+from app.backend.dependencies.menuModel import MenuProblem, solve_menu_problem, NUTRIENT_FIELDS, MAX_GRAMS, MIN_GRAMS, MIN_PRODUCTS
+from app.backend.dependencies.menuSolver import SolverSettings, SolveResult
+from app.backend.dependencies.menuWarmStart import get_warm_start_plan, remember_plan
+from app.backend.dependencies.menuJobs import get_menu_job_queue
+from app.backend.dependencies.menuResultCache import get_menu_result_cache, menu_request_key
+from app.backend.dependencies.menuPresolve import PRESOLVE_ENABLED, presolve_menu_products
+from app.backend.dependencies.menuMetrics import MenuTimer, record_menu_cache_hit, record_menu_solve
+from app.backend.dependencies.menuSnapshots import snapshot_wanted, save_menu_snapshot
+from app.backend.dependencies.menuFrontier import FrontierPoint, FrontierSweep, solve_frontier_point, \
+    solve_frontier_sweep, metric_sense, metric_value, pareto_filter
+
+# How often the job event stream checks for a status change (seconds)
+JOB_EVENTS_POLL_SECONDS = 0.5
+# Time limit of the LP solves behind mode="preview" (seconds)
+PREVIEW_TIME_LIMIT = float(os.getenv("MENU_PREVIEW_TIME_LIMIT", "2"))
 
 
 def normalize(s: str):
@@ -22,68 +47,35 @@ def normalize(s: str):
     Normalize a string by stripping whitespace and converting to lowercase.
     Used for case-insensitive product name comparison.
     """
-    return s.strip().lower()
+    return normalize_name(s)
 
 
-def make_product_key(p):
+def combine_products(db: Session, userUuid: int, timer: MenuTimer = None):
     """
-    Create a unique key for a product based on its nutritional and cost properties.
-
-    Args:
-        p: Product object with nutritional attributes
-
-    Returns:
-        Tuple containing all relevant product attributes for comparison
-    """
-    return (
-        p.id,
-        round(p.kcal or 0, 2),
-        round(p.fat or 0, 2),
-        round(p.satFat or 0, 2),
-        round(p.carbs or 0, 2),
-        round(p.sugars or 0, 2),
-        round(p.protein or 0, 2),
-        round(p.salt or 0, 2),
-        round(p.price1kg or 0, 2),
-        getattr(p, "vegan", False),
-        getattr(p, "vegetarian", False),
-        getattr(p, "dairyFree", False),
-    )
-
-
-def combine_products(db: Session, userUuid: int):
-    """
-    Combine general products from the database with user-specific products.
-    Deduplicates products based on their nutritional profile and properties.
+    Combine general products from the cached catalog with user-specific products.
+    Deduplicates products based on their name, nutritional profile and properties.
 
     Args:
         db: Database session
         userUuid: User's unique identifier
+        timer: Optional MenuTimer booking the "fetch" and "combine" phases
 
     Returns:
-        List of unique products available for diet planning
+        Tuple of (combined ProductCatalog, index array of unique products in it)
     """
-    # Fetch all general products from the database
-    all_products = db.query(ProductProtSep).all()
-
-    # Fetch products specific to this user
-    user_products = get_user_products(db, userUuid)
+    # General products come from the cached catalog (no per-request table scan),
+    # products specific to this user are appended after them
+    general = get_product_catalog(db)
+    own = ProductCatalog.load_user_products(db, userUuid)
+    if timer is not None:
+        timer.lap("fetch")
+    catalog = general.concat(own)
 
-    # Prefix user product IDs to distinguish them from general products
-    for p in user_products:
-        p.id = f"user_{p.id}"
-
-    # Combine and deduplicate by full product data (not just name)
-    # This ensures products with identical nutritional profiles aren't duplicated
-    combined_dict = {}
-    for p in all_products + user_products:
-        key = make_product_key(p)
-        if key not in combined_dict:
-            combined_dict[key] = p
-
-    # Return deduplicated list of products
-    products = list(combined_dict.values())
-    return products
+    # Deduplicate by full product data (not just name) without copying any rows
+    indices = catalog.unique_indices()
+    if timer is not None:
+        timer.lap("combine")
+    return catalog, indices
 
 
 def generate_diet_menu(db: Session, request: DietRequest, userUuid: int):
@@ -91,13 +83,16 @@ def generate_diet_menu(db: Session, request: DietRequest, userUuid: int):
     Generate an optimized diet menu using linear programming to minimize cost
     while meeting nutritional requirements and dietary preferences.
 
-    Uses PuLP library to solve a linear optimization problem that:
+    Builds a mixed-integer model from a NumPy nutrient matrix (see dependencies/menuModel.py)
+    and solves it with the configured backend (see dependencies/menuSolver.py). The model:
     - Minimizes total cost
     - Meets calorie, protein, fat, carb, sugar, and salt targets (with tolerance ranges)
     - Respects protein source distribution (animal/dairy/plant)
     - Ensures dietary restrictions (vegan, vegetarian, dairy-free)
     - Applies custom product restrictions (min/max weights, exclusions)
     - Requires minimum 15 different products with minimum 50g each
+    - With request.days > 1, plans all days in one model (per-day targets, optional
+      max repeats of a product and whole-period budget)
 
     Args:
         db: Database session
@@ -108,6 +103,41 @@ def generate_diet_menu(db: Session, request: DietRequest, userUuid: int):
         GenerateMenuResponse with optimized product list and nutritional totals,
         or error response if constraints cannot be satisfied
     """
+    problem = prepare_diet_menu(db, request, userUuid)
+    if not isinstance(problem, MenuProblem):
+        return problem  # answered without solving (validation error)
+
+    solution = solve_menu_problem(problem)
+    return build_diet_menu_response(problem, solution, userUuid)
+
+
+def prepare_diet_menu(db: Session, request: DietRequest, userUuid: int, products=None, use_cache: bool = True):
+    """
+    Validate a menu request and collect the model inputs (everything before the solve).
+
+    Args:
+        db: Database session
+        request: DietRequest object with nutritional targets and preferences
+        userUuid: User's unique identifier
+        products: Optional result of combine_products() to reuse (batches load it once)
+        use_cache: Answer from the menu result cache when possible
+
+    Returns:
+        MenuProblem ready for solve_menu_problem() (with `catalog` and `indices` attached),
+        or the response to return without solving: an error for an invalid request, a
+        cached menu, or the preview for mode="preview"
+
+    Raises:
+        HTTPException: If the requested solver is unknown
+    """
+    timer = MenuTimer()
+
+    # Validate solver options before doing any work (server defaults apply when omitted)
+    try:
+        settings = SolverSettings.from_request(request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     # Extract nutritional targets from request
     kcalTarget = request.kcal
     proteinTarget = request.protein
@@ -127,60 +157,49 @@ def generate_diet_menu(db: Session, request: DietRequest, userUuid: int):
     if vegan and not (dairyFree or vegetarian):
         return {"error": "Vegan diets are always dairy-free — please set dairyFree=True."}
 
-    # Get combined list of all available products
-    products = combine_products(db, userUuid)
+    # Get combined catalog and the indices of all available products
+    catalog, indices = products if products is not None else combine_products(db, userUuid, timer)
 
-    if not products:
+    if not len(indices):
         return {"error": "No products found in database."}
 
-    # Filter products based on dietary preferences
-    if vegan:
-        # Vegan users can only have vegan products
-        products = [p for p in products if p.vegan]
-    elif vegetarian:
-        # Vegetarians can have vegetarian or vegan products
-        products = [p for p in products if p.vegetarian or p.vegan]
-
-    if dairyFree:
-        # Filter out products containing dairy
-        products = [p for p in products if p.dairyFree]
-
-    if not products:
+    # Identical requests against the same products are answered from the result cache
+    # (previews never are: the cache holds full menus only)
+    cache_key = menu_request_key(request, settings, catalog.digest) if request.mode == "full" else None
+    cached = get_menu_result_cache().get(cache_key) if use_cache and cache_key is not None else None
+    if cached is not None:
+        remember_plan(userUuid, cached["days"][0]["plan"] if cached.get("days") else cached["plan"])
+        response = GenerateMenuResponse(**cached)
+        timer.lap("cache")
+        stats = record_menu_cache_hit(settings.backend, timer.phases)
+        if request.debug:
+            response.debug = MenuDebugInfo(**stats)
+        return response
+
+    # Filter products based on dietary preferences (vegan, vegetarian, dairy-free)
+    indices = indices[catalog.diet_mask(vegan, vegetarian, dairyFree)[indices]]
+
+    if not len(indices):
         return {"error": "No products match dietary preferences."}
 
+    # Positions (in indices) of each restriction's products, found through the catalog's name index
+    restricted = [catalog.lookup(r.get("product", ""), within=indices) for r in restrictions]
+
     # Validate that restricted products exist in the filtered product list
     # This prevents optimization failures due to invalid restrictions
-    if restrictions:
-        # Create lookup set of normalized product names for validation
-        valid_product_names = {normalize(str(p.productName)) for p in products}
-        invalidProducts = []
-
-        # Check each restriction against available products
-        for r in restrictions:
-            r_product = normalize(r.get("product", ""))
-            if r_product and r_product not in valid_product_names:
-                invalidProducts.append(r.get("product", ""))
-
-        # Return error if any restricted products don't exist
-        if invalidProducts:
-            return GenerateMenuResponse(
-                status="InvalidProducts",
-                invalidProducts=invalidProducts,
-                message=f"The following products were not found in the database: {', '.join(invalidProducts)}"
-            )
-
-    # Create linear programming problem to minimize cost
-    problem = LpProblem("Balanced_Diet", LpMinimize)
-
-    # Decision variables: grams of each product to include (continuous, ≥ 0)
-    x = {p.id: LpVariable(f"x_{p.id}", lowBound=0) for p in products}
-
-    # Binary indicator variables: 1 if product is used, 0 otherwise
-    y = {p.id: LpVariable(f"y_{p.id}", cat="Binary") for p in products}
+    invalidProducts = [
+        r.get("product", "") for r, found in zip(restrictions, restricted)
+        if normalize(r.get("product", "")) and not len(found)
+    ]
 
-    # Objective function: minimize total cost of all products
-    # cost = sum(grams * price_per_100g / 100) for all products
-    problem += lpSum([x[p.id] * p.price100g / 100 for p in products])
+    # Return error if any restricted products don't exist, with similar names to pick from
+    if invalidProducts:
+        return GenerateMenuResponse(
+            status="InvalidProducts",
+            invalidProducts=invalidProducts,
+            suggestions={name: catalog.suggest_names(name, within=indices) for name in invalidProducts},
+            message=f"The following products were not found in the database: {', '.join(invalidProducts)}"
+        )
 
     # Define protein source distribution targets
     # For balanced nutrition, aim for 40% animal, 30% dairy, 30% plant protein
@@ -203,122 +222,155 @@ def generate_diet_menu(db: Session, request: DietRequest, userUuid: int):
         plant_target = 0.3 * proteinTarget
 
     # === NUTRITIONAL CONSTRAINTS ===
-    # Each constraint has min/max bounds with tolerance ranges
-
-    # Calorie constraints (90-130% of target)
-    problem += lpSum([x[p.id] * p.kcal / 100 for p in products]) >= kcalTarget * 0.9, "caloriesMin"
-    problem += lpSum([x[p.id] * p.kcal / 100 for p in products]) <= kcalTarget * 1.3, "caloriesMax"
-
-    # Total protein constraints (90-160% of target)
-    problem += lpSum([x[p.id] * p.protein / 100 for p in products]) >= proteinTarget * 0.9
-    problem += lpSum([x[p.id] * p.protein / 100 for p in products]) <= proteinTarget * 1.6
+    # Each nutrient is one ranged row: lower <= sum(grams * value / 100) <= upper
+    # (name, product attribute, lower bound, upper bound)
+    rows = [
+        ("calories", "kcal", kcalTarget * 0.9, kcalTarget * 1.3),         # 90-130% of target
+        ("protein", "protein", proteinTarget * 0.9, proteinTarget * 1.6),  # 90-160% of target
+    ]
 
-    # Protein source distribution constraints (conditional based on diet type)
+    # Protein source distribution constraints (conditional based on diet type, 70-110% of target)
     if animal_target > 0:
-        # Omnivore: enforce animal protein requirements (70-110% of target)
-        problem += lpSum([x[p.id] * (p.animalProt or 0) / 100 for p in products]) >= animal_target * 0.7
-        problem += lpSum([x[p.id] * (p.animalProt or 0) / 100 for p in products]) <= animal_target * 1.1
-
+        rows.append(("animalProtein", "animalProt", animal_target * 0.7, animal_target * 1.1))
     if dairy_target > 0:
-        # Dairy allowed: enforce dairy protein requirements (70-110% of target)
-        problem += lpSum([x[p.id] * (p.dairyProt or 0) / 100 for p in products]) >= dairy_target * 0.7
-        problem += lpSum([x[p.id] * (p.dairyProt or 0) / 100 for p in products]) <= dairy_target * 1.1
-
-    # Plant protein constraints apply to all diets (70-110% of target)
-    problem += lpSum([x[p.id] * (p.plantProt or 0) / 100 for p in products]) >= plant_target * 0.7
-    problem += lpSum([x[p.id] * (p.plantProt or 0) / 100 for p in products]) <= plant_target * 1.1
-
-    # Fat constraints (60-110% of target)
-    problem += lpSum([x[p.id] * p.fat / 100 for p in products]) >= fatTarget * 0.6, "fatMin"
-    problem += lpSum([x[p.id] * p.fat / 100 for p in products]) <= fatTarget * 1.1, "fatMax"
-
-    # Carbohydrate constraints (60-110% of target)
-    problem += lpSum([x[p.id] * p.carbs / 100 for p in products]) >= carbsTarget * 0.6, "carbsMin"
-    problem += lpSum([x[p.id] * p.carbs / 100 for p in products]) <= carbsTarget * 1.1, "carbsMax"
-
-    # Sugar constraints (60-110% of target)
-    problem += lpSum([x[p.id] * p.sugars / 100 for p in products]) >= sugarTarget * 0.6, "sugarsMin"
-    problem += lpSum([x[p.id] * p.sugars / 100 for p in products]) <= sugarTarget * 1.1, "sugarsMax"
-
-    # Saturated fat constraints (60-110% of target)
-    problem += lpSum([x[p.id] * p.satFat / 100 for p in products]) >= satFatTarget * 0.6, "saturatedFatMin"
-    problem += lpSum([x[p.id] * p.satFat / 100 for p in products]) <= satFatTarget * 1.1, "saturatedFatMax"
-
-    # Salt constraints (60-110% of target)
-    problem += lpSum([x[p.id] * p.salt / 100 for p in products]) >= saltTarget * 0.6, "saltMin"
-    problem += lpSum([x[p.id] * p.salt / 100 for p in products]) <= saltTarget * 1.1, "saltMax"
-
-    # === BIG-M CONSTRAINTS ===
-    # Link continuous variable x (grams) with binary variable y (used/not used)
-    M = 400  # Maximum grams per product (upper bound)
-    m = 50  # Minimum grams if product is used (ensures meaningful portions)
-
-    for p in products:
-        # If product is not used (y=0), then x must be 0
-        # If product is used (y=1), then x can be up to M grams
-        problem += x[p.id] <= M * y[p.id], f"MaxLink_{p.id}"
-
-        # If product is used (y=1), then x must be at least m grams
-        # This ensures we don't include tiny amounts of products
-        problem += x[p.id] >= m * y[p.id], f"MinLink_{p.id}"
-
-    # Require at least 15 different products for diet variety
-    problem += lpSum([y[p.id] for p in products]) >= 10, "Min_15_Products"
-
-    # Apply user-defined custom restrictions (already validated above)
-    if restrictions:
-        for r in restrictions:
-            r_type = r.get("type")
-            r_product = normalize(r.get("product", ""))
-            r_value = r.get("value", None)
-
-            # Find matching product and apply restriction
-            for p in products:
-                name = normalize(p.productName)
-                if name == r_product:
-                    if r_type == "max_weight" and r_value is not None:
-                        # Limit maximum grams for this product
-                        problem += x[p.id] <= r_value, f"Limit_{p.id}"
-                    elif r_type == "min_weight" and r_value is not None:
-                        # Require minimum grams for this product
-                        problem += x[p.id] >= r_value, f"Min_{p.id}"
-                    elif r_type == "exclude":
-                        # Completely exclude this product from the diet
-                        problem += x[p.id] == 0, f"Exclude_{p.id}"
-                        problem += y[p.id] == 0, f"Exclude_y_{p.id}"
-
-    # Solve the optimization problem
-    problem.solve()
-
-    # Check if an optimal solution was found
-    if LpStatus[problem.status] != "Optimal":
-        return GenerateMenuResponse(
-            status=LpStatus[problem.status],
-            message="No optimal solution found.",
-            plan=[]
+        rows.append(("dairyProtein", "dairyProt", dairy_target * 0.7, dairy_target * 1.1))
+    # Plant protein constraints apply to all diets
+    rows.append(("plantProtein", "plantProt", plant_target * 0.7, plant_target * 1.1))
+
+    # Remaining macros (60-110% of target)
+    rows += [
+        ("fat", "fat", fatTarget * 0.6, fatTarget * 1.1),
+        ("carbs", "carbs", carbsTarget * 0.6, carbsTarget * 1.1),
+        ("sugars", "sugars", sugarTarget * 0.6, sugarTarget * 1.1),
+        ("saturatedFat", "satFat", satFatTarget * 0.6, satFatTarget * 1.1),
+        ("salt", "salt", saltTarget * 0.6, saltTarget * 1.1),
+    ]
+
+    # Pick the rows used by this request from the precompiled nutrient matrix
+    row_index = [NUTRIENT_FIELDS.index(field) for _, field, _, _ in rows]
+    nutrients = catalog.nutrients[row_index][:, indices]
+
+    # Per-product bounds on grams (x) and on the "used" indicator (y)
+    grams_lower = np.zeros(len(indices))
+    grams_upper = np.full(len(indices), float(MAX_GRAMS))
+    used_upper = np.ones(len(indices))
+
+    # Apply user-defined custom restrictions (already validated above) as variable bounds
+    protected = np.zeros(len(indices), dtype=bool)
+    for r, found in zip(restrictions, restricted):
+        r_type = r.get("type")
+        r_value = r.get("value", None)
+        protected[found] = True
+
+        # Apply the restriction to all matching products
+        if r_type == "max_weight" and r_value is not None:
+            # Limit maximum grams for this product
+            grams_upper[found] = np.minimum(grams_upper[found], r_value)
+        elif r_type == "min_weight" and r_value is not None:
+            # Require minimum grams for this product
+            grams_lower[found] = np.maximum(grams_lower[found], r_value)
+        elif r_type == "exclude":
+            # Completely exclude this product from the diet
+            grams_upper[found] = 0
+            used_upper[found] = 0
+
+    # Drop products that cannot change the optimal menu (restricted products are always kept)
+    price100g = catalog.columns["price100g"][indices]
+    presolve = None
+    timer.lap("prepare")
+    if PRESOLVE_ENABLED:
+        keep, presolve = presolve_menu_products(
+            nutrients, price100g, [upper for _, _, _, upper in rows], grams_lower, grams_upper, used_upper,
+            protected=protected,
+            days=request.days, max_repeats=request.maxRepeats,
         )
+        indices, nutrients, price100g = indices[keep], nutrients[:, keep], price100g[keep]
+        grams_lower, grams_upper, used_upper = grams_lower[keep], grams_upper[keep], used_upper[keep]
+        timer.lap("presolve")
+
+    # Optionally seed the solver with the user's previous plan (session cache or last saved menu);
+    # previews estimate the cost of keeping that plan's products
+    hint_grams = None
+    if request.warmStart or request.mode == "preview":
+        previous = get_warm_start_plan(db, userUuid)
+        if previous:
+            hint_grams = np.zeros(len(indices))
+            for name, grams in previous.items():
+                hint_grams[catalog.lookup(name, within=indices)] = grams
+
+    # Minimize total cost: sum(grams * price_per_100g / 100), with Big-M links between
+    # grams and the binary "used" indicator and the minimum product count
+    problem = MenuProblem(
+        nutrients,
+        price100g,
+        row_names=[name for name, _, _, _ in rows],
+        row_lower=[lower for _, _, lower, _ in rows],
+        row_upper=[upper for _, _, _, upper in rows],
+        grams_lower=grams_lower,
+        grams_upper=grams_upper,
+        used_upper=used_upper,
+        days=request.days,
+        max_repeats=request.maxRepeats,
+        budget=request.budget,
+        settings=settings,
+        hint_grams=hint_grams,
+    )
+    problem.catalog = catalog
+    problem.indices = indices
+    problem.cache_key = cache_key
+    problem.presolve = presolve
+    targets = {
+        "calories": kcalTarget, "protein": proteinTarget, "animalProtein": animal_target,
+        "dairyProtein": dairy_target, "plantProtein": plant_target, "fat": fatTarget,
+        "carbs": carbsTarget, "sugars": sugarTarget, "saturatedFat": satFatTarget, "salt": saltTarget,
+    }
+    problem.row_target = [targets[name] for name, _, _, _ in rows]
+    problem.debug = request.debug
+    problem.request = request
+    timer.lap("prepare")
+    problem.timer = timer
+    if request.mode == "preview":
+        return preview_diet_menu(problem)
+    return problem
+
+
+def _menu_items(catalog: ProductCatalog, indices: np.ndarray, grams_solution: np.ndarray):
+    """
+    Build the product list and nutrient totals for one vector of grams.
 
+    Args:
+        catalog: Combined product catalog
+        indices: Catalog index of every model column
+        grams_solution: Grams per model column
+
+    Returns:
+        Tuple of (list of ProductItem, dict of GenerateMenuResponse total fields)
+    """
     # Extract solution: build list of products with non-zero quantities
+    chosen = np.flatnonzero(grams_solution > 1e-6)
+    grams = grams_solution[chosen]
+    chosen = indices[chosen]
+
+    # Calculate nutritional values based on selected grams (one vector per column)
+    amount = {name: catalog.columns[name][chosen] * grams / 100 for name in CATALOG_COLUMNS}
+
     result = []
-    for p in products:
-        grams = x[p.id].varValue
-        if grams and grams > 0:
-            # Calculate nutritional values based on selected grams
-            result.append(ProductItem(
-                productName=str(p.productName),
-                grams=round(grams, 1),
-                kcal=round(p.kcal * grams / 100, 1),
-                cost=round(p.price100g * grams / 100, 2),
-                fat=round(p.fat * grams / 100, 1),
-                satFat=round(p.satFat * grams / 100, 1),
-                carbs=round(p.carbs * grams / 100, 1),
-                protein=round(p.protein * grams / 100, 1),
-                dairyProtein=round((p.dairyProt or 0) * grams / 100, 1),
-                animalProtein=round((p.animalProt or 0) * grams / 100, 1),
-                plantProtein=round((p.plantProt or 0) * grams / 100, 1),
-                sugars=round(p.sugars * grams / 100, 1),
-                salt=round(p.salt * grams / 100, 1)
-            ))
+    for j, i in enumerate(chosen):
+        result.append(ProductItem(
+            productName=catalog.names[i],
+            grams=round(float(grams[j]), 1),
+            kcal=round(float(amount["kcal"][j]), 1),
+            cost=round(float(amount["price100g"][j]), 2),
+            fat=round(float(amount["fat"][j]), 1),
+            satFat=round(float(amount["satFat"][j]), 1),
+            carbs=round(float(amount["carbs"][j]), 1),
+            protein=round(float(amount["protein"][j]), 1),
+            dairyProtein=round(float(amount["dairyProt"][j]), 1),
+            animalProtein=round(float(amount["animalProt"][j]), 1),
+            plantProtein=round(float(amount["plantProt"][j]), 1),
+            sugars=round(float(amount["sugars"][j]), 1),
+            salt=round(float(amount["salt"][j]), 1)
+        ))
 
     # Calculate total nutritional values across all selected products
     totals = {
@@ -334,9 +386,376 @@ def generate_diet_menu(db: Session, request: DietRequest, userUuid: int):
         "totalSugar": round(sum(r.sugars for r in result), 1),
         "totalSalt": round(sum(r.salt for r in result), 1)
     }
+    return result, totals
+
+
+def _menu_conflicts(problem: MenuProblem, diagnosis) -> list[MenuConflict]:
+    """Name the products of a MenuModel.diagnose() result and round its numbers for the response."""
+    return [
+        MenuConflict(
+            constraint=c["constraint"],
+            product=problem.catalog.names[problem.indices[c["index"]]] if c["index"] is not None else None,
+            bound=round(c["bound"], 2),
+            relaxBy=round(c["relaxBy"], 2),
+            suggested=round(c["suggested"], 2),
+        )
+        for c in diagnosis or []
+    ]
+
+
+def _infeasible_message(conflicts: list[MenuConflict]) -> str:
+    changes = [
+        f"{c.constraint}{f' ({c.product})' if c.product else ''} {c.bound:g} -> {c.suggested:g}"
+        for c in conflicts
+    ]
+    return "No menu meets all targets. The smallest change that makes one possible: " + ", ".join(changes) + "."
+
+
+def _solution_menu(problem: MenuProblem, solution: SolveResult):
+    """
+    Plan, totals and per-day menus of a solve result that has a solution.
+
+    Returns:
+        Tuple of (list of ProductItem, dict of total fields, list of DayMenu or None)
+    """
+    day_grams = problem.day_grams(solution)
+
+    # One day: the plan itself; several days: the whole-period basket plus one plan per day
+    result, totals = _menu_items(problem.catalog, problem.indices, day_grams.sum(axis=0))
+    days = None
+    if problem.days > 1:
+        days = []
+        for d, grams_row in enumerate(day_grams):
+            day_plan, day_totals = _menu_items(problem.catalog, problem.indices, grams_row)
+            days.append(DayMenu(day=d + 1, plan=day_plan, **day_totals))
+    return result, totals, days
+
+
+def build_diet_menu_response(problem: MenuProblem, solution: SolveResult, userUuid: int) -> GenerateMenuResponse:
+    """
+    Turn a solve result into the menu response (product list with nutrient and cost totals).
+
+    The request's phase timings and the model statistics are exported as Prometheus
+    histograms (see dependencies/menuMetrics.py), and returned in the debug field when the
+    request asked for them. Solves slower than MENU_SNAPSHOT_THRESHOLD are saved as
+    snapshots when MENU_SNAPSHOT_DIR is set (see dependencies/menuSnapshots.py).
+
+    Args:
+        problem: The MenuProblem returned by prepare_diet_menu()
+        solution: Result of solve_menu_problem(problem)
+        userUuid: User's unique identifier
+
+    Returns:
+        GenerateMenuResponse with the chosen products, or the solver status if no menu was found
+    """
+    # Time since prepare_diet_menu() not spent in the solve job itself was spent waiting
+    # for a worker (and sending the problem / result between processes)
+    timer = problem.timer or MenuTimer()
+    timer.phases["queue"] = max(timer.lap("queue") - sum(solution.timings.values()), 0.0)
+    timer.phases.update(solution.timings)
+
+    response = _diet_menu_response(problem, solution, userUuid)
+    timer.lap("response")
+
+    stats = record_menu_solve(problem, solution, timer.phases)
+    if problem.debug:
+        response.debug = MenuDebugInfo(**stats)
+
+    # Keep slow solves (model, request and catalog version) for offline replay
+    if snapshot_wanted(solution):
+        try:
+            path = save_menu_snapshot(problem, solution, userUuid)
+            print(f"Slow menu solve ({solution.wall_time:.1f}s) saved to {path}")
+        except OSError as e:
+            print(f"Could not save menu snapshot: {e}")
+    return response
+
+
+def _diet_menu_response(problem: MenuProblem, solution: SolveResult, userUuid: int) -> GenerateMenuResponse:
+    """The response of build_diet_menu_response(); Optimal menus are added to the result cache."""
+    presolve = PresolveInfo(**problem.presolve._asdict()) if problem.presolve is not None else None
+
+    # "Feasible" means a limit (time / gap) was hit: the best menu found so far is returned
+    if solution.status not in ("Optimal", "Feasible"):
+        # Infeasible requests come with the bounds to relax (diagnosed in the worker)
+        conflicts = _menu_conflicts(problem, solution.diagnosis)
+        return GenerateMenuResponse(
+            status=solution.status,
+            message=_infeasible_message(conflicts) if conflicts else "No optimal solution found.",
+            plan=[],
+            conflicts=conflicts or None,
+            presolve=presolve
+        )
+    result, totals, days = _solution_menu(problem, solution)
+
+    # Keep this menu as the warm start for the user's next (slightly edited) request
+    remember_plan(userUuid, days[0].plan if days else result)
 
     # Return successful response with optimized menu
-    return GenerateMenuResponse(status="Optimal", plan=result, **totals)
+    if solution.status == "Feasible":
+        return GenerateMenuResponse(
+            status="Feasible",
+            plan=result,
+            days=days,
+            message="Solver limit reached; returning the best menu found.",
+            presolve=presolve,
+            **totals
+        )
+    response = GenerateMenuResponse(status="Optimal", plan=result, days=days, presolve=presolve, **totals)
+    # Only proven optimal menus are cached (limit-bound results may improve on a retry)
+    if problem.cache_key is not None:
+        get_menu_result_cache().put(problem.cache_key, response.model_dump())
+    return response
+
+
+def preview_diet_menu(problem: MenuProblem) -> GenerateMenuResponse:
+    """
+    Answer a mode="preview" request from linear programs only (no binaries, no branching).
+
+    - The LP relaxation of the menu model gives a lower bound on the menu cost (costBound)
+      and proves infeasibility when even the relaxation has no solution.
+    - If the user has a previous menu, the products of that menu are kept with at least
+      MIN_GRAMS each and only their grams are optimized. This fixed-support LP is a valid
+      menu (an upper estimate of the cost), returned as plan and totals.
+
+    The full model is only solved once the user submits the request in mode="full".
+
+    Args:
+        problem: MenuProblem from prepare_diet_menu() (hint_grams holds the previous plan)
+
+    Returns:
+        GenerateMenuResponse with status "Preview" (or the relaxation's status if it has no solution)
+    """
+    presolve = PresolveInfo(**problem.presolve._asdict()) if problem.presolve is not None else None
+    settings = SolverSettings(time_limit=PREVIEW_TIME_LIMIT)
+
+    # Days coupled by max_repeats are bounded by days x the one-day relaxation: weaker than
+    # relaxing the coupled model, but that LP is D times larger and takes seconds
+    uncoupled = copy.copy(problem)
+    uncoupled.max_repeats = None
+    relaxed_model = uncoupled.build(relax=True)
+    relaxed = relaxed_model.solve(settings)
+    if relaxed.status != "Optimal":
+        # Even the relaxation is infeasible: diagnosing it is just as fast
+        conflicts = _menu_conflicts(problem, relaxed_model.diagnose(settings)) if relaxed.status == "Infeasible" else []
+        return GenerateMenuResponse(
+            status=relaxed.status,
+            message=_infeasible_message(conflicts) if conflicts else "No estimate found.",
+            plan=[],
+            conflicts=conflicts or None,
+            presolve=presolve
+        )
+    cost_bound = round(float(relaxed.objective), 2)
+
+    # Fixed support: the previous menu's products plus any required by min_weight restrictions
+    # (with coupled days a product may not be used every day, so there is no fixed support)
+    support = np.zeros(problem.n, dtype=bool)
+    if problem.hint_grams is not None and not (problem.max_repeats is not None and problem.max_repeats < problem.days):
+        support = ((problem.hint_grams > 0) | (problem.grams_lower > 0)) & (problem.used_upper > 0)
+        support &= problem.grams_upper >= MIN_GRAMS
+
+    if support.sum() >= MIN_PRODUCTS:
+        keep = np.flatnonzero(support)
+        fixed = MenuProblem(
+            problem.nutrients[:, keep],
+            problem.price100g[keep],
+            row_names=problem.row_names,
+            row_lower=problem.row_lower,
+            row_upper=problem.row_upper,
+            grams_lower=np.maximum(problem.grams_lower[keep], MIN_GRAMS),
+            grams_upper=problem.grams_upper[keep],
+            used_upper=problem.used_upper[keep],
+            days=problem.days,
+            budget=problem.budget,
+        )
+        estimate = fixed.build(relax=True).solve(settings)
+        if estimate.has_solution:
+            result, totals = _menu_items(problem.catalog, problem.indices[keep], fixed.day_grams(estimate).sum(axis=0))
+            return GenerateMenuResponse(
+                status="Preview",
+                plan=result,
+                costBound=cost_bound,
+                message="Estimate using the products of your previous menu; generate the menu for the optimal plan.",
+                presolve=presolve,
+                **totals
+            )
+
+    return GenerateMenuResponse(
+        status="Preview",
+        plan=[],
+        costBound=cost_bound,
+        message="Targets look feasible; generate the menu for the optimal plan.",
+        presolve=presolve
+    )
+
+
+def _menu_response_dict(response) -> dict:
+    """JSON-ready form of a menu response (GenerateMenuResponse or error dict)."""
+    return response.model_dump() if isinstance(response, GenerateMenuResponse) else response
+
+
+def menu_job_response(job) -> MenuJobResponse:
+    """Current state of a menu job as returned to the client."""
+    return MenuJobResponse(jobId=job.id, status=job.status, result=job.result, error=job.error)
+
+
+def submit_diet_menu_job(db: Session, request: DietRequest, userUuid: int) -> MenuJobResponse:
+    """
+    Queue a menu generation and return its job ID immediately.
+
+    The request is validated and the model inputs are collected here (fast, needs the DB);
+    only the solve runs in a worker process.
+
+    Args:
+        db: Database session
+        request: DietRequest object with nutritional targets and preferences
+        userUuid: User's unique identifier
+
+    Returns:
+        MenuJobResponse with the job ID (already "done" if the request was answered without solving)
+
+    Raises:
+        HTTPException: 429/503 if the user's or the global job limit is reached
+    """
+    queue = get_menu_job_queue()
+    problem = prepare_diet_menu(db, request, userUuid)
+    if not isinstance(problem, MenuProblem):
+        return menu_job_response(queue.add_finished(userUuid, _menu_response_dict(problem)))
+
+    job = queue.submit(
+        userUuid,
+        solve_menu_problem,
+        problem,
+        on_result=lambda solution: _menu_response_dict(build_diet_menu_response(problem, solution, userUuid)),
+    )
+    return menu_job_response(job)
+
+
+async def generate_diet_menu_in_worker(db: Session, request: DietRequest, userUuid: int):
+    """
+    Same as generate_diet_menu(), but the solve runs in the job queue's worker processes and
+    is awaited, so the web server's threads stay free while the solver works.
+
+    Raises:
+        HTTPException: 429/503 if the job limits are reached, 500 if the solve failed
+    """
+    # DB reads and validation are short blocking calls
+    problem = await run_in_threadpool(prepare_diet_menu, db, request, userUuid)
+    if not isinstance(problem, MenuProblem):
+        return _menu_response_dict(problem)
+
+    job = get_menu_job_queue().submit(
+        userUuid,
+        solve_menu_problem,
+        problem,
+        on_result=lambda solution: _menu_response_dict(build_diet_menu_response(problem, solution, userUuid)),
+    )
+    try:
+        await asyncio.wrap_future(job.future)
+    except Exception:
+        pass  # reported through job.error by the queue
+    if job.error is not None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=job.error
+        )
+    return job.result
+
+
+def prepare_diet_menu_batch(db: Session, requests: list[DietRequest], userUuid: int) -> list:
+    """
+    Prepare every request of a batch against one catalog / user-product load.
+
+    Returns:
+        One entry per request: a MenuProblem to solve, a finished response (validation
+        error or cached menu), or an {"error": ...} dict for a rejected request
+    """
+    products = combine_products(db, userUuid)
+    prepared = []
+    for request in requests:
+        try:
+            prepared.append(prepare_diet_menu(db, request, userUuid, products=products))
+        except HTTPException as e:
+            prepared.append({"error": e.detail})
+    return prepared
+
+
+async def generate_diet_menu_batch(db: Session, request: DietBatchRequest, userUuid: int):
+    """
+    Generate menus for several requests (e.g. every member of a household) in one call.
+
+    The catalog and the user's products are loaded once, and all solves are queued at once
+    so they run in parallel in the worker pool. Admission happens before anything is
+    returned; the result is an async iterator yielding one NDJSON line per request
+    ({"index": i, "result": ...}) in completion order.
+
+    Raises:
+        HTTPException: 429/503 if the job limits are reached
+    """
+    prepared = await run_in_threadpool(prepare_diet_menu_batch, db, request.requests, userUuid)
+
+    # Everything is admitted (or rejected) before streaming starts
+    solve_at = [i for i, p in enumerate(prepared) if isinstance(p, MenuProblem)]
+    jobs = get_menu_job_queue().submit_many(
+        userUuid,
+        solve_menu_problem,
+        [prepared[i] for i in solve_at],
+        on_results=[
+            lambda solution, problem=prepared[i]: _menu_response_dict(build_diet_menu_response(problem, solution, userUuid))
+            for i in solve_at
+        ],
+    )
+
+    async def _wait(index: int, job):
+        try:
+            await asyncio.wrap_future(job.future)
+        except Exception:
+            pass  # reported through job.error by the queue
+        return index, job
+
+    async def _stream():
+        # Requests answered without solving come first
+        for i, p in enumerate(prepared):
+            if not isinstance(p, MenuProblem):
+                yield json.dumps({"index": i, "result": _menu_response_dict(p)}, default=str) + "\n"
+        for finished in asyncio.as_completed([_wait(i, job) for i, job in zip(solve_at, jobs)]):
+            i, job = await finished
+            line = {"index": i, "result": job.result} if job.error is None else {"index": i, "error": job.error}
+            yield json.dumps(line, default=str) + "\n"
+
+    return _stream()
+
+
+async def menu_job_events(job):
+    """
+    Server-Sent Events stream for a menu job: one "status" event per status change,
+    the last one (status "done" / "failed") carrying the result.
+    """
+    last_status = None
+    while True:
+        state = menu_job_response(job)
+        if state.status != last_status:
+            last_status = state.status
+            yield f"event: status\ndata: {state.model_dump_json()}\n\n"
+        if job.done.is_set():
+            break
+        await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+
+
+def get_diet_menu_job(jobId: str, userUuid: int):
+    """
+    Look up one of the user's menu jobs.
+
+    Raises:
+        HTTPException: If the job does not exist, expired, or belongs to another user
+    """
+    job = get_menu_job_queue().get(jobId, userUuid)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Menu job not found."
+        )
+    return job
 
 
 def save_diet_menu(db: Session, request: PostDietPlanRequest, userUuid: int):
@@ -377,7 +796,7 @@ def save_diet_menu(db: Session, request: PostDietPlanRequest, userUuid: int):
     existing = (
         db.query(UserMenu)
         .filter(UserMenu.userUuid == userUuid)
-        .filter(UserMenu.name.ilike(request.name.strip()))
+        .filter(func.lower(UserMenu.name) == func.lower(request.name.strip()))
         .first()
     )
     if existing:
@@ -537,7 +956,7 @@ def delete_user_menu(db: Session, request: DeleteUserMenuRequest, userUuid: int)
     menu = (
         db.query(UserMenu)
         .filter(UserMenu.userUuid == userUuid)
-        .filter(UserMenu.name.ilike(request.menuName.strip()))
+        .filter(func.lower(UserMenu.name) == func.lower(request.menuName.strip()))
         .first()
     )
 
@@ -574,4 +993,106 @@ def delete_user_menu(db: Session, request: DeleteUserMenuRequest, userUuid: int)
 
     db.commit()
 
-    return {"message": f"Menu '{request.menuName}' and unused recipes deleted successfully."}
\ No newline at end of file
+    return {"message": f"Menu '{request.menuName}' and unused recipes deleted successfully."}
+
+
+async def _finished_jobs(jobs) -> list:
+    """Wait for queue jobs and return their results (raises 500 if any of them failed)."""
+    for job in jobs:
+        try:
+            await asyncio.wrap_future(job.future)
+        except Exception:
+            pass  # reported through job.error by the queue
+        if job.error is not None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=job.error
+            )
+    return [job.result for job in jobs]
+
+
+async def generate_menu_frontier(db: Session, request: MenuFrontierRequest, userUuid: int) -> MenuFrontierResponse:
+    """
+    Trade menu cost against a second objective (sugar, salt, deviation from the targets or
+    number of products) with an epsilon-constraint sweep.
+
+    The model inputs are prepared once. Two anchor solves run in parallel in the worker pool:
+    the cheapest menu and the menu best in the second objective. The range between them is
+    split into request.points - 1 limits; limits the cheapest menu already meets need no
+    solve. The others are split into one sweep per worker, which builds the model once and
+    solves the cheapest menu within each of its limits, warm-started from the second anchor
+    (which satisfies every limit; see solve_frontier_sweep()).
+
+    Args:
+        db: Database session
+        request: MenuFrontierRequest with the diet request, objective and number of points
+        userUuid: User's unique identifier
+
+    Returns:
+        MenuFrontierResponse with the non-dominated menus, cheapest first
+
+    Raises:
+        HTTPException: 400 for days coupled by maxRepeats, 429/503 if the job limits are
+            reached, 500 if a solve failed
+    """
+    objective = request.objective
+    diet = request.request.model_copy(update={"mode": "full"})
+    # Each frontier point is a different menu, so the result cache is bypassed
+    problem = await run_in_threadpool(prepare_diet_menu, db, diet, userUuid, None, False)
+    if isinstance(problem, dict):
+        return MenuFrontierResponse(status="Error", objective=objective, message=problem["error"])
+    if not isinstance(problem, MenuProblem):
+        return MenuFrontierResponse(status=problem.status, objective=objective, message=problem.message)
+    if problem.max_repeats is not None and problem.max_repeats < problem.days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Frontiers are not available for plans limited by maxRepeats."
+        )
+
+    queue = get_menu_job_queue()
+    sense = metric_sense(objective)
+    cheapest, best = await _finished_jobs(queue.submit_many(
+        userUuid,
+        solve_frontier_point,
+        [FrontierPoint(problem, objective), FrontierPoint(problem, objective, minimize_metric=True)],
+        on_results=[lambda solution: solution] * 2,
+    ))
+    if not cheapest.has_solution:
+        failed = build_diet_menu_response(problem, cheapest, userUuid)
+        return MenuFrontierResponse(status=failed.status, objective=objective, message=failed.message)
+
+    # Limits between the best second-objective value and that of the cheapest menu
+    # (the cheapest menu itself is the last point, and answers every limit it already meets)
+    # The best anchor is a frontier point too (and the fallback if the tightest limit times out)
+    solutions = [cheapest, best]
+    upper = sense * metric_value(problem, objective, problem.day_grams(cheapest)[0])
+    if best.has_solution:
+        lower = sense * metric_value(problem, objective, problem.day_grams(best)[0])
+        epsilons = [float(e) for e in np.linspace(lower, upper, request.points)[:-1]
+                    if e < upper - 1e-6 * max(1.0, abs(upper))]
+        if epsilons:
+            sweep = copy.copy(problem)
+            sweep.hint_grams = problem.day_grams(best)[0]
+            # One job per worker, each solving a contiguous run of limits on one model
+            chunks = [list(c) for c in np.array_split(epsilons, min(queue.workers, len(epsilons)))]
+            for results in await _finished_jobs(queue.submit_many(
+                userUuid,
+                solve_frontier_sweep,
+                [FrontierSweep(sweep, objective, chunk) for chunk in chunks],
+                on_results=[lambda results: results] * len(chunks),
+            )):
+                solutions += results
+
+    solutions = [s for s in solutions if s.has_solution]
+    values = [metric_value(problem, objective, problem.day_grams(s)[0]) for s in solutions]
+    costs = [float(problem.price100g @ problem.day_grams(s).sum(axis=0)) / 100 for s in solutions]
+
+    points = []
+    for i in pareto_filter([(cost, sense * value) for cost, value in zip(costs, values)]):
+        result, totals, days = _solution_menu(problem, solutions[i])
+        points.append(MenuFrontierPoint(
+            totalCost=round(costs[i], 2),
+            value=round(values[i], 3),
+            menu=GenerateMenuResponse(status=solutions[i].status, plan=result, days=days, **totals),
+        ))
+    return MenuFrontierResponse(status="Optimal", objective=objective, points=points)
@@ -1,15 +1,167 @@
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from app.backend.models.productsProtSep import ProductProtSep
+from operator import itemgetter
+import numpy as np
+import binascii
+import base64
+import json
+
+from app.backend.dependencies.catalogExport import EXPORT_TABLES, MEDIA_TYPES, export_formats, iter_export
+from app.backend.dependencies.httpCaching import make_etag
+from app.backend.dependencies.productCatalog import get_product_catalog, get_product_catalog_async, CatalogProduct, \
+    CATALOG_COLUMNS
+from app.backend.dependencies.productSearch import get_product_search_index, get_user_search_index, merge_search_results
+from app.backend.schemas.requests.productListRequest import ProductListRequest
+
+# Fields the product listing can be sorted by
+SORT_FIELDS = ("id", "productName") + CATALOG_COLUMNS
 
 def get_all_products(db: Session):
-    """Fetch and return all base products from the global product table."""
-    return db.query(ProductProtSep).all()
+    """Return all base products from the cached global product catalog."""
+    return get_product_catalog(db).product_dicts
 
-def get_products_names(db: Session):
+async def get_products_names_async():
     """
     Return a sorted list of all unique product names.
-    Used for auto-complete or search suggestions.
+    Used for auto-complete or search suggestions (the catalog is loaded off the event loop if needed).
+    """
+    return {"products": (await get_product_catalog_async()).sorted_names}
+
+def search_products(db: Session, q: str, userUuid: int, limit: int = 10):
+    """
+    Typeahead search over the global and the user's own product names (diacritics folded,
+    prefix matches first, then typo-tolerant trigram matches; see dependencies/productSearch.py).
+
+    Args:
+        db: Database session (loads the catalog / the user's names on first use)
+        q: The text typed so far
+        userUuid: User whose products are searched as well (ranked first on ties)
+        limit: Maximum number of names returned
+
+    Returns:
+        {"products": [best matching names]}
+    """
+    own = get_user_search_index(db, userUuid).search(q, limit)
+    shared = get_product_search_index(db).search(q, limit)
+    return {"products": merge_search_results([own, shared], limit)}
+
+def product_list_etag(db: Session, query: ProductListRequest, representation: str = "json") -> str:
+    """
+    ETag of a product listing: it only changes with the catalog content (its digest is
+    stable across reloads and processes) and the query, so clients can revalidate cheaply.
+    """
+    return make_etag(get_product_catalog(db).digest, query.model_dump(), representation)
+
+def _parse_fields(fields: str):
+    if fields is None:
+        return None
+    names = tuple(f.strip() for f in fields.split(",") if f.strip())
+    unknown = [f for f in names if f not in CatalogProduct._fields]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}; choose from {list(CatalogProduct._fields)}")
+    return names
+
+def _parse_ranges(ranges: list[str]) -> list[tuple]:
+    parsed = []
+    for spec in ranges:
+        parts = spec.split(":")
+        if len(parts) != 3 or parts[0] not in CATALOG_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"Invalid range '{spec}'; expected column:min:max with a column from {list(CATALOG_COLUMNS)}")
+        try:
+            lower, upper = (float(p) if p else None for p in parts[1:])
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid range bounds in '{spec}'")
+        parsed.append((parts[0], lower, upper))
+    return parsed
+
+def encode_cursor(sort_field: str, value, product_id: int) -> str:
+    """Opaque keyset cursor: the sort field, and the sort value and id of the last product of a page."""
+    return base64.urlsafe_b64encode(json.dumps([sort_field, value, product_id]).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_field: str):
+    try:
+        field, value, product_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        product_id = int(product_id)
+        valid = field == sort_field and isinstance(value, str) == (sort_field == "productName")
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor (cursors are only valid for the same sort)")
+    return value, product_id
+
+def list_products(db: Session, query: ProductListRequest) -> dict:
+    """
+    One page of the global product catalog, filtered, sorted and projected in NumPy.
+
+    Pages are cursor based (keyset on the sort value and id), so a page stays correct when
+    products before it are added or removed between requests.
+
+    Args:
+        db: Database session (only used to load the catalog)
+        query: Projection, sorting, filtering and paging parameters
+
+    Returns:
+        {"products": [...], "nextCursor": str or None, "total": number of matching products}
+
+    Raises:
+        HTTPException(400): Unknown fields, sort field or range, or an invalid cursor
+    """
+    catalog = get_product_catalog(db)
+    fields = _parse_fields(query.fields)
+    descending = query.sort.startswith("-")
+    sort_field = query.sort.removeprefix("-")
+    if sort_field not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by '{sort_field}'; choose from {list(SORT_FIELDS)}")
+
+    mask = catalog.diet_mask(query.vegan, query.vegetarian, query.dairyFree)
+    for column, lower, upper in _parse_ranges(query.range):
+        if lower is not None:
+            mask &= catalog.columns[column] >= lower
+        if upper is not None:
+            mask &= catalog.columns[column] <= upper
+
+    # Ascending (sort value, id) order of the matching products
+    order = catalog.sort_order(sort_field)
+    order = order[mask[order]]
+    keys, ids = catalog.sort_keys(sort_field)[order], catalog.ids[order]
+    total = len(order)
+
+    if query.cursor is not None:
+        value, product_id = decode_cursor(query.cursor, sort_field)
+        # Rows with the cursor's sort value are ordered by id
+        lower, upper = np.searchsorted(keys, value, "left"), np.searchsorted(keys, value, "right")
+        if descending:
+            order = order[:lower + np.searchsorted(ids[lower:upper], product_id, "left")]
+        else:
+            order = order[lower + np.searchsorted(ids[lower:upper], product_id, "right"):]
+    if descending:
+        order = order[::-1]
+
+    page = order[:query.limit] if query.limit is not None else order
+    next_cursor = None
+    if query.limit is not None and len(order) > query.limit:
+        last = page[-1]
+        value = catalog.sort_keys(sort_field)[last].item()
+        next_cursor = encode_cursor(sort_field, value, int(catalog.ids[last]))
+
+    if fields is None:
+        products = [catalog.product_dicts[i] for i in page.tolist()]
+    else:
+        positions = [CatalogProduct._fields.index(f) for f in fields]
+        getter = itemgetter(*positions) if len(positions) > 1 else (lambda p: (p[positions[0]],))
+        products = [dict(zip(fields, getter(catalog.products[i]))) for i in page.tolist()]
+    return {"products": products, "nextCursor": next_cursor, "total": total}
+
+def export_products(db: Session, table: str, fmt: str):
+    """
+    Stream a product table in a columnar binary format (see dependencies/catalogExport.py).
+
+    Returns:
+        (chunk iterator, media type, file name)
+
+    Raises:
+        HTTPException(400): Unknown table, or a format needing pyarrow when it is not installed
     """
-    products = db.query(ProductProtSep.productName).distinct().all()
-    names = sorted([p[0] for p in products if p[0]])  # Flatten tuples and remove None values
-    return {"products": names}
+    if table not in EXPORT_TABLES or fmt not in export_formats():
+        raise HTTPException(status_code=400, detail=f"Choose a table from {list(EXPORT_TABLES)} and a format from {list(export_formats())}")
+    return iter_export(db, table, fmt), MEDIA_TYPES[fmt], f"{table}.{fmt}"
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
@@ -210,25 +211,7 @@ def complete_info_submit(db: Session, request: CompleteRegistrationRequest, user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-def get_user_profile_data(db: Session, userUuid) -> tuple[User, ProfileResponse]:
-    """
-    Get the user and formatted profile data.
-
-    Args:
-        db: Database session
-        request: FastAPI request object containing cookies
-
-    Returns:
-        Tuple of (User object, GetProfileRequest with formatted data)
-
-    Raises:
-        HTTPException: If user is not authenticated or not found
-    """
-    user = db.query(User).filter(User.uuid == userUuid).first()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
+def _profile_response(user: User) -> ProfileResponse:
     return ProfileResponse(
         username=user.username,
         email=user.email,
@@ -372,14 +355,7 @@ def calculate_daily_nutrition(db: Session, userUuid: int):
 
     return {"message": "Daily nutrition recalculated successfully"}
 
-def calculated_nutrition_info(db: Session, userUuid: int):
-    """
-        Return all calculated nutrition info and diet restrictions for the user.
-    """
-    user: User | None = db.query(User).filter(User.uuid == userUuid).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
+def _calculated_nutrition_response(user: User) -> CalculatedNutritionInfoResponse:
     return CalculatedNutritionInfoResponse(
         calculatedKcal=user.calculatedKcal,
         calculatedCarbs=user.calculatedCarbs,
@@ -391,4 +367,27 @@ def calculated_nutrition_info(db: Session, userUuid: int):
         isVegetarian=user.isVegetarian,
         isVegan=user.isVegan,
         isDairyInt=user.isDairyInt
-    )
\ No newline at end of file
+    )
+
+# Profile reads for the `async def` routes (AsyncSession)
+
+async def _get_user_async(db: AsyncSession, userUuid: int) -> User:
+    user = await db.get(User, userUuid)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+async def get_user_profile_data_async(db: AsyncSession, userUuid: int) -> ProfileResponse:
+    """
+    Get the user's formatted profile data.
+
+    Raises:
+        HTTPException: If the user is not found
+    """
+    return _profile_response(await _get_user_async(db, userUuid))
+
+async def calculated_nutrition_info_async(db: AsyncSession, userUuid: int) -> CalculatedNutritionInfoResponse:
+    """
+        Return all calculated nutrition info and diet restrictions for the user.
+    """
+    return _calculated_nutrition_response(await _get_user_async(db, userUuid))
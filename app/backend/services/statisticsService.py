@@ -1,196 +1,161 @@
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta
 from fastapi import HTTPException, status
-from sqlalchemy import and_
-from typing import List
-from app.backend.models.userConsumedProducts import UserConsumedProduct
+import numpy as np
+from app.backend.dependencies.nutritionRollup import ROLLUP_FIELDS, daily_rollup_rows_async, sum_rollup_async
 from app.backend.schemas.responses.userStatisticsResponse import UserStatisticsResponse
+from app.backend.schemas.responses.statisticsSeriesResponse import StatisticsSeriesResponse
 from app.backend.schemas.requests.getUserStatisticsByDateRequest import GetUserStatisticsByDateRequest
+from app.backend.schemas.requests.statisticsSeriesRequest import StatisticsSeriesRequest
+
+# Response field -> summed userDailyNutrition column
+STATISTICS_FIELDS = {
+    "averageKcal": "kcal",
+    "averageFat": "fat",
+    "averageSatFat": "satFat",
+    "averageCarbs": "carbs",
+    "averageSugar": "sugar",
+    "averageProtein": "protein",
+    "averageDairyProtein": "dairyProtein",
+    "averageAnimalProtein": "animalProtein",
+    "averagePlantProtein": "plantProtein",
+    "averageSalt": "salt",
+    "averageCost": "cost",
+}
+
+# Longest range /statistics/series accepts (about ten years of daily buckets)
+MAX_SERIES_DAYS = 3660
+
+# Bucket -> first day of the bucket containing a day
+BUCKET_STARTS = {
+    "day": lambda day: day,
+    "week": lambda day: day - timedelta(days=day.weekday()),
+    "month": lambda day: day.replace(day=1),
+}
+
+def _statistics_sums(totals: dict) -> dict:
+    """Rollup totals (see nutritionRollup.sum_rollup_async) keyed by the response fields."""
+    sums = {key: float(totals[field]) for key, field in STATISTICS_FIELDS.items()}
+    sums["averageProducts"] = int(totals["products"])
+    return sums
+
 
-def _sum_consumed(products: List[UserConsumedProduct]) -> dict:
+async def _sum_consumed_async(db: AsyncSession, userUuid: int, first_day: date, last_day: date) -> dict:
     """
-        Aggregate total nutrient values from a list of consumed products.
+        Aggregate total nutrient values of the products a user consumed on the days
+        [first_day, last_day], summed over the daily rollup (one small row per day).
 
-        Returns a dict with summed totals (not yet averaged).
+        Returns a dict with summed totals (not yet averaged); zeros if nothing was consumed.
     """
-    sums = {
-        "averageKcal": 0.0,
-        "averageFat": 0.0,
-        "averageSatFat": 0.0,
-        "averageCarbs": 0.0,
-        "averageSugar": 0.0,
-        "averageProtein": 0.0,
-        "averageDairyProtein": 0.0,
-        "averageAnimalProtein": 0.0,
-        "averagePlantProtein": 0.0,
-        "averageSalt": 0.0,
-        "averageCost": 0.0,
-        "averageProducts": len(products)
-    }
-    for p in products:
-        sums["averageKcal"] += p.kcal
-        sums["averageFat"] += p.fat
-        sums["averageSatFat"] += p.satFat
-        sums["averageCarbs"] += p.carbs
-        sums["averageSugar"] += p.sugar
-        sums["averageProtein"] += p.protein
-        sums["averageDairyProtein"] += p.dairyProtein
-        sums["averageAnimalProtein"] += p.animalProtein
-        sums["averagePlantProtein"] += p.plantProtein
-        sums["averageSalt"] += p.salt
-        sums["averageCost"] += p.cost
-    return sums
+    return _statistics_sums(await sum_rollup_async(db, userUuid, first_day, last_day))
 
 
-def get_daily_statistics(db: Session, userUuid: int) -> UserStatisticsResponse:
-    """
-        Compute daily totals for the current date.
-        Returns zeros if no products were consumed.
-    """
+def _last_days(days: int) -> tuple[date, date]:
+    """First and last day of the last `days` days (today and the days - 1 before)."""
     today = datetime.now().date()
-    products = db.query(UserConsumedProduct).filter(
-        and_(
-            UserConsumedProduct.userUuid == userUuid,
-            UserConsumedProduct.date >= datetime.combine(today, datetime.min.time()),
-            UserConsumedProduct.date <= datetime.combine(today, datetime.max.time())
-        )
-    ).all()
-
-    if not products:
-        # Return zeros instead of raising exception
-        averages = {
-            "averageKcal": 0.0,
-            "averageFat": 0.0,
-            "averageSatFat": 0.0,
-            "averageCarbs": 0.0,
-            "averageSugar": 0.0,
-            "averageProtein": 0.0,
-            "averageDairyProtein": 0.0,
-            "averageAnimalProtein": 0.0,
-            "averagePlantProtein": 0.0,
-            "averageSalt": 0.0,
-            "averageCost": 0.0,
-            "averageProducts": 0
-        }
-        averages["period"] = "Today"
-        return UserStatisticsResponse(**averages)
-
-    averages = _sum_consumed(products)
-    averages["period"] = "Today"
+    return today - timedelta(days=days - 1), today
+
+
+def _rounded_averages(sums: dict, days: int, period: str) -> UserStatisticsResponse:
+    averages = {k: round((v / days), 2) for k, v in sums.items()}
+    averages["period"] = period
     return UserStatisticsResponse(**averages)
 
 
-def get_average_last_7_days(db: Session, userUuid: int) -> UserStatisticsResponse:
-    """Return averaged nutrition data over the last 7 days."""
-    start_date = datetime.now() - timedelta(days=7)
-    products = db.query(UserConsumedProduct).filter(
-        and_(
-            UserConsumedProduct.userUuid == userUuid,
-            UserConsumedProduct.date >= start_date
+def _check_date_range(start, end):
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Start date cannot be after end date."
         )
-    ).all()
-
-    if not products:
-        averages = {
-            "averageKcal": 0.0,
-            "averageFat": 0.0,
-            "averageSatFat": 0.0,
-            "averageCarbs": 0.0,
-            "averageSugar": 0.0,
-            "averageProtein": 0.0,
-            "averageDairyProtein": 0.0,
-            "averageAnimalProtein": 0.0,
-            "averagePlantProtein": 0.0,
-            "averageSalt": 0.0,
-            "averageCost": 0.0,
-            "averageProducts": 0
-        }
-        averages["period"] = "Last 7 days"
-        return UserStatisticsResponse(**averages)
-
-    sums = _sum_consumed(products)
-    averages = {k: round((v / 7), 2) for k, v in sums.items()}
-    averages["period"] = "Last 7 days"
+
+
+def _date_range_averages(sums: dict, request: GetUserStatisticsByDateRequest) -> UserStatisticsResponse:
+    days_count = (request.endDate.date() - request.startDate.date()).days + 1
+    averages = {k: (v / days_count) if isinstance(v, (int, float)) else v for k, v in sums.items()}
+    averages["period"] = f"{request.startDate.date()} - {request.endDate.date()}"
     return UserStatisticsResponse(**averages)
 
 
-def get_average_last_30_days(db: Session, userUuid: int) -> UserStatisticsResponse:
+def _series_buckets(request: StatisticsSeriesRequest):
     """
-        Compute average nutrition stats within a custom date range.
+        Bucket start days, the bucket index of every day in the range, and the days per bucket.
 
-        Validates that start <= end and averages over the number of days in range.
+        Raises:
+            HTTPException 400: start after end, or the range is longer than MAX_SERIES_DAYS
     """
-    start_date = datetime.now() - timedelta(days=30)
-    products = db.query(UserConsumedProduct).filter(
-        and_(
-            UserConsumedProduct.userUuid == userUuid,
-            UserConsumedProduct.date >= start_date
+    _check_date_range(request.startDate, request.endDate)
+    days_count = (request.endDate - request.startDate).days + 1
+    if days_count > MAX_SERIES_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot be longer than {MAX_SERIES_DAYS} days."
         )
-    ).all()
-
-    if not products:
-        averages = {
-            "averageKcal": 0.0,
-            "averageFat": 0.0,
-            "averageSatFat": 0.0,
-            "averageCarbs": 0.0,
-            "averageSugar": 0.0,
-            "averageProtein": 0.0,
-            "averageDairyProtein": 0.0,
-            "averageAnimalProtein": 0.0,
-            "averagePlantProtein": 0.0,
-            "averageSalt": 0.0,
-            "averageCost": 0.0,
-            "averageProducts": 0
-        }
-        averages["period"] = "Last 30 days"
-        return UserStatisticsResponse(**averages)
-
-    sums = _sum_consumed(products)
-    averages = {k: round((v / 30), 2) for k, v in sums.items()}
-    averages["period"] = "Last 30 days"
+
+    bucket_start = BUCKET_STARTS[request.bucket]
+    starts, bucket_of_day = [], np.empty(days_count, dtype=np.intp)
+    for offset in range(days_count):
+        start = bucket_start(request.startDate + timedelta(days=offset))
+        if not starts or starts[-1] != start:
+            starts.append(start)
+        bucket_of_day[offset] = len(starts) - 1
+    return starts, bucket_of_day, np.bincount(bucket_of_day, minlength=len(starts))
+
+
+def _series_response(request: StatisticsSeriesRequest, starts, bucket_of_day, days, rows) -> StatisticsSeriesResponse:
+    """Sums the daily rollup rows into their buckets at once (empty buckets are zeros)."""
+    names = ROLLUP_FIELDS + ("products",)
+    totals = np.zeros((len(names), len(starts)))
+    if rows:
+        buckets = bucket_of_day[[(row[0] - request.startDate).days for row in rows]]
+        values = np.array([row[1:] for row in rows], dtype=float).T
+        for i in range(len(names)):
+            totals[i] = np.bincount(buckets, weights=np.nan_to_num(values[i]), minlength=len(starts))
+
+    averages = totals / days
+    return StatisticsSeriesResponse(
+        bucket=request.bucket,
+        starts=starts,
+        days=days.tolist(),
+        totals={name: np.round(totals[i], 2).tolist() for i, name in enumerate(names)},
+        averages={name: np.round(averages[i], 2).tolist() for i, name in enumerate(names)},
+    )
+
+
+async def get_daily_statistics_async(db: AsyncSession, userUuid: int) -> UserStatisticsResponse:
+    """
+        Compute daily totals for the current date.
+        Returns zeros if no products were consumed.
+    """
+    averages = await _sum_consumed_async(db, userUuid, *_last_days(1))
+    averages["period"] = "Today"
     return UserStatisticsResponse(**averages)
 
 
-def get_average_by_date(db: Session, request: GetUserStatisticsByDateRequest, userUuid: int) -> UserStatisticsResponse:
+async def get_average_last_7_days_async(db: AsyncSession, userUuid: int) -> UserStatisticsResponse:
+    """Return averaged nutrition data over the last 7 days (today and the 6 days before)."""
+    return _rounded_averages(await _sum_consumed_async(db, userUuid, *_last_days(7)), 7, "Last 7 days")
 
-    if request.startDate > request.endDate:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Start date cannot be after end date."
-        )
 
-    end_of_day = datetime.combine(request.endDate.date(), datetime.max.time())
+async def get_average_last_30_days_async(db: AsyncSession, userUuid: int) -> UserStatisticsResponse:
+    """Return averaged nutrition data over the last 30 days (today and the 29 days before)."""
+    return _rounded_averages(await _sum_consumed_async(db, userUuid, *_last_days(30)), 30, "Last 30 days")
 
-    products = db.query(UserConsumedProduct).filter(
-        and_(
-            UserConsumedProduct.userUuid == userUuid,
-            UserConsumedProduct.date >= datetime.combine(request.startDate.date(), datetime.min.time()),
-            UserConsumedProduct.date <= end_of_day
-        )
-    ).all()
-
-    if not products:
-        averages = {
-            "averageKcal": 0.0,
-            "averageFat": 0.0,
-            "averageSatFat": 0.0,
-            "averageCarbs": 0.0,
-            "averageSugar": 0.0,
-            "averageProtein": 0.0,
-            "averageDairyProtein": 0.0,
-            "averageAnimalProtein": 0.0,
-            "averagePlantProtein": 0.0,
-            "averageSalt": 0.0,
-            "averageCost": 0.0,
-            "averageProducts": 0
-        }
-        averages["period"] = f"{request.startDate.date()} - {request.endDate.date()}"
-        return UserStatisticsResponse(**averages)
-
-    sums = _sum_consumed(products)
-    days_count = (request.endDate.date() - request.startDate.date()).days + 1
-    averages = {k: (v / days_count) if isinstance(v, (int, float)) else v for k, v in sums.items()}
-    averages["period"] = f"{request.startDate.date()} - {request.endDate.date()}"
 
-    return UserStatisticsResponse(**averages)
\ No newline at end of file
+async def get_average_by_date_async(db: AsyncSession, request: GetUserStatisticsByDateRequest, userUuid: int) -> UserStatisticsResponse:
+    _check_date_range(request.startDate, request.endDate)
+    sums = await _sum_consumed_async(db, userUuid, request.startDate.date(), request.endDate.date())
+    return _date_range_averages(sums, request)
+
+
+async def get_statistics_series_async(db: AsyncSession, request: StatisticsSeriesRequest, userUuid: int) -> StatisticsSeriesResponse:
+    """
+        Nutrient totals and per-day averages of [startDate, endDate] in day, week or month
+        buckets, for charts. Reads one rollup row per day with consumed products.
+
+        Raises:
+            HTTPException 400: start after end, or the range is longer than MAX_SERIES_DAYS
+    """
+    starts, bucket_of_day, days = _series_buckets(request)
+    rows = await daily_rollup_rows_async(db, userUuid, request.startDate, request.endDate)
+    return _series_response(request, starts, bucket_of_day, days, rows)
@@ -1,8 +1,11 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.backend.dependencies.scrapeNutriotionValue import get_product_data_from_url
 from app.backend.dependencies.scrapeRimi import scrape_rimi_product
-from app.backend.models.products import Product
+from app.backend.dependencies.productCatalog import get_product_catalog
+from app.backend.dependencies.productSearch import update_user_search_index
 from app.backend.models.userProducts import UserProduct
 from app.backend.schemas.requests.postUserProductByNutritionValueRequest import PostUserProductByNutritionValueUrlRequest
 from app.backend.schemas.requests.postUserProductByRimiUrlRequest import PostUserProductByRimiUrlRequest
@@ -23,19 +26,13 @@ def get_user_products(db: Session, userUuid: int):
     """
     return db.query(UserProduct).filter(UserProduct.userUuid == userUuid).order_by(UserProduct.id).all()
 
-def get_user_products_names(db: Session, userUuid: int):
+async def get_user_products_names_async(db: AsyncSession, userUuid: int):
     """
             Return a sorted list of distinct product names for a user.
             Ignores None values.
     """
-    products = (
-        db.query(UserProduct.productName)
-        .filter(UserProduct.userUuid == userUuid)
-        .distinct()
-        .all()
-    )
-    names = sorted([p[0] for p in products if p[0]])  # flatten tuples and remove None
-    return {"products": names}
+    names = await db.scalars(select(UserProduct.productName).where(UserProduct.userUuid == userUuid).distinct())
+    return {"products": sorted(name for name in names if name)}
 
 def add_user_product(db: Session, request: PostUserProductRequest, userUuid: int):
     """
@@ -48,15 +45,12 @@ def add_user_product(db: Session, request: PostUserProductRequest, userUuid: int
     existing_user = (
         db.query(UserProduct)
         .filter(UserProduct.userUuid == userUuid)
-        .filter(UserProduct.productName.ilike(product_name))
+        .filter(func.lower(UserProduct.productName) == func.lower(product_name))
         .first()
     )
 
-    existing_global = (
-        db.query(Product)
-        .filter(Product.productName.ilike(product_name))
-        .first()
-    )
+    # Global products are checked through the name index of the cached catalog
+    existing_global = len(get_product_catalog(db).lookup(product_name)) > 0
 
     if existing_user or existing_global:
         raise HTTPException(
@@ -90,6 +84,7 @@ def add_user_product(db: Session, request: PostUserProductRequest, userUuid: int
     db.add(new_product)
     db.commit()
     db.refresh(new_product)
+    update_user_search_index(userUuid, added=[new_product.productName])
     return {"message": f"Product '{new_product.productName}' added successfully."}
 
 def delete_user_product(db: Session, request: DeleteUserProductRequest, userUuid: int):
@@ -100,7 +95,7 @@ def delete_user_product(db: Session, request: DeleteUserProductRequest, userUuid
     product = (
         db.query(UserProduct)
         .filter(UserProduct.userUuid == userUuid)
-        .filter(UserProduct.productName.ilike(request.productName.strip()))
+        .filter(func.lower(UserProduct.productName) == func.lower(request.productName.strip()))
         .first()
     )
 
@@ -110,8 +105,10 @@ def delete_user_product(db: Session, request: DeleteUserProductRequest, userUuid
             detail=f"Product '{request.productName}' not found for this user."
         )
 
+    name = product.productName
     db.delete(product)
     db.commit()
+    update_user_search_index(userUuid, removed=[name])
 
     return {"message": f"Product '{request.productName}' deleted successfully."}
 
@@ -190,6 +187,7 @@ def add_user_product_by_rimi_url(db: Session, request: PostUserProductByRimiUrlR
     db.add(new_product)
     db.commit()
     db.refresh(new_product)
+    update_user_search_index(userUuid, added=[new_product.productName])
 
     missing_nutrition = [k for k in ["kcal", "fat", "satFat", "carbs", "sugars", "protein"] if scraped.get(k) is None]
     if missing_nutrition:
@@ -284,6 +282,7 @@ def add_user_product_by_nutrition_value_url(db: Session, request: PostUserProduc
     db.add(new_product)
     db.commit()
     db.refresh(new_product)
+    update_user_search_index(userUuid, added=[new_product.productName])
 
     missing_nutrition = [k for k in ["kcal", "fat", "satFat", "carbs", "sugars", "protein"] if scraped.get(k) is None]
     if missing_nutrition:
@@ -301,7 +300,7 @@ def update_user_product(db: Session, request: UpdateUserProductRequest, userUuid
     product_to_update = (
         db.query(UserProduct)
         .filter(UserProduct.userUuid == userUuid)
-        .filter(UserProduct.productName.ilike(request.oldProductName.strip()))
+        .filter(func.lower(UserProduct.productName) == func.lower(request.oldProductName.strip()))
         .first()
     )
 
@@ -310,13 +309,14 @@ def update_user_product(db: Session, request: UpdateUserProductRequest, userUuid
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Product '{request.oldProductName}' not found for this user."
         )
+    old_name = product_to_update.productName
 
     if request.productName and request.productName.strip() != request.oldProductName.strip():
         new_name = request.productName.strip()
         name_conflict_user = (
             db.query(UserProduct)
             .filter(UserProduct.userUuid == userUuid)
-            .filter(UserProduct.productName.ilike(new_name))
+            .filter(func.lower(UserProduct.productName) == func.lower(new_name))
             .first()
         )
         if name_conflict_user:
@@ -441,4 +441,5 @@ def update_user_product(db: Session, request: UpdateUserProductRequest, userUuid
 
     db.commit()
     db.refresh(product_to_update)
+    update_user_search_index(userUuid, added=[product_to_update.productName], removed=[old_name])
     return {"message": f"Product '{product_to_update.productName}' updated successfully."}
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+Exports the product tables as Arrow IPC, Parquet or NumPy .npz (see
+app/backend/dependencies/catalogExport.py), e.g. for offline analyses, the menu benchmark,
+or as the PRODUCT_CATALOG_CACHE the API memory-maps at startup.
+
+Usage (from the repository root, with DATABASE_URL set):
+    python -m app.benchmarks.exportCatalog catalog.npz
+    python -m app.benchmarks.exportCatalog products.parquet --table products
+"""
+from pathlib import Path
+import argparse
+import time
+
+from app.backend.database import SessionLocal
+from app.backend.dependencies.catalogExport import EXPORT_TABLES, export_formats, load_catalog_cache, write_export
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a product table in a columnar binary format.")
+    parser.add_argument("output", type=Path, help="output file; the format follows the suffix (.arrow, .parquet, .npz)")
+    parser.add_argument("--table", default="productsProtSep", choices=list(EXPORT_TABLES))
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per server-side cursor batch")
+    parser.add_argument("--verify", action="store_true", help="load the export as the product catalog afterwards")
+    args = parser.parse_args(argv)
+
+    fmt = args.output.suffix.lstrip(".")
+    if fmt not in export_formats():
+        parser.error(f"unsupported suffix '{args.output.suffix}'; available formats: {', '.join(export_formats())}")
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        size = write_export(db, args.table, fmt, args.output, args.batch_size)
+    finally:
+        db.close()
+    print(f"Wrote {args.table} to {args.output} ({size / 1e6:.1f} MB) in {time.perf_counter() - start:.2f}s")
+
+    if args.verify:
+        start = time.perf_counter()
+        catalog = load_catalog_cache(args.output)
+        print(f"Loaded {len(catalog)} products (digest {catalog.digest[:12]}) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Menu-solve benchmark: replays a corpus of recorded DietRequests against synthetic product
+catalogs (shaped like productsProtSep) in an in-memory SQLite database, and reports p50/p95
+prepare, build and solve times per catalog size and solver backend.
+
+Usage (from the repository root, with DATABASE_URL set; the benchmark never connects to it):
+    python -m app.benchmarks.menuBenchmark
+    python -m app.benchmarks.menuBenchmark --sizes 500 5000 --backends highs cbc --json results.json
+"""
+from collections import defaultdict, Counter
+from pathlib import Path
+import argparse
+import json
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.backend.database import Base
+from app.backend.models.productsProtSep import ProductProtSep
+from app.backend.models.userProducts import UserProduct
+from app.backend.schemas.requests.dietRequest import DietRequest
+from app.backend.dependencies.menuModel import MenuProblem, solve_menu_problem
+from app.backend.dependencies.menuSolver import SOLVER_BACKENDS
+from app.backend.dependencies.productCatalog import invalidate_product_catalog
+from app.backend.services.menuService import combine_products, prepare_diet_menu
+
+CORPUS_PATH = Path(__file__).with_name("menuRequestCorpus.json")
+DEFAULT_SIZES = (500, 5000, 50000)
+BENCHMARK_USER = 1
+
+# Product categories of the synthetic catalog:
+# (name, protein source, kcal, protein, fat, carbs per 100g as (low, high), sugar share of carbs,
+#  max salt, price per kg (low, high), vegan, vegetarian, dairyFree)
+CATEGORIES = (
+    ("Piens", "dairy", (40, 70), (3, 4), (0.5, 3.5), (4, 5), 1.0, 0, (0.8, 1.6), False, True, False),
+    ("Siers", "dairy", (250, 420), (20, 30), (15, 35), (0, 3), 0.5, 2, (6, 18), False, True, False),
+    ("Jogurts", "dairy", (50, 120), (3, 10), (0, 5), (4, 15), 0.8, 0, (1.5, 4), False, True, False),
+    ("Biezpiens", "dairy", (70, 220), (11, 18), (0.5, 18), (2, 4), 0.8, 0, (3, 7), False, True, False),
+    ("Vistas gaļa", "animal", (110, 220), (18, 24), (2, 14), (0, 1), 0.0, 1, (4, 9), False, False, True),
+    ("Cūkgaļa", "animal", (150, 350), (15, 22), (8, 30), (0, 1), 0.0, 1, (4, 10), False, False, True),
+    ("Liellopu gaļa", "animal", (150, 300), (18, 26), (5, 22), (0, 1), 0.0, 1, (9, 20), False, False, True),
+    ("Zivis", "animal", (80, 250), (16, 24), (1, 18), (0, 1), 0.0, 2, (6, 25), False, False, True),
+    ("Olas", "animal", (140, 160), (12, 13), (9, 11), (0, 1), 1.0, 0, (2.5, 5), False, True, True),
+    ("Auzu pārslas", "plant", (350, 390), (11, 14), (6, 8), (55, 65), 0.02, 0, (1, 3), True, True, True),
+    ("Rīsi", "plant", (340, 360), (6, 8), (0.5, 1), (75, 80), 0.01, 0, (1.2, 4), True, True, True),
+    ("Makaroni", "plant", (340, 370), (11, 14), (1, 2), (68, 74), 0.04, 0, (1, 3.5), True, True, True),
+    ("Maize", "plant", (220, 280), (7, 10), (1, 5), (40, 50), 0.08, 1, (1.5, 5), True, True, True),
+    ("Pupiņas", "plant", (80, 340), (6, 22), (0.5, 2), (12, 60), 0.05, 1, (1.5, 5), True, True, True),
+    ("Lēcas", "plant", (110, 350), (9, 25), (0.5, 2), (18, 60), 0.04, 0, (2, 5), True, True, True),
+    ("Tofu", "plant", (75, 150), (8, 16), (4, 9), (1, 3), 0.3, 0, (5, 10), True, True, True),
+    ("Rieksti", "plant", (550, 680), (14, 25), (45, 65), (8, 20), 0.3, 0, (10, 30), True, True, True),
+    ("Dārzeņi", "plant", (15, 80), (0.5, 3), (0, 1), (2, 15), 0.5, 0, (0.8, 5), True, True, True),
+    ("Augļi", "plant", (30, 90), (0.3, 1.5), (0, 0.5), (8, 22), 0.8, 0, (1, 6), True, True, True),
+    ("Kartupeļi", "plant", (70, 90), (1.5, 2.5), (0, 0.5), (15, 20), 0.04, 0, (0.5, 1.5), True, True, True),
+    ("Saldumi", "plant", (400, 550), (2, 8), (10, 35), (50, 75), 0.7, 0, (5, 20), False, True, True),
+)
+
+
+def synthetic_products(n: int, seed: int = 0) -> list[dict]:
+    """
+    n productsProtSep rows cycling through CATEGORIES, named "<category> <k>" (so "Tofu 1"
+    exists in every catalog of at least len(CATEGORIES) products). Values are drawn uniformly
+    within each category's ranges; like the real table, kcal and salt are integers.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        (name, source, kcal, protein, fat, carbs, sugar_share, salt, price1kg,
+         vegan, vegetarian, dairy_free) = CATEGORIES[i % len(CATEGORIES)]
+        prot = round(float(rng.uniform(*protein)), 1)
+        carbs_value = round(float(rng.uniform(*carbs)), 1)
+        fat_value = round(float(rng.uniform(*fat)), 1)
+        price = round(float(rng.uniform(*price1kg)), 2)
+        rows.append({
+            "id": i + 1,
+            "productName": f"{name} {i // len(CATEGORIES) + 1}",
+            "kcal": int(rng.integers(kcal[0], kcal[1] + 1)),
+            "fat": fat_value,
+            "satFat": round(fat_value * float(rng.uniform(0.1, 0.6)), 1),
+            "carbs": carbs_value,
+            "sugars": round(carbs_value * sugar_share * float(rng.uniform(0.5, 1.0)), 1),
+            "protein": prot,
+            "dairyProt": prot if source == "dairy" else 0.0,
+            "animalProt": prot if source == "animal" else 0.0,
+            "plantProt": prot if source == "plant" else 0.0,
+            "salt": int(rng.integers(0, salt + 1)),
+            "price1kg": price,
+            "price100g": round(price / 10, 2),
+            "vegan": vegan,
+            "vegetarian": vegetarian,
+            "dairyFree": dairy_free,
+        })
+    return rows
+
+
+def make_benchmark_db(n: int, seed: int = 0) -> Session:
+    """In-memory SQLite session holding n synthetic products plus two products of BENCHMARK_USER."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[ProductProtSep.__table__, UserProduct.__table__])
+    db = sessionmaker(bind=engine)()
+    db.execute(insert(ProductProtSep), synthetic_products(n, seed))
+    # ids are explicit: SQLite does not autoincrement BIGINT keys
+    db.add_all([
+        UserProduct(id=1, userUuid=BENCHMARK_USER, productName="Mājas Granola", kcal=450, fat=18, satFat=4, carbs=60,
+                    sugars=20, protein=10, plantProt=10, salt=0, price1kg=6, price100g=0.6,
+                    vegan=True, vegetarian=True, dairyFree=True),
+        UserProduct(id=2, userUuid=BENCHMARK_USER, productName="Kefīrs", kcal=50, fat=2, satFat=1.2, carbs=4,
+                    sugars=4, protein=3, dairyProt=3, salt=0, price1kg=1.2, price100g=0.12,
+                    vegan=False, vegetarian=True, dairyFree=False),
+    ])
+    db.commit()
+    # The process-wide catalog cache still holds the previous database's products
+    invalidate_product_catalog()
+    return db
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> list[tuple[str, dict]]:
+    """(label, DietRequest fields) pairs of the recorded request corpus."""
+    with open(path, encoding="utf-8") as f:
+        return [(entry["label"], entry["request"]) for entry in json.load(f)]
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    """(p50, p95) of a list of seconds, in milliseconds."""
+    if not samples:
+        return float("nan"), float("nan")
+    p50, p95 = np.percentile(np.asarray(samples) * 1000, [50, 95])
+    return round(float(p50), 2), round(float(p95), 2)
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, backends=SOLVER_BACKENDS, corpus=None, time_limit: float = None,
+                  repeat: int = 1, seed: int = 0) -> list[dict]:
+    """
+    Solve every corpus request with every backend against a synthetic catalog of each size.
+
+    Args:
+        sizes: Catalog sizes (number of productsProtSep rows)
+        backends: Solver backends to compare
+        corpus: (label, request fields) pairs (default: the recorded corpus)
+        time_limit: Optional solver time limit per request (seconds)
+        repeat: How often each request is solved per backend
+        seed: Seed of the synthetic catalogs
+
+    Returns:
+        One summary dict per (size, backend) with the catalog load time, p50/p95 of the
+        prepare (validation, bounds, presolve), build and solve phases in milliseconds,
+        status counts, the mean model size and every raw sample
+    """
+    corpus = corpus if corpus is not None else load_corpus()
+    summaries = []
+    for size in sizes:
+        db = make_benchmark_db(size, seed)
+        start = time.perf_counter()
+        products = combine_products(db, BENCHMARK_USER)
+        load_seconds = time.perf_counter() - start
+
+        for backend in backends:
+            samples = defaultdict(list)
+            statuses = Counter()
+            variables = []
+            for label, fields in corpus:
+                request = DietRequest(**{**fields, "solver": backend, "timeLimit": time_limit})
+                for _ in range(repeat):
+                    problem = prepare_diet_menu(db, request, BENCHMARK_USER, products=products, use_cache=False)
+                    if not isinstance(problem, MenuProblem):
+                        statuses["Rejected"] += 1  # validation error (e.g. restriction not in the catalog)
+                        continue
+                    result = solve_menu_problem(problem)
+                    samples["prepare"].append(sum(problem.timer.phases.values()))
+                    samples["build"].append(result.timings["build"])
+                    samples["solve"].append(result.timings["solve"])
+                    samples["requests"].append((label, result.status, result.timings["solve"]))
+                    statuses[result.status] += 1
+                    variables.append(result.model_stats["variables"])
+
+            summaries.append({
+                "size": size,
+                "backend": backend,
+                "load_ms": round(load_seconds * 1000, 2),
+                "prepare_ms": percentiles(samples["prepare"]),
+                "build_ms": percentiles(samples["build"]),
+                "solve_ms": percentiles(samples["solve"]),
+                "statuses": dict(statuses),
+                "variables": round(float(np.mean(variables)), 1) if variables else None,
+                "samples": samples["requests"],
+            })
+        db.close()
+    return summaries
+
+
+def format_summaries(summaries: list[dict]) -> str:
+    """Plain-text table of run_benchmark() results (p50 / p95 in milliseconds)."""
+    lines = [f"{'size':>7} {'backend':<7} {'load':>9} {'prepare p50/p95':>18} {'build p50/p95':>18} "
+             f"{'solve p50/p95':>20} {'vars':>8}  statuses"]
+    for s in summaries:
+        statuses = ", ".join(f"{k}={v}" for k, v in sorted(s["statuses"].items()))
+        lines.append(
+            f"{s['size']:>7} {s['backend']:<7} {s['load_ms']:>9} "
+            f"{'%s / %s' % s['prepare_ms']:>18} {'%s / %s' % s['build_ms']:>18} {'%s / %s' % s['solve_ms']:>20} "
+            f"{s['variables'] if s['variables'] is not None else '-':>8}  {statuses}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark menu solves on synthetic product catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="catalog sizes")
+    parser.add_argument("--backends", nargs="+", default=list(SOLVER_BACKENDS), choices=SOLVER_BACKENDS)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH, help="JSON request corpus")
+    parser.add_argument("--time-limit", type=float, default=None, help="solver time limit per request (s)")
+    parser.add_argument("--repeat", type=int, default=1, help="solves per request and backend")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic catalogs")
+    parser.add_argument("--json", type=Path, default=None, help="also write the results (with samples) here")
+    args = parser.parse_args(argv)
+
+    summaries = run_benchmark(args.sizes, args.backends, load_corpus(args.corpus), args.time_limit,
+                              args.repeat, args.seed)
+    print(format_summaries(summaries))
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Replays snapshots of slow menu solves (see app/backend/dependencies/menuSnapshots.py) with
+other solver settings, to profile the worst real-world instances offline.
+
+Usage (from the repository root, with DATABASE_URL set; replays never connect to it):
+    python -m app.benchmarks.menuReplay /var/menu-snapshots --slowest 10 --backends highs cbc
+    python -m app.benchmarks.menuReplay /var/menu-snapshots/20250101-120000-42-1a2b3c4d --time-limit 120
+"""
+from pathlib import Path
+import argparse
+import json
+
+from app.backend.dependencies.menuSolver import SOLVER_BACKENDS, SolverSettings
+from app.backend.dependencies.menuSnapshots import load_menu_snapshot, replay_menu_snapshot
+
+
+def find_snapshots(paths, slowest: int = None) -> list[Path]:
+    """
+    Snapshot directories among `paths` (snapshot directories or directories containing them),
+    optionally only the `slowest` ones by original solve time.
+    """
+    found = []
+    for path in map(Path, paths):
+        if (path / "snapshot.json").exists():
+            found.append(path)
+        elif path.is_dir():
+            found.extend(sorted(p for p in path.iterdir() if (p / "snapshot.json").exists()))
+    if slowest is not None:
+        found.sort(key=lambda p: load_menu_snapshot(p)["result"]["wallTime"], reverse=True)
+        found = found[:slowest]
+    return found
+
+
+def replay_snapshots(snapshots: list[Path], backends=None, time_limit: float = None, mip_gap: float = None,
+                     threads: int = None, start: str = "hint") -> list[dict]:
+    """
+    Solve every snapshot with every backend (default: the snapshot's own backend).
+
+    Limits that are not given are taken from the original solve; `start` is passed to
+    replay_menu_snapshot().
+
+    Returns:
+        One dict per (snapshot, backend) with the original and the replayed outcome
+    """
+    rows = []
+    for path in snapshots:
+        meta = load_menu_snapshot(path)
+        original = meta["settings"]
+        for backend in backends or [original["backend"]]:
+            settings = SolverSettings(
+                backend,
+                time_limit=time_limit if time_limit is not None else original["timeLimit"],
+                mip_gap=mip_gap if mip_gap is not None else original["mipGap"],
+                threads=threads if threads is not None else original["threads"],
+            )
+            result = replay_menu_snapshot(path, settings, start=start)
+            rows.append({
+                "snapshot": path.name,
+                "model": meta["model"],
+                "original": {"backend": original["backend"], **meta["result"]},
+                "replay": {
+                    "backend": backend,
+                    "status": result.status,
+                    "wallTime": result.wall_time,
+                    "objective": result.objective,
+                    "bestBound": result.best_bound,
+                    "gap": result.gap,
+                    "nodes": result.nodes,
+                },
+            })
+    return rows
+
+
+def _number(value, digits: int = 3) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def format_replays(rows: list[dict]) -> str:
+    """Plain-text table of replay_snapshots() results."""
+    lines = [f"{'snapshot':<34} {'vars':>7} {'original':<26} {'replay':<26} {'objective':>21} {'gap':>7} {'nodes':>7}"]
+    for row in rows:
+        original, replay = row["original"], row["replay"]
+        lines.append(
+            f"{row['snapshot']:<34} {row['model']['variables']:>7} "
+            f"{original['backend'] + ' ' + original['status'] + ' ' + _number(original['wallTime'], 2) + 's':<26} "
+            f"{replay['backend'] + ' ' + replay['status'] + ' ' + _number(replay['wallTime'], 2) + 's':<26} "
+            f"{_number(original['objective']) + ' -> ' + _number(replay['objective']):>21} "
+            f"{_number(replay['gap'], 4):>7} {replay['nodes'] if replay['nodes'] is not None else '-':>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay snapshots of slow menu solves.")
+    parser.add_argument("paths", nargs="+", help="snapshot directories, or directories containing snapshots")
+    parser.add_argument("--slowest", type=int, default=None, help="only replay the N slowest snapshots")
+    parser.add_argument("--backends", nargs="+", default=None, choices=SOLVER_BACKENDS,
+                        help="backends to compare (default: each snapshot's own)")
+    parser.add_argument("--time-limit", type=float, default=None, help="solver time limit (s)")
+    parser.add_argument("--mip-gap", type=float, default=None, help="relative MIP gap")
+    parser.add_argument("--threads", type=int, default=None, help="solver threads")
+    parser.add_argument("--start", choices=("hint", "solution", "none"), default="hint",
+                        help="start from the original warm start, the original solution, or cold")
+    parser.add_argument("--json", type=Path, default=None, help="also write the results here")
+    args = parser.parse_args(argv)
+
+    snapshots = find_snapshots(args.paths, args.slowest)
+    if not snapshots:
+        parser.error("no snapshots found")
+    rows = replay_snapshots(snapshots, args.backends, args.time_limit, args.mip_gap, args.threads, args.start)
+    print(format_replays(rows))
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Query-plan benchmark of the per-user lookups: fills a scratch database with synthetic
+users, consumed products, user products and menus, then prints the EXPLAIN plan and the
+median time of each hot query before and after creating the lookup indexes of
+app/backend/migrations/versions/0002_lookup_indexes.py (seq scan -> index scan).
+
+Usage (from the repository root, with DATABASE_URL set; the benchmark never connects to it):
+    python -m app.benchmarks.queryPlans
+    python -m app.benchmarks.queryPlans --users 500 --rows 200 --url postgresql://localhost/scratch
+
+The --url database is written to (tables are created and filled): never point it at the
+API's database.
+"""
+from datetime import datetime, timedelta
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import StaticPool
+
+from app.backend.database import Base
+from app.backend.models.userConsumedProducts import UserConsumedProduct
+from app.backend.models.userMenus import UserMenu
+from app.backend.models.userProducts import UserProduct
+from app.backend.models.users import User
+
+TABLES = [User.__table__, UserConsumedProduct.__table__, UserProduct.__table__, UserMenu.__table__]
+
+# Indexes the benchmark compares against (declared on the models, created by migration 0002)
+LOOKUP_INDEXES = [
+    index for table in TABLES for index in table.indexes
+    if index.name in ("ix_userConsumedProducts_userUuid_date", "ix_userProducts_userUuid_lower_productName",
+                      "ix_userMenu_userUuid_lower_name")
+]
+
+START_DAY = datetime(2025, 1, 1)
+
+
+def hot_queries(userUuid: int) -> dict:
+    """label -> statement, shaped like the services' queries for one user."""
+    today = START_DAY + timedelta(days=180)
+    return {
+        "consumed today": select(UserConsumedProduct).where(
+            UserConsumedProduct.userUuid == userUuid,
+            UserConsumedProduct.date >= today,
+            UserConsumedProduct.date <= today + timedelta(days=1),
+        ),
+        "consumed last 7 days": select(UserConsumedProduct).where(
+            UserConsumedProduct.userUuid == userUuid,
+            UserConsumedProduct.date >= today - timedelta(days=7),
+        ),
+        "user product by name": select(UserProduct).where(
+            UserProduct.userUuid == userUuid,
+            func.lower(UserProduct.productName) == func.lower("PRODUCT 7"),
+        ).limit(1),
+        "user menu by name": select(UserMenu).where(
+            UserMenu.userUuid == userUuid,
+            func.lower(UserMenu.name) == func.lower("MENU 3"),
+        ).limit(1),
+    }
+
+
+def make_plan_db(url: str, users: int, rows: int, seed: int = 0):
+    """
+    Engine of a database holding the benchmark tables without the lookup indexes:
+    `users` users with `rows` consumed products, rows // 4 products and rows // 10 menus each.
+    """
+    if url == "sqlite://":
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    rng = random.Random(seed)
+
+    Base.metadata.drop_all(engine, tables=TABLES)
+    Base.metadata.create_all(engine, tables=TABLES)
+    with engine.begin() as connection:
+        for index in LOOKUP_INDEXES:
+            index.drop(connection)
+
+        connection.execute(insert(User), [
+            dict(uuid=u, username=f"user{u}", email=f"user{u}@example.com", password="-", age=30, gender="F",
+                 weight=60, height=170, bmi=20.8, bmr=1400, activityFactor="1.2", isVegan=False,
+                 isDairyInt=False, isVegetarian=False, emailVerified=True)
+            for u in range(1, users + 1)
+        ])
+        nutrients = dict(amount=100, kcal=200, fat=5, satFat=1, carbs=30, sugar=5, protein=8, dairyProtein=0,
+                         animalProtein=0, plantProtein=8, salt=0.5, cost=0.5)
+        connection.execute(insert(UserConsumedProduct), [
+            dict(id=u * rows + i, userUuid=u, productName=f"Product {i % 50}",
+                 date=START_DAY + timedelta(minutes=rng.randrange(365 * 24 * 60)), **nutrients)
+            for u in range(1, users + 1) for i in range(rows)
+        ])
+        connection.execute(insert(UserProduct), [
+            dict(id=u * rows + i, userUuid=u, productName=f"Product {i}", kcal=200, fat=5, satFat=1, carbs=30,
+                 sugars=5, protein=8, dairyProt=0, animalProt=0, plantProt=8, salt=0, price1kg=5, price100g=0.5,
+                 vegan=True, vegetarian=True, dairyFree=True, URL="")
+            for u in range(1, users + 1) for i in range(max(rows // 4, 1))
+        ])
+        connection.execute(insert(UserMenu), [
+            dict(id=u * rows + i, userUuid=u, name=f"Menu {i}", totalKcal=2000, totalCost=5, totalFat=60,
+                 totalCarbs=250, totalProtein=80, totalDairyProtein=0, totalAnimalProtein=0, totalPlantProtein=80,
+                 totalSugar=50, totalSatFat=15, totalSalt=5, date=START_DAY, plan={}, vegan=False,
+                 vegetarian=False, dairyFree=False)
+            for u in range(1, users + 1) for i in range(max(rows // 10, 1))
+        ])
+        connection.execute(text("ANALYZE"))
+    return engine
+
+
+def create_lookup_indexes(engine):
+    """Create the lookup indexes (as migration 0002 does) and refresh the planner statistics."""
+    with engine.begin() as connection:
+        for index in LOOKUP_INDEXES:
+            index.create(connection)
+        connection.execute(text("ANALYZE"))
+
+
+def explain(connection: Connection, statement) -> list[str]:
+    """Plan lines of a statement (EXPLAIN on PostgreSQL, EXPLAIN QUERY PLAN on SQLite)."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    return [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}")]
+
+
+def uses_index(plan: list[str]) -> bool:
+    """True if the plan reads through an index instead of scanning the whole table."""
+    return any("Index" in line or "USING INDEX" in line or "USING COVERING INDEX" in line for line in plan)
+
+
+def median_ms(connection: Connection, statement, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        connection.execute(statement).all()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def measure(engine, userUuid: int, repeats: int) -> dict:
+    """label -> (plan lines, median ms) of every hot query."""
+    with engine.connect() as connection:
+        return {label: (explain(connection, statement), median_ms(connection, statement, repeats))
+                for label, statement in hot_queries(userUuid).items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare query plans of the per-user lookups without/with indexes.")
+    parser.add_argument("--url", default="sqlite://", help="scratch database URL (default: in-memory SQLite)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200, help="consumed products per user")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    engine = make_plan_db(args.url, args.users, args.rows)
+    print(f"Filled {engine.dialect.name} with {args.users} users x {args.rows} consumed products "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    userUuid = args.users // 2
+    before = measure(engine, userUuid, args.repeats)
+    create_lookup_indexes(engine)
+    after = measure(engine, userUuid, args.repeats)
+
+    for label in before:
+        print(f"\n{label}: {before[label][1]:.2f} ms -> {after[label][1]:.2f} ms")
+        for name, (plan, _) in (("without indexes", before[label]), ("with indexes", after[label])):
+            print(f"  {name}:")
+            for line in plan:
+                print(f"    {line}")
+
+
+if __name__ == "__main__":
+    main()
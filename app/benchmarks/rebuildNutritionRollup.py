@@ -0,0 +1,32 @@
+"""
+Creates and (re)fills the userDailyNutrition rollup from userConsumedProducts (see
+app/backend/dependencies/nutritionRollup.py). Run it once after deploying the rollup, and
+whenever consumed products were changed outside the API.
+
+Usage (from the repository root, with DATABASE_URL set):
+    python -m app.benchmarks.rebuildNutritionRollup
+    python -m app.benchmarks.rebuildNutritionRollup --user 42
+"""
+import argparse
+import time
+
+from app.backend.database import SessionLocal
+from app.backend.dependencies.nutritionRollup import rebuild_rollup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the per-user daily nutrition rollup.")
+    parser.add_argument("--user", type=int, default=None, help="only rebuild this user's days")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rows = rebuild_rollup(db, args.user)
+    finally:
+        db.close()
+    print(f"Wrote {rows} user-day rows in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
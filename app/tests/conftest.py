@@ -0,0 +1,4 @@
+import os
+
+# The app builds its database engines on import; tests use their own databases, so any URL will do
+os.environ.setdefault("DATABASE_URL", "sqlite://")
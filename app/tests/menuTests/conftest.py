@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from app.backend.dependencies.menuModel import MenuModel, MenuProblem, MIN_GRAMS, MIN_PRODUCTS
+
+
+def _calorie_inputs(n: int, price, kcal_min: float) -> tuple:
+    """
+    n products of 100 kcal per 100g priced 1..n per 100g (unless `price` is given) and one
+    calorie row of at least kcal_min: by default the cheapest menu is products 1..MIN_PRODUCTS
+    at MIN_GRAMS each, costing 0.5 * (1 + ... + MIN_PRODUCTS).
+    """
+    price = np.arange(1, n + 1, dtype=np.float64) if price is None else np.asarray(price, dtype=np.float64)
+    return np.full((1, n), 100.0), price, ["calories"], [kcal_min], [np.inf]
+
+
+@pytest.fixture
+def calorie_model():
+    """Factory of MenuModels over the calorie-only inputs; other keyword arguments go to MenuModel."""
+    def make(n: int = 12, price=None, kcal_min: float = MIN_PRODUCTS * MIN_GRAMS, **kwargs) -> MenuModel:
+        return MenuModel(*_calorie_inputs(n, price, kcal_min), **kwargs)
+    return make
+
+
+@pytest.fixture
+def calorie_problem():
+    """Factory of MenuProblems over the calorie-only inputs; other keyword arguments go to MenuProblem."""
+    def make(n: int = 12, price=None, kcal_min: float = MIN_PRODUCTS * MIN_GRAMS, **kwargs) -> MenuProblem:
+        return MenuProblem(*_calorie_inputs(n, price, kcal_min), **kwargs)
+    return make
@@ -0,0 +1,29 @@
+from app.benchmarks.menuBenchmark import CATEGORIES, load_corpus, make_benchmark_db, run_benchmark, synthetic_products
+from app.backend.models.productsProtSep import ProductProtSep
+
+
+def test_synthetic_catalog_has_every_corpus_restriction():
+    db = make_benchmark_db(len(CATEGORIES) * 2)
+    names = {name for (name,) in db.query(ProductProtSep.productName)}
+
+    restricted = {r["product"] for _, request in load_corpus() for r in request.get("restrictions", [])}
+    assert restricted <= names
+    assert len(names) == len(CATEGORIES) * 2
+
+
+def test_synthetic_products_split_protein_by_source():
+    for row in synthetic_products(len(CATEGORIES)):
+        assert row["dairyProt"] + row["animalProt"] + row["plantProt"] == row["protein"]
+        assert not row["vegan"] or (row["vegetarian"] and row["dairyFree"])
+
+
+def test_run_benchmark_reports_percentiles_per_backend():
+    corpus = [entry for entry in load_corpus() if entry[0] in ("omnivore-maintain", "vegan-restricted")]
+
+    summaries = run_benchmark(sizes=[300], backends=["highs"], corpus=corpus, time_limit=10)
+
+    assert [(s["size"], s["backend"]) for s in summaries] == [(300, "highs")]
+    summary = summaries[0]
+    assert sum(summary["statuses"].values()) == 2
+    p50, p95 = summary["solve_ms"]
+    assert 0 < p50 <= p95
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from app.backend.dependencies.menuModel import MenuModel, MenuProblem
+from app.backend.dependencies.menuFrontier import FrontierPoint, FrontierSweep, solve_frontier_point, \
+    solve_frontier_sweep, metric_value, pareto_filter
+
+
+def _problem():
+    rng = np.random.default_rng(5)
+    nutrients = np.vstack([rng.uniform(50, 400, 40), rng.uniform(0, 30, 40)])
+    problem = MenuProblem(nutrients, rng.uniform(0.1, 2.0, 40), ["calories", "sugars"], [2000, 0], [2600, 80])
+    problem.row_target = [2200, 40]
+    return problem
+
+
+@pytest.mark.parametrize("objective", ["sugars", "deviation", "products"])
+def test_epsilon_limit_trades_cost_for_the_second_objective(objective):
+    problem = _problem()
+    sense = -1 if objective == "products" else 1
+
+    cheapest = solve_frontier_point(FrontierPoint(problem, objective))
+    best = solve_frontier_point(FrontierPoint(problem, objective, minimize_metric=True))
+    upper = sense * metric_value(problem, objective, problem.day_grams(cheapest)[0])
+    lower = sense * metric_value(problem, objective, problem.day_grams(best)[0])
+    assert lower < upper
+
+    middle = (lower + upper) / 2
+    problem.hint_grams = problem.day_grams(best)[0]
+    [limited] = solve_frontier_sweep(FrontierSweep(problem, objective, [middle]))
+
+    assert limited.status == "Optimal"
+    assert sense * metric_value(problem, objective, problem.day_grams(limited)[0]) <= middle + 1e-4
+    assert limited.objective >= cheapest.objective - 1e-9
+
+
+
+def test_sweep_builds_once_and_skips_limits_already_met():
+    problem = _problem()
+    cheapest = solve_frontier_point(FrontierPoint(problem, "sugars"))
+    best = solve_frontier_point(FrontierPoint(problem, "sugars", minimize_metric=True))
+    lower = metric_value(problem, "sugars", problem.day_grams(best)[0])
+    upper = metric_value(problem, "sugars", problem.day_grams(cheapest)[0])
+    problem.hint_grams = problem.day_grams(best)[0]
+    epsilons = [lower, (lower + upper) / 2, (lower + upper) / 2, upper - 1e-3]
+
+    with patch.object(MenuProblem, "build", autospec=True, side_effect=MenuProblem.build) as builds, \
+            patch.object(MenuModel, "solve", autospec=True, side_effect=MenuModel.solve) as solves:
+        results = solve_frontier_sweep(FrontierSweep(problem, "sugars", epsilons))
+
+    assert builds.call_count == 1
+    # the repeated limit is answered by the menu of the first one
+    assert solves.call_count == 3 and results[1] is results[2]
+    costs = [r.objective for r in results]
+    assert costs == sorted(costs, reverse=True)
+    for epsilon, result in zip(epsilons, results):
+        single = solve_frontier_sweep(FrontierSweep(problem, "sugars", [epsilon]))[0]
+        assert result.objective == pytest.approx(single.objective, rel=1e-4)
+
+def test_pareto_filter_drops_dominated_points():
+    points = [(1.0, 5.0), (2.0, 3.0), (1.5, 6.0), (3.0, 3.0 - 1e-9), (0.9, 7.0), (4.0, 1.0)]
+
+    assert pareto_filter(points) == [4, 0, 1, 5]
@@ -0,0 +1,44 @@
+import time
+import pytest
+from fastapi import HTTPException
+from app.backend.dependencies.menuJobs import MenuJobQueue
+
+
+def test_job_queue_admission_and_results():
+    queue = MenuJobQueue(workers=1, max_queued=3, max_per_user=2)
+    try:
+        first = queue.submit(1, time.sleep, 0.2, on_result=lambda _: {"status": "Optimal"})
+        queue.submit(1, time.sleep, 0.2, on_result=lambda _: {"status": "Optimal"})
+
+        with pytest.raises(HTTPException) as per_user:
+            queue.submit(1, time.sleep, 0.2, on_result=lambda _: None)
+        assert per_user.value.status_code == 429
+
+        queue.submit(2, time.sleep, 0.2, on_result=lambda _: None)
+        with pytest.raises(HTTPException) as global_limit:
+            queue.submit(3, time.sleep, 0.2, on_result=lambda _: None)
+        assert global_limit.value.status_code == 503
+
+        assert first.done.wait(timeout=30)
+        assert first.status == "done"
+        assert first.result == {"status": "Optimal"}
+        assert queue.get(first.id, 1) is first
+        assert queue.get(first.id, 2) is None  # other users cannot see the job
+    finally:
+        queue.shutdown()
+
+
+def test_batch_is_admitted_as_one_submission():
+    queue = MenuJobQueue(workers=2, max_queued=4, max_per_user=1)
+    try:
+        jobs = queue.submit_many(1, time.sleep, [0.1, 0.1, 0.1], on_results=[lambda _, i=i: {"index": i} for i in range(3)])
+        assert len(jobs) == 3
+
+        with pytest.raises(HTTPException) as too_many:
+            queue.submit_many(2, time.sleep, [0.1, 0.1], on_results=[lambda _: None] * 2)
+        assert too_many.value.status_code == 503  # only one free slot left globally
+
+        assert all(job.done.wait(timeout=30) for job in jobs)
+        assert [job.result for job in jobs] == [{"index": 0}, {"index": 1}, {"index": 2}]
+    finally:
+        queue.shutdown()
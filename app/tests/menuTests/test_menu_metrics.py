@@ -0,0 +1,27 @@
+from prometheus_client import REGISTRY
+from app.backend.dependencies.menuModel import solve_menu_problem
+from app.backend.dependencies.menuMetrics import record_menu_solve, server_timing
+
+
+def test_solve_reports_timings_and_model_size(calorie_problem):
+    problem = calorie_problem()
+
+    result = solve_menu_problem(problem)
+
+    assert result.status == "Optimal"
+    assert set(result.timings) == {"build", "solve"}
+    assert result.model_stats == {"variables": 24, "constraints": 1 + 2 * 12 + 1, "binaries": 12}
+
+
+def test_record_menu_solve_exports_histograms(calorie_problem):
+    problem = calorie_problem(days=3, max_repeats=2)
+    result = solve_menu_problem(problem)
+    before = REGISTRY.get_sample_value("menu_model_binaries_count", {"shape": "coupled"}) or 0
+
+    stats = record_menu_solve(problem, result, {"prepare": 0.002, **result.timings})
+
+    assert stats["shape"] == "coupled"
+    assert stats["binaries"] == 3 * 12
+    assert stats["phases"]["prepare"] == 2.0  # milliseconds
+    assert REGISTRY.get_sample_value("menu_model_binaries_count", {"shape": "coupled"}) == before + 1
+    assert server_timing({"fetch": 1.5, "solve": 20.0}) == "fetch;dur=1.5, solve;dur=20.0"
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from app.backend.dependencies.menuModel import MenuModel, MIN_GRAMS, MIN_PRODUCTS
+
+
+def test_menu_model_picks_cheapest_products_within_bounds(calorie_model):
+    # 12 identical products except price; need 10 products with >= 50g each
+    model = calorie_model()
+    result = model.solve()
+    grams = model.grams(result)
+
+    assert result.status == "Optimal"
+    used = grams > 1e-6
+    assert used.sum() == MIN_PRODUCTS
+    assert not used[-2:].any()  # the two most expensive products are skipped
+    assert np.all(grams[used] >= MIN_GRAMS - 1e-6)
+
+
+def test_menu_model_excluded_product_is_not_used(calorie_model):
+    used_upper = np.ones(11)
+    used_upper[0] = 0
+
+    model = calorie_model(11, price=np.ones(11), grams_upper=np.where(used_upper > 0, 400.0, 0.0), used_upper=used_upper)
+    result = model.solve()
+
+    assert result.status == "Optimal"
+    assert model.grams(result)[0] == 0
+
+
+def test_uncoupled_days_repeat_the_single_day_optimum(calorie_model):
+    model = calorie_model(days=7, budget=1000)
+    result = model.solve()
+    grams = model.day_grams(result)
+
+    assert model.model_days == 1
+    assert result.status == "Optimal"
+    assert result.objective == pytest.approx(7 * 0.5 * 55, abs=1e-3)
+    assert grams.shape == (7, 12)
+    assert np.allclose(grams, grams[0])
+
+
+def test_max_repeats_couples_days(calorie_model):
+    model = calorie_model(25, days=2, max_repeats=1)
+    result = model.solve()
+    used = model.day_grams(result) > 1e-6
+
+    assert model.helper.num_constraints() == model.num_rows
+    assert result.status == "Optimal"
+    assert used.sum(axis=1).tolist() == [MIN_PRODUCTS, MIN_PRODUCTS]
+    assert used.sum(axis=0).max() == 1  # no product on both days
+    assert result.objective == pytest.approx(0.5 * sum(range(1, 21)), abs=1e-3)
+
+
+def test_relaxation_bounds_the_menu_cost():
+    rng = np.random.default_rng(3)
+    nutrients = np.vstack([rng.uniform(50, 400, 60), rng.uniform(0, 25, 60)])
+    price = rng.uniform(0.1, 2.0, 60)
+    rows = (["calories", "protein"], [2000, 80], [2600, 160])
+
+    menu = MenuModel(nutrients, price, *rows).solve()
+    relaxed_model = MenuModel(nutrients, price, *rows, relax=True)
+    relaxed = relaxed_model.solve()
+
+    assert relaxed_model.num_rows == relaxed_model.helper.num_constraints()
+    assert menu.status == relaxed.status == "Optimal"
+    assert relaxed.objective <= menu.objective + 1e-9
+
+
+def test_infeasible_relaxation_proves_the_menu_infeasible(calorie_model):
+    # 12 products of 100 kcal / 100g, at most 400g each: 4800 kcal at most
+    relaxed = calorie_model(price=np.ones(12), kcal_min=12 * 400 + 1, relax=True).solve()
+
+    assert relaxed.status == "Infeasible"
+
+
+@pytest.mark.parametrize("relax", [False, True])
+def test_diagnose_reports_the_conflicting_bound(relax):
+    rng = np.random.default_rng(3)
+    nutrients = np.vstack([rng.uniform(50, 400, 60), rng.uniform(0, 25, 60)])
+    price = rng.uniform(0.1, 2.0, 60)
+    # 2000 kcal cannot come with at most 10g of protein
+    model = MenuModel(nutrients, price, ["calories", "protein"], [2000, 0], [2600, 10], relax=relax)
+
+    assert model.solve().status == "Infeasible"
+    conflicts = model.diagnose()
+
+    assert [c["constraint"] for c in conflicts] == ["proteinMax"]
+    fixed = MenuModel(nutrients, price, ["calories", "protein"], [2000, 0], [2600, conflicts[0]["suggested"] + 1e-6],
+                      relax=relax)
+    assert fixed.solve().status == "Optimal"
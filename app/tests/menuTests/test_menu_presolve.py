@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from app.backend.dependencies.menuModel import MenuModel, MAX_GRAMS, MIN_PRODUCTS
+from app.backend.dependencies.menuPresolve import presolve_menu_products
+
+
+def _catalog(seed=0):
+    # kcal / protein / salt per 100g: 15 distinct profiles, each sold 12 times at different prices,
+    # plus 5 very salty products of which a 50g portion already exceeds the salt limit
+    rng = np.random.default_rng(seed)
+    profiles = np.vstack([rng.uniform(50, 400, 15), rng.uniform(0, 25, 15), rng.uniform(0, 1, 15)])
+    salty = np.vstack([rng.uniform(50, 400, 5), rng.uniform(0, 25, 5), np.full(5, 20.0)])
+    nutrients = np.hstack([np.repeat(profiles, 12, axis=1), salty])
+    price = rng.uniform(0.1, 2.0, nutrients.shape[1])
+    rows = (["calories", "protein", "salt"], [2000, 80, 0], [2600, 160, 6])
+    return nutrients, price, rows
+
+
+def _bounds(n):
+    return np.zeros(n), np.full(n, float(MAX_GRAMS)), np.ones(n)
+
+
+@pytest.mark.parametrize("days, max_repeats", [(1, None), (3, 1)])
+def test_presolve_keeps_the_optimal_cost(days, max_repeats):
+    nutrients, price, (names, lower, upper) = _catalog()
+    grams_lower, grams_upper, used_upper = _bounds(nutrients.shape[1])
+
+    keep, stats = presolve_menu_products(nutrients, price, upper, grams_lower, grams_upper, used_upper,
+                                         days=days, max_repeats=max_repeats)
+    full = MenuModel(nutrients, price, names, lower, upper, days=days, max_repeats=max_repeats).solve()
+    reduced = MenuModel(nutrients[:, keep], price[keep], names, lower, upper,
+                        days=days, max_repeats=max_repeats).solve()
+
+    assert stats.unusable == 5
+    # Coupled days may need a different copy on every day, so 12 copies are not enough to prune
+    assert (stats.dominated > 0) == (max_repeats is None)
+    assert stats.removed == stats.fixed + stats.unusable + stats.dominated
+    assert full.status == reduced.status == "Optimal"
+    assert reduced.objective == pytest.approx(full.objective, rel=1e-6)
+
+
+def test_presolve_never_drops_protected_or_the_cheapest_duplicates():
+    # 12 copies of one product: 50g portions have 200 kcal, so at most 6 fit under 1200 kcal
+    nutrients = np.full((1, 12), 400.0)
+    price = np.arange(12, 0, -1, dtype=np.float64)
+    grams_lower, grams_upper, used_upper = _bounds(12)
+    used_upper[5] = 0
+    protected = np.zeros(12, dtype=bool)
+    protected[0] = True
+
+    keep, stats = presolve_menu_products(nutrients, price, [1200], grams_lower, grams_upper, used_upper,
+                                         protected=protected)
+
+    # products 6..11 are the 6 cheapest that are not excluded; 0 is protected
+    assert keep.tolist() == [0] + list(range(12 - 6, 12))
+    assert (stats.fixed, stats.unusable, stats.dominated) == (1, 0, 4)
+
+
+def test_presolve_caps_products_without_nutrients_at_min_products():
+    nutrients = np.zeros((2, MIN_PRODUCTS + 5))
+    price = np.linspace(1, 2, MIN_PRODUCTS + 5)
+
+    keep, stats = presolve_menu_products(nutrients, price, [100, 100], *_bounds(MIN_PRODUCTS + 5))
+
+    assert keep.tolist() == list(range(MIN_PRODUCTS))
+    assert stats.dominated == 5
@@ -0,0 +1,40 @@
+from unittest.mock import patch
+from app.backend.dependencies import menuResultCache
+from app.backend.dependencies.menuResultCache import MenuResultCache, menu_request_key
+from app.backend.dependencies.menuSolver import SolverSettings
+from app.backend.schemas.requests.dietRequest import DietRequest
+
+
+def _request(**extra):
+    values = dict(kcal=2200, protein=120, fat=70, satFat=20, carbs=250, sugars=40, salt=6)
+    values.update(extra)
+    return DietRequest(**values)
+
+
+def test_request_key_is_canonical():
+    settings = SolverSettings(backend="highs")
+    a = _request(restrictions=[{"type": "exclude", "product": "Milk"}, {"type": "max_weight", "product": "Oats", "value": 100}])
+    b = _request(kcal=2200.02, warmStart=True,
+                 restrictions=[{"type": "max_weight", "product": " oats ", "value": 100.0}, {"type": "exclude", "product": "milk"}])
+
+    assert menu_request_key(a, settings, "p1") == menu_request_key(b, settings, "p1")
+    assert menu_request_key(a, settings, "p1") != menu_request_key(a, settings, "p2")
+    assert menu_request_key(a, settings, "p1") != menu_request_key(a, SolverSettings(backend="cbc"), "p1")
+
+
+def test_lru_ttl_and_sqlite_sharing(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = MenuResultCache(max_entries=2, ttl=60, sqlite_path=path)
+    cache.put("a", {"status": "Optimal"})
+    cache.put("b", {"status": "Optimal"})
+    cache.get("a")
+    cache.put("c", {"status": "Optimal"})
+    assert list(cache.entries) == ["a", "c"]  # "b" was least recently used
+
+    # another process sharing the SQLite file sees every entry
+    other = MenuResultCache(max_entries=2, ttl=60, sqlite_path=path)
+    assert other.get("b") == {"status": "Optimal"}
+
+    with patch.object(menuResultCache.time, "time", return_value=menuResultCache.time.time() + 61):
+        assert cache.get("a") is None
+        assert other.get("b") is None
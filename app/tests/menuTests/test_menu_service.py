@@ -0,0 +1,89 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app.benchmarks.menuBenchmark import BENCHMARK_USER, load_corpus, make_benchmark_db
+from app.backend.dependencies import menuSolver
+from app.backend.dependencies.menuMetrics import server_timing
+from app.backend.dependencies.menuResultCache import get_menu_result_cache
+from app.backend.dependencies.menuWarmStart import get_warm_start_plan
+from app.backend.schemas.requests.dietRequest import DietRequest
+from app.backend.services.menuService import generate_diet_menu, prepare_diet_menu
+
+
+@pytest.fixture
+def db():
+    get_menu_result_cache().clear()
+    session = make_benchmark_db(300)
+    yield session
+    session.close()
+    get_menu_result_cache().clear()
+
+
+def _request(**extra):
+    fields = dict(load_corpus())["omnivore-maintain"]
+    return DietRequest(**{**fields, "timeLimit": 10, **extra})
+
+
+def test_warm_start_runs_on_a_backend_that_uses_the_hint(db):
+    first = generate_diet_menu(db, _request(), BENCHMARK_USER)
+    assert first.status == "Optimal"
+    previous = get_warm_start_plan(db, BENCHMARK_USER)
+    get_menu_result_cache().clear()
+
+    solves = []
+    solve = menuSolver.solve
+
+    def spy(model, settings=None, hint=None):
+        solves.append((settings.backend, hint))
+        return solve(model, settings, hint)
+
+    with patch.object(menuSolver, "solve", spy):
+        second = generate_diet_menu(db, _request(warmStart=True), BENCHMARK_USER)
+
+    assert second.status == "Optimal"
+    assert second.totalCost == pytest.approx(first.totalCost, rel=1e-3)
+    [(backend, hint)] = solves
+    assert backend == menuSolver.WARM_START_BACKEND and backend in menuSolver.HINT_BACKENDS
+    # the hint starts from the previous plan: one "used" indicator per product of that plan
+    assert hint is not None and int(np.sum(hint[len(hint) // 2:])) == len(previous)
+
+
+def test_warm_start_with_highs_is_rejected(db):
+    with pytest.raises(HTTPException) as error:
+        prepare_diet_menu(db, _request(warmStart=True, solver="highs"), BENCHMARK_USER)
+    assert error.value.status_code == 400
+
+
+def test_cached_multi_day_menu_remembers_the_first_day(db):
+    request = _request(days=2)
+    first = generate_diet_menu(db, request, BENCHMARK_USER)
+    assert first.status == "Optimal" and len(first.days) == 2
+    day_one = get_warm_start_plan(db, BENCHMARK_USER)
+
+    generate_diet_menu(db, _request(), BENCHMARK_USER)  # a different plan becomes the warm start
+    cached = prepare_diet_menu(db, request, BENCHMARK_USER)
+
+    assert cached.days == first.days
+    assert get_warm_start_plan(db, BENCHMARK_USER) == day_one
+
+
+def test_preview_is_not_answered_from_the_result_cache(db):
+    full = generate_diet_menu(db, _request(), BENCHMARK_USER)
+    assert full.status == "Optimal"
+
+    preview = prepare_diet_menu(db, _request(mode="preview"), BENCHMARK_USER)
+
+    # a preview comes from the LP relaxation (with a cost bound), never from the cached full menu
+    assert preview.costBound is not None and preview.costBound <= full.totalCost + 1e-6
+
+
+def test_cached_menu_reports_debug_timings(db):
+    generate_diet_menu(db, _request(), BENCHMARK_USER)
+
+    cached = prepare_diet_menu(db, _request(debug=True), BENCHMARK_USER)
+
+    assert cached.status == "Optimal"
+    assert cached.debug.status == "Cached" and cached.debug.shape == "cached"
+    assert list(cached.debug.phases)[-1] == "cache"
+    assert server_timing(cached.debug.phases).startswith("fetch;dur=")
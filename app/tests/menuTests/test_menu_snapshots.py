@@ -0,0 +1,35 @@
+import numpy as np
+from app.backend.dependencies.menuModel import solve_menu_problem
+from app.backend.dependencies.menuSnapshots import load_menu_snapshot, replay_menu_snapshot, save_menu_snapshot, _prune_snapshots
+from app.backend.dependencies.menuSolver import SolverSettings
+
+
+def test_replay_reproduces_the_original_solve(tmp_path, calorie_problem):
+    problem = calorie_problem(20, days=3, max_repeats=2, settings=SolverSettings("highs"))
+    result = solve_menu_problem(problem)
+
+    path = save_menu_snapshot(problem, result, userUuid=7, directory=tmp_path)
+
+    meta = load_menu_snapshot(path)
+    assert meta["userUuid"] == 7 and meta["days"] == 3 and meta["modelDays"] == 3
+    assert meta["settings"]["backend"] == "highs"
+    assert meta["model"] == result.model_stats
+    assert (path / "model.mps").exists() and (path / "solution.npy").exists()
+
+    for backend in ("highs", "cbc"):
+        replay = replay_menu_snapshot(path, SolverSettings(backend), start="solution")
+        assert replay.status == "Optimal"
+        assert np.isclose(replay.objective, result.objective)
+        # Values come back in the original model order: [x days..., y days...]
+        assert np.isclose(replay.values[:60] @ np.tile(problem.price100g, 3) / 100, result.objective)
+
+
+def test_old_snapshots_are_pruned(tmp_path, calorie_problem):
+    problem = calorie_problem(20, settings=SolverSettings("highs"))
+    result = solve_menu_problem(problem)
+    for _ in range(3):
+        save_menu_snapshot(problem, result, userUuid=1, directory=tmp_path)
+
+    _prune_snapshots(tmp_path, keep=2)
+
+    assert len(list(tmp_path.iterdir())) == 2
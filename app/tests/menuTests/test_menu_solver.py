@@ -0,0 +1,95 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app.backend.dependencies import menuSolver
+from app.backend.dependencies.menuModel import MIN_GRAMS, MIN_PRODUCTS
+from app.backend.dependencies.menuSolver import SolverSettings, SOLVER_BACKENDS, DEFAULT_TIME_LIMIT, MAX_MIP_GAP, \
+    MAX_THREADS, MAX_TIME_LIMIT
+from app.backend.schemas.requests.dietRequest import DietRequest
+
+
+@pytest.mark.parametrize("backend", SOLVER_BACKENDS)
+def test_backends_agree_on_the_same_model(backend, calorie_model):
+    model = calorie_model()
+
+    result = model.solve(SolverSettings(backend=backend, time_limit=10))
+
+    assert result.status == "Optimal"
+    assert result.backend == backend
+    # cheapest 10 products at the minimum portion: 50g * (1 + ... + 10) / 100
+    assert result.objective == pytest.approx(0.5 * 55, abs=1e-4)
+    assert np.flatnonzero(model.grams(result) > 1e-6).tolist() == list(range(MIN_PRODUCTS))
+    assert np.allclose(model.grams(result)[:MIN_PRODUCTS], MIN_GRAMS, atol=1e-4)
+
+
+@pytest.mark.parametrize("backend", SOLVER_BACKENDS)
+def test_warm_start_hint_is_accepted(backend, calorie_model):
+    model = calorie_model()
+
+    # previous plan used the 10 most expensive products (and one below MIN_GRAMS)
+    hint = model.hint_from_grams([0, 0] + [20] + [80] * 9)
+    result = model.solve(SolverSettings(backend=backend, time_limit=10), hint=hint)
+
+    assert hint[2] == MIN_GRAMS and hint[12 + 2] == 1
+    assert result.status == "Optimal"
+    assert result.objective == pytest.approx(0.5 * 55, abs=1e-4)
+
+
+def test_cbc_starts_from_the_hint(calorie_model):
+    model = calorie_model()
+    hint = model.hint_from_grams([0, 0] + [MIN_GRAMS] * 10)
+
+    logs = []
+    run = menuSolver.subprocess.run
+
+    def logged_run(*args, **kwargs):
+        completed = run(*args, **kwargs)
+        logs.append(completed.stdout)
+        return completed
+
+    with patch.object(menuSolver.subprocess, "run", logged_run):
+        result = model.solve(SolverSettings(backend="cbc", time_limit=10), hint=hint)
+
+    # the hinted plan (products 3..12 at 50g) is CBC's first incumbent, then improved on
+    assert "MIPStart provided solution with cost 37.5" in logs[0]
+    assert result.objective == pytest.approx(0.5 * 55, abs=1e-4)
+
+
+def test_cbc_file_that_is_not_the_incumbent_is_no_solution(calorie_model):
+    model = calorie_model()
+
+    def stopped_run(args, **kwargs):
+        # a time-limit stop whose solution file disagrees with the incumbent in the log
+        with open(args[args.index("-solu") + 1], "w") as f:
+            f.write("Stopped on time - objective value 1.00000000\n      0 V00000  100  0\n")
+        return menuSolver.subprocess.CompletedProcess(args, 0, stdout="Objective value:                30.00000000\n")
+
+    with patch.object(menuSolver.subprocess, "run", stopped_run):
+        result = model.solve(SolverSettings(backend="cbc", time_limit=10))
+
+    assert result.status == "Not Solved" and not result.has_solution
+
+def test_settings_validation_and_caps():
+    with pytest.raises(ValueError):
+        SolverSettings(backend="gurobi")
+
+    settings = SolverSettings(backend="HiGHS", threads=10_000, mip_gap=-1)
+    assert settings.backend == "highs"
+    assert settings.threads == MAX_THREADS
+    assert settings.mip_gap == 0.0
+
+    settings = SolverSettings(time_limit=-5, mip_gap=3, threads=0)
+    assert settings.time_limit == DEFAULT_TIME_LIMIT
+    assert settings.mip_gap == MAX_MIP_GAP
+    assert settings.threads == 1
+    assert SolverSettings(time_limit=1e9).time_limit == MAX_TIME_LIMIT
+
+
+@pytest.mark.parametrize("override", [{"timeLimit": 0}, {"timeLimit": -1}, {"mipGap": -0.1}, {"mipGap": 1},
+                                      {"threads": 0}])
+def test_request_rejects_out_of_range_solver_overrides(override):
+    targets = dict(kcal=2000, protein=80, fat=60, satFat=20, carbs=250, sugars=50, salt=5)
+    DietRequest(**targets, timeLimit=5, mipGap=0.01, threads=2)
+    with pytest.raises(ValidationError):
+        DietRequest(**targets, **override)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, insert, null, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+from app.benchmarks.menuBenchmark import make_benchmark_db, synthetic_products
+from app.backend.dependencies.catalogExport import export_formats, load_catalog_cache, read_export_columns, write_export
+from app.backend.dependencies.productCatalog import ProductCatalog
+from app.backend.models.productsProtSep import ProductProtSep
+
+
+@pytest.mark.parametrize("fmt", export_formats())
+def test_export_loads_back_as_the_same_catalog(tmp_path, fmt):
+    db = make_benchmark_db(120)
+    path = tmp_path / f"catalog.{fmt}"
+
+    write_export(db, "productsProtSep", fmt, path, batch_size=50)
+    catalog = load_catalog_cache(path)
+
+    expected = ProductCatalog.load(db)
+    assert catalog.digest == expected.digest
+    assert catalog.products == expected.products
+
+
+def test_npz_export_is_memory_mapped_and_readable_by_numpy(tmp_path):
+    db = make_benchmark_db(60)
+    path = tmp_path / "catalog.npz"
+    write_export(db, "productsProtSep", "npz", path, batch_size=25)
+
+    columns = read_export_columns(path)
+    assert isinstance(columns["price100g"], np.memmap)
+    assert columns["productName"] == list(ProductCatalog.load(db).names)
+    with np.load(path) as archive:
+        assert np.array_equal(archive["kcal"], columns["kcal"])
+
+
+def _db_with_nulls(path):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        # Older databases have nullable nutrient columns; the model declares them NOT NULL
+        connection.exec_driver_sql(str(CreateTable(ProductProtSep.__table__).compile(engine)).replace(" NOT NULL", ""))
+    db = sessionmaker(bind=engine)()
+    db.execute(insert(ProductProtSep), synthetic_products(40))
+    db.execute(update(ProductProtSep).where(ProductProtSep.id == 4).values(kcal=null(), fat=null(), vegan=null()))
+    db.commit()
+    return db
+
+
+@pytest.mark.parametrize("fmt", export_formats())
+def test_nulls_are_kept_in_arrow_and_parquet_and_read_as_zero_by_the_catalog(tmp_path, fmt):
+    db = _db_with_nulls(tmp_path / "products.db")
+    path = tmp_path / f"catalog.{fmt}"
+    write_export(db, "productsProtSep", fmt, path, batch_size=16)
+
+    columns = read_export_columns(path)
+    catalog = load_catalog_cache(path)
+
+    expected = [None, None, None] if fmt != "npz" else [0, 0.0, False]
+    assert [columns[name][3] for name in ("kcal", "fat", "vegan")] == expected
+    assert columns["kcal"][4] is not None
+    assert catalog.columns["kcal"][3] == 0 and catalog.columns["fat"][3] == 0 and not catalog.flags["vegan"][3]
+    assert catalog.digest == ProductCatalog.load(db).digest
+
+
+def test_load_catalog_cache_rejects_other_tables(tmp_path):
+    path = tmp_path / "products.npz"
+    np.savez(path, id=np.arange(3))
+
+    with pytest.raises(ValueError):
+        load_catalog_cache(path)
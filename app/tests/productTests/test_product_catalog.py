@@ -0,0 +1,71 @@
+import numpy as np
+from unittest.mock import patch
+from app.backend.dependencies import productCatalog
+from app.backend.dependencies.productCatalog import ProductCatalog, CatalogProduct, get_product_catalog, invalidate_product_catalog
+
+
+def _row(id, name, kcal, vegan=False, vegetarian=False, dairyFree=False):
+    values = dict.fromkeys(CatalogProduct._fields, 0)
+    values.update(id=id, productName=name, kcal=kcal, price100g=1.5, vegan=vegan, vegetarian=vegetarian, dairyFree=dairyFree)
+    return tuple(values[f] for f in CatalogProduct._fields)
+
+
+def test_catalog_columns_and_masks():
+    catalog = ProductCatalog.from_rows([_row(1, "Oats", 380, vegan=True, dairyFree=True), _row(2, "Milk", 60, vegetarian=True)])
+
+    assert len(catalog) == 2
+    assert catalog.ids.tolist() == [1, 2]
+    assert catalog.columns["kcal"].tolist() == [380.0, 60.0]
+    assert catalog.flags["vegan"].tolist() == [True, False]
+    assert catalog.flags["dairyFree"].tolist() == [True, False]
+    assert catalog.product_dicts[1]["productName"] == "Milk"
+    assert not catalog.columns["kcal"].flags.writeable
+
+
+def test_reload_keeps_version_when_content_unchanged():
+    rows = [_row(1, "Oats", 380)]
+    with patch.object(productCatalog, "_catalog", None), \
+            patch.object(ProductCatalog, "load", side_effect=lambda db, version: ProductCatalog.from_rows(rows, version)):
+        first = get_product_catalog(db=None)
+        invalidate_product_catalog()
+        assert get_product_catalog(db=None) is first
+
+        rows = [_row(1, "Oats", 390)]
+        invalidate_product_catalog()
+        second = get_product_catalog(db=None)
+        assert second.version == first.version + 1
+        assert np.array_equal(second.columns["kcal"], [390.0])
+
+
+def test_diet_mask_and_dedup_across_user_products():
+    catalog = ProductCatalog.from_rows([
+        _row(1, "Oats", 380, vegan=True, vegetarian=True, dairyFree=True),
+        _row(2, "Milk", 60, vegetarian=True),
+        _row(3, "Chicken", 165, dairyFree=True),
+    ])
+    user = ProductCatalog.from_rows([_row(1, " oats ", 380, vegan=True, vegetarian=True, dairyFree=True),
+                                     _row(2, "Tofu", 76, vegan=True, vegetarian=True, dairyFree=True)])
+
+    combined = catalog.concat(user)
+
+    assert combined.unique_indices().tolist() == [0, 1, 2, 4]
+    assert np.flatnonzero(combined.diet_mask(vegetarian=True)).tolist() == [0, 1, 3, 4]
+    assert np.flatnonzero(combined.diet_mask(dairyFree=True)).tolist() == [0, 2, 3, 4]
+    assert np.flatnonzero(combined.diet_mask(vegan=True, dairyFree=True)).tolist() == [0, 3, 4]
+
+
+def test_name_lookup_and_suggestions():
+    catalog = ProductCatalog.from_rows([_row(1, "Oats", 380), _row(2, "Milk", 60), _row(3, "OATS ", 370)])
+    combined = catalog.concat(ProductCatalog.from_rows([_row(1, "oats", 380), _row(2, "Tofu", 76)]))
+
+    assert catalog.lookup(" oats").tolist() == [0, 2]
+    assert combined.lookup("Oats").tolist() == [0, 2, 3]
+    # The index derived in concat() matches one built from scratch
+    rebuilt = ProductCatalog.from_rows([tuple(p) for p in combined.products]).name_index
+    assert {k: v.tolist() for k, v in combined.name_index.items()} == {k: v.tolist() for k, v in rebuilt.items()}
+    # Positions within a filtered, sorted index array
+    assert combined.lookup("oats", within=np.array([1, 2, 4])).tolist() == [1]
+    assert combined.lookup("bread", within=np.array([1, 2])).tolist() == []
+
+    assert combined.suggest_names("tofuu") == ["Tofu"]
+    assert combined.suggest_names("oat", within=np.array([1, 4])) == []
@@ -0,0 +1,73 @@
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import jwt
+from app.backend.main import app
+from app.backend.dependencies.getUserUuidFromToken import _JWT_SECRET, _JWT_ALG
+from app.backend.dependencies.productCatalog import ProductCatalog, CatalogProduct
+
+client = TestClient(app, cookies={"access_token": jwt.encode({"sub": "1", "typ": "access"}, _JWT_SECRET, algorithm=_JWT_ALG)})
+
+
+def _catalog(kcal_by_id):
+    rows = []
+    for id, kcal in kcal_by_id.items():
+        values = dict.fromkeys(CatalogProduct._fields, 0)
+        values.update(id=id, productName=f"Product {id}", kcal=kcal, price100g=id / 10)
+        rows.append(tuple(values[f] for f in CatalogProduct._fields))
+    return ProductCatalog.from_rows(rows)
+
+
+def _get(catalog, path="/products/getAllProducts", headers=None, **params):
+    with patch("app.backend.services.productService.get_product_catalog", return_value=catalog):
+        return client.get(path, params=params, headers=headers or {})
+
+
+def test_cursor_pages_cover_filtered_sorted_products_once():
+    catalog = _catalog({1: 300, 2: 100, 3: 300, 4: 50, 5: 200, 6: 300, 7: 900})
+    seen, cursor = [], None
+    while True:
+        params = {"sort": "-kcal", "limit": 2, "range": "kcal:100:", "fields": "id,kcal"}
+        if cursor:
+            params["cursor"] = cursor
+        body = _get(catalog, **params).json()
+        assert body["total"] == 6
+        seen += body["products"]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            break
+
+    assert seen == [{"id": 7, "kcal": 900}, {"id": 6, "kcal": 300}, {"id": 3, "kcal": 300},
+                    {"id": 1, "kcal": 300}, {"id": 5, "kcal": 200}, {"id": 2, "kcal": 100}]
+
+
+def test_unchanged_catalog_revalidates_with_304():
+    catalog = _catalog({1: 100, 2: 200})
+
+    first = _get(catalog)
+    assert first.status_code == 200 and len(first.json()["products"]) == 2
+    etag = first.headers["ETag"]
+
+    assert _get(catalog, headers={"If-None-Match": etag}).status_code == 304
+    # Another query or changed content is another representation
+    assert _get(catalog, fields="productName", headers={"If-None-Match": etag}).status_code == 200
+    assert _get(_catalog({1: 100, 2: 250}), headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_invalid_listing_parameters_are_rejected():
+    catalog = _catalog({1: 100})
+
+    assert _get(catalog, fields="kcal,nope").status_code == 400
+    assert _get(catalog, sort="vegan").status_code == 400
+    assert _get(catalog, range="kcal:abc:").status_code == 400
+    assert _get(catalog, cursor="bm9wZQ").status_code == 400
+    # Cursors are bound to their sort field
+    cursor = _get(_catalog({1: 100, 2: 200}), sort="kcal", limit=1).json()["nextCursor"]
+    assert _get(catalog, sort="productName", cursor=cursor).status_code == 400
+
+
+def test_show_products_renders_one_page():
+    response = _get(_catalog({1: 100, 2: 200, 3: 300}), path="/products/showProducts", limit=2)
+
+    assert response.status_code == 200 and response.headers["ETag"]
+    assert "Product 2" in response.text and "Product 3" not in response.text
+    assert "Next page" in response.text
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+from sqlalchemy import update
+from app.benchmarks.menuBenchmark import BENCHMARK_USER, make_benchmark_db
+from app.backend.dependencies import productSearch
+from app.backend.dependencies.productSearch import NameSearchIndex, fold_name, get_user_search_index, \
+    merge_search_results
+from app.backend.models.userProducts import UserProduct
+
+
+def _names(matches):
+    return [name for _, _, name in matches]
+
+
+def test_fold_name_removes_latvian_diacritics():
+    assert fold_name("  Piens ĶEFĪRS  2,5% ") == "piens kefirs 2,5%"
+    assert fold_name("Šokolāde ar zemeņu gabaliņiem") == "sokolade ar zemenu gabaliniem"
+    assert fold_name("Crème brûlée") == "creme brulee"
+
+
+def test_search_ranks_name_prefix_then_word_prefix_then_fuzzy():
+    index = NameSearchIndex(["Zaļie zirņi", "Zirņu zupa", "Ķiploki", "Sīpoli", "Zirgu gaļa"])
+
+    assert _names(index.search("zir")) == ["Zirgu gaļa", "Zirņu zupa", "Zaļie zirņi"]
+    assert _names(index.search("ķip")) == ["Ķiploki"] == _names(index.search("kip"))
+    # A typo still finds the name through shared trigrams
+    assert _names(index.search("kiplki"))[0] == "Ķiploki"
+    assert index.search("zir", limit=1)[0][2] == "Zirgu gaļa"
+    assert index.search("   ") == []
+
+
+def test_incremental_updates_and_sync():
+    index = NameSearchIndex(["Siers", "Siers"], version=1)
+
+    index.remove(["Siers"])
+    assert _names(index.search("sie")) == ["Siers"]
+    index.remove(["Siers"])
+    assert index.search("sie") == []
+    index.add(["Siers", "Sieriņš"])
+    assert _names(index.search("sie")) == ["Sieriņš", "Siers"]
+
+    index.sync(["Sieriņš", "Maize"], version=2)
+    assert index.version == 2 and len(index) == 2
+    assert _names(index.search("sie")) == ["Sieriņš"]
+    assert _names(index.search("mai")) == ["Maize"]
+
+
+def test_merge_prefers_earlier_index_and_drops_folded_duplicates():
+    own = NameSearchIndex(["Mans siers"]).search("siers")
+    shared = NameSearchIndex(["Siers", "Mans Siers"]).search("siers")
+
+    assert merge_search_results([own, shared]) == ["Siers", "Mans siers"]
+
+
+def test_user_index_follows_changes_made_by_other_processes():
+    db = make_benchmark_db(10)
+    assert _names(get_user_search_index(db, BENCHMARK_USER).search("ke")) == ["Kefīrs"]
+
+    # Written directly, as another worker would: this process's cached index is not told
+    db.add(UserProduct(id=3, userUuid=BENCHMARK_USER, productName="Kefīra kokteilis", kcal=70, fat=1, satFat=1,
+                       carbs=10, sugars=9, protein=3, salt=0, price1kg=2, price100g=0.2))
+    db.commit()
+    assert _names(get_user_search_index(db, BENCHMARK_USER).search("ke")) == ["Kefīra kokteilis", "Kefīrs"]
+
+    # A rename keeps the products version; it shows up once the index is older than the TTL
+    db.execute(update(UserProduct).where(UserProduct.id == 2).values(productName="Rūgušpiens"))
+    db.commit()
+    assert _names(get_user_search_index(db, BENCHMARK_USER).search("rug")) == []
+    with patch.object(productSearch, "USER_SEARCH_TTL_SECONDS", 0):
+        assert _names(get_user_search_index(db, BENCHMARK_USER).search("rug")) == ["Rūgušpiens"]
@@ -0,0 +1,101 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateTable
+from app.backend.database import Base
+from app.backend.dependencies.productCatalog import CatalogProduct, ProductCatalog
+from app.backend.models.userConsumedProducts import UserConsumedProduct
+from app.backend.models.userDailyNutrition import UserDailyNutrition
+from app.backend.models.userProducts import UserProduct
+from app.backend.models.users import User
+from app.backend.schemas.requests.deleteConsumedProductRequest import DeleteConsumedProductRequest
+from app.backend.schemas.requests.getConsumedProductByDateRequest import GetConsumedProductByDateRequest
+from app.backend.schemas.requests.getUserStatisticsByDateRequest import GetUserStatisticsByDateRequest
+from app.backend.schemas.requests.postUserConsumedProductRequest import PostUserConsumedProductRequest
+from app.backend.services.consumedProductService import add_consumed_product_async, delete_consumed_product_async, \
+    get_consumed_by_date_async
+from app.backend.services.profileService import calculated_nutrition_info_async, get_user_profile_data_async
+from app.backend.services.statisticsService import get_average_by_date_async
+from app.backend.services.userProductService import get_user_products_names_async
+
+DAY = datetime(2025, 3, 1, 12)
+
+
+def _create_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        # SQLite only autoincrements INTEGER keys; the API inserts consumed products without ids
+        connection.exec_driver_sql(str(CreateTable(UserConsumedProduct.__table__).compile(engine))
+                                   .replace("id BIGINT NOT NULL", "id INTEGER NOT NULL"))
+    Base.metadata.create_all(engine, tables=[User.__table__, UserProduct.__table__, UserDailyNutrition.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add(User(uuid=1, username="anna", email="anna@example.com", password="-", age=30, gender="FEMALE", weight=60,
+                height=170, bmi=20.8, bmr=1350, calculatedKcal=1900, calculatedCarbs=230, calculatedProtein=110,
+                calculatedFat=60, calculatedSatFat=27, calculatedSugar=41, calculatedSalt=2500, activityFactor="LIGHT",
+                isVegan=False, isDairyInt=False, isVegetarian=True))
+    db.add(UserProduct(id=1, userUuid=1, productName="Mājas Granola", kcal=450, fat=18, satFat=4, carbs=60, sugars=20,
+                       protein=10, plantProt=10, salt=0, price1kg=6, price100g=0.6, vegan=True, vegetarian=True,
+                       dairyFree=True))
+    db.commit()
+    db.close()
+
+
+def _async_db(path):
+    return AsyncSession(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool), expire_on_commit=False)
+
+
+def _catalog():
+    values = dict.fromkeys(CatalogProduct._fields, 0)
+    values.update(id=7, productName="Kefīrs", kcal=50, fat=2, protein=3, dairyProt=3, price100g=0.12)
+    return ProductCatalog.from_rows([tuple(values[f] for f in CatalogProduct._fields)])
+
+
+@pytest.mark.asyncio
+async def test_async_consumed_products_keep_the_rollup(tmp_path):
+    path = tmp_path / "api.db"
+    _create_db(path)
+
+    async with _async_db(path) as db:
+        with patch("app.backend.services.consumedProductService.get_product_catalog_async",
+                   AsyncMock(return_value=_catalog())):
+            await add_consumed_product_async(db, PostUserConsumedProductRequest(productName="mājas granola", amount=50, date=DAY), 1)
+            await add_consumed_product_async(db, PostUserConsumedProductRequest(productName="kefīrs", amount=200, date=DAY), 1)
+            with pytest.raises(HTTPException):
+                await add_consumed_product_async(db, PostUserConsumedProductRequest(productName="Nothing", amount=1, date=DAY), 1)
+
+        consumed = await get_consumed_by_date_async(db, GetConsumedProductByDateRequest(date=DAY), 1)
+        assert sorted((p.productName, p.kcal) for p in consumed) == [("Kefīrs", 100), ("Mājas Granola", 225)]
+
+        request = GetUserStatisticsByDateRequest(startDate=DAY, endDate=DAY)
+        stats = await get_average_by_date_async(db, request, 1)
+        assert stats.averageKcal == 325 and stats.averageProducts == 2
+        assert stats.averageProtein == pytest.approx(11) and stats.averageCost == pytest.approx(0.54)
+
+        await delete_consumed_product_async(db, DeleteConsumedProductRequest(productId=consumed[0].id))
+        await delete_consumed_product_async(db, DeleteConsumedProductRequest(productId=consumed[1].id))
+        assert (await get_average_by_date_async(db, request, 1)).averageProducts == 0
+        assert await db.get(UserDailyNutrition, (1, DAY.date())) is None
+
+
+@pytest.mark.asyncio
+async def test_async_profile_and_names_read_the_same_rows(tmp_path):
+    path = tmp_path / "api.db"
+    _create_db(path)
+
+    async with _async_db(path) as db:
+        assert await get_user_products_names_async(db, 1) == {"products": ["Mājas Granola"]}
+        nutrition = await calculated_nutrition_info_async(db, 1)
+        assert nutrition.calculatedKcal == 1900 and nutrition.isVegetarian
+        with pytest.raises(HTTPException):
+            await calculated_nutrition_info_async(db, 2)
+
+    async with _async_db(path) as db:
+        profile = await get_user_profile_data_async(db, 1)
+        assert profile.username == "anna" and profile.calculatedKcal == 1900 and profile.isVegetarian
+        with pytest.raises(HTTPException):
+            await get_user_profile_data_async(db, 2)
@@ -0,0 +1,49 @@
+from datetime import datetime
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, insert, select
+from app.backend.models.userConsumedProducts import UserConsumedProduct
+from app.backend.models.userDailyNutrition import UserDailyNutrition
+from app.benchmarks.queryPlans import create_lookup_indexes, make_plan_db, measure, uses_index
+
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+
+def test_lookup_indexes_turn_scans_into_index_searches():
+    engine = make_plan_db("sqlite://", users=20, rows=40)
+
+    before = measure(engine, 10, repeats=1)
+    create_lookup_indexes(engine)
+    after = measure(engine, 10, repeats=1)
+
+    assert not any(uses_index(plan) for plan, _ in before.values())
+    assert all(uses_index(plan) for plan, _ in after.values())
+
+
+def test_migrations_add_indexes_and_fill_the_rollup():
+    engine = make_plan_db("sqlite://", users=2, rows=10)
+    with engine.begin() as connection:
+        connection.execute(insert(UserConsumedProduct), [
+            dict(id=1000, userUuid=1, productName="Maize", amount=100, kcal=300, fat=1, satFat=0, carbs=60,
+                 sugar=1, protein=8, dairyProtein=0, animalProtein=0, plantProtein=8, salt=0, cost=0.4,
+                 date=datetime(2030, 1, 1, 12)),
+        ])
+
+    config = Config(str(ALEMBIC_INI))
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+        # The SQLite inspector skips expression indexes
+        indexes = {name for name, in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"ix_userConsumedProducts_userUuid_date", "ix_userProducts_userUuid_lower_productName",
+                "ix_userMenu_userUuid_lower_name"} <= indexes
+        table = UserDailyNutrition.__table__
+        rollup = connection.execute(select(table.c.kcal, table.c.products)
+                                    .where(table.c.userUuid == 1, table.c.day == datetime(2030, 1, 1).date())).one()
+        assert tuple(rollup) == (300, 1)
+
+        connection.commit()
+        command.downgrade(config, "base")
+        assert not inspect(connection).has_table("userDailyNutrition")
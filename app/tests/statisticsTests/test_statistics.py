@@ -0,0 +1,146 @@
+import pytest
+import jwt
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+from app.backend.database import Base, get_async_db
+from app.backend.main import app
+from app.backend.dependencies.getUserUuidFromToken import _JWT_SECRET, _JWT_ALG
+from app.backend.dependencies.nutritionRollup import apply_to_rollup_async, rebuild_rollup
+from app.backend.models.userConsumedProducts import UserConsumedProduct
+from app.backend.models.userDailyNutrition import UserDailyNutrition
+from app.backend.schemas.requests.deleteConsumedProductRequest import DeleteConsumedProductRequest
+from app.backend.schemas.requests.getUserStatisticsByDateRequest import GetUserStatisticsByDateRequest
+from app.backend.services.consumedProductService import delete_consumed_product_async
+from app.backend.schemas.requests.statisticsSeriesRequest import StatisticsSeriesRequest
+from app.backend.services.statisticsService import get_average_by_date_async, get_average_last_7_days_async, \
+    get_daily_statistics_async, get_statistics_series_async
+
+
+def _entry(id, userUuid, date, kcal):
+    # SQLite only autoincrements INTEGER keys, so ids are given explicitly
+    return UserConsumedProduct(id=id, userUuid=userUuid, productName="Maize", amount=100, kcal=kcal, fat=1, satFat=0.5,
+                               carbs=50, sugar=2, protein=8, dairyProtein=None, animalProtein=0, plantProtein=8,
+                               salt=1, cost=0.4, date=date)
+
+
+def _db(entries, url="sqlite://"):
+    engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[UserConsumedProduct.__table__])
+    db = sessionmaker(bind=engine)()
+    for id, (userUuid, date, kcal) in enumerate(entries, start=1):
+        db.add(_entry(id, userUuid, date, kcal))
+    db.commit()
+    rebuild_rollup(db)
+    return db
+
+
+def _async_db(path):
+    return AsyncSession(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool))
+
+
+@pytest.mark.asyncio
+async def test_daily_statistics_sum_todays_products_only(tmp_path):
+    path = tmp_path / "statistics.db"
+    now = datetime.now()
+    _db([(1, now, 200), (1, now, 300), (1, now - timedelta(days=2), 999), (2, now, 999)], f"sqlite:///{path}")
+
+    async with _async_db(path) as db:
+        stats = await get_daily_statistics_async(db, 1)
+
+    assert stats.averageKcal == 500 and stats.averageProducts == 2
+    assert stats.averageDairyProtein == 0 and stats.averageCost == 0.8
+    assert stats.period == "Today"
+
+
+@pytest.mark.asyncio
+async def test_averages_divide_by_days_and_are_zero_without_products(tmp_path):
+    path = tmp_path / "statistics.db"
+    start = datetime(2025, 3, 1)
+    _db([(1, start, 400), (1, start + timedelta(days=1, hours=23), 600), (1, start + timedelta(days=2), 999)],
+        f"sqlite:///{path}")
+
+    async with _async_db(path) as db:
+        stats = await get_average_by_date_async(db, GetUserStatisticsByDateRequest(startDate=start, endDate=start + timedelta(days=1)), 1)
+        empty = await get_average_last_7_days_async(db, 2)
+
+    assert stats.averageKcal == 500 and stats.averageProducts == 1
+    assert stats.period == "2025-03-01 - 2025-03-02"
+    assert empty.averageKcal == 0 and empty.averageProducts == 0
+
+
+@pytest.mark.asyncio
+async def test_rollup_follows_added_and_deleted_products(tmp_path):
+    # Entries are added and deleted through an AsyncSession; both sessions share one database file
+    path = tmp_path / "statistics.db"
+    day = datetime(2025, 3, 1, 12)
+    db = _db([(1, day, 100)], f"sqlite:///{path}")
+    async_db = _async_db(path)
+
+    async with async_db:
+        for id, kcal in ((2, 200), (3, 300)):
+            entry = _entry(id, 1, day, kcal)
+            async_db.add(entry)
+            await apply_to_rollup_async(async_db, entry)
+            await async_db.commit()
+        await delete_consumed_product_async(async_db, DeleteConsumedProductRequest(productId=1))
+
+    db.expire_all()
+    row = db.get(UserDailyNutrition, (1, day.date()))
+    assert row.kcal == 500 and row.products == 2 and row.cost == pytest.approx(0.8)
+    rebuilt = {c: getattr(row, c) for c in ("kcal", "fat", "products")}
+    rebuild_rollup(db, userUuid=1)
+    db.expire_all()
+    row = db.get(UserDailyNutrition, (1, day.date()))
+    assert rebuilt == {c: getattr(row, c) for c in ("kcal", "fat", "products")}
+
+    async with async_db:
+        for id in (2, 3):
+            await delete_consumed_product_async(async_db, DeleteConsumedProductRequest(productId=id))
+    db.expire_all()
+    assert db.query(UserDailyNutrition).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_series_buckets_cover_the_range_including_empty_ones(tmp_path):
+    path = tmp_path / "statistics.db"
+    _db([(1, datetime(2025, 1, 30, 8), 100), (1, datetime(2025, 1, 30, 20), 200), (1, datetime(2025, 2, 2), 500),
+         (1, datetime(2025, 3, 5), 999), (2, datetime(2025, 2, 1), 999)], f"sqlite:///{path}")
+
+    async with _async_db(path) as db:
+        weeks = await get_statistics_series_async(db, StatisticsSeriesRequest(startDate=date(2025, 1, 29), endDate=date(2025, 2, 14), bucket="week"), 1)
+        months = await get_statistics_series_async(db, StatisticsSeriesRequest(startDate=date(2025, 1, 1), endDate=date(2025, 3, 31), bucket="month"), 1)
+
+    assert weeks.starts == [date(2025, 1, 27), date(2025, 2, 3), date(2025, 2, 10)]
+    assert weeks.days == [5, 7, 5]
+    assert weeks.totals["kcal"] == [800, 0, 0] and weeks.totals["products"] == [3, 0, 0]
+    assert weeks.averages["kcal"] == [160, 0, 0]
+
+    assert months.starts == [date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)]
+    assert months.totals["kcal"] == [300, 500, 999] and months.days == [31, 28, 31]
+
+
+def test_series_endpoint_returns_columnar_days(tmp_path):
+    # The route uses an AsyncSession; both sessions share one database file
+    path = tmp_path / "statistics.db"
+    _db([(1, datetime(2025, 3, 2), 400)], f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+    async def get_test_db():
+        async with AsyncSession(async_engine) as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = get_test_db
+    try:
+        client = TestClient(app, cookies={"access_token": jwt.encode({"sub": "1", "typ": "access"}, _JWT_SECRET, algorithm=_JWT_ALG)})
+        body = client.get("/statistics/series", params={"startDate": "2025-03-01", "endDate": "2025-03-03"}).json()
+        invalid = client.get("/statistics/series", params={"startDate": "2025-03-03", "endDate": "2025-03-01"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert body["bucket"] == "day" and body["starts"] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    assert body["totals"]["kcal"] == [0, 400, 0] and body["averages"]["cost"] == [0, 0.4, 0]
+    assert invalid.status_code == 400